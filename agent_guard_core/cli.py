@@ -10,16 +10,12 @@ from pathlib import Path
 from typing import Any, Optional
 
 import click
-from mcp import ClientSession, StdioServerParameters, stdio_client, stdio_server
 
+# Every agent host spawns 'agc mcp-proxy start' once per MCP server, so start-up time matters:
+# commands import the MCP SDK and the provider SDKs they use when invoked, and nothing reads files at import.
 from agent_guard_core.config.config_manager import ConfigManager, ConfigurationOptions
 from agent_guard_core.credentials.enum import AwsEnvVars, ConjurEnvVars, CredentialsProvider, GcpEnvVars
-from agent_guard_core.credentials.gcp_secrets_manager_provider import (DEFAULT_PROJECT_ID, DEFAULT_REPLICATION_TYPE,
-                                                                       DEFAULT_SECRET_ID)
 from agent_guard_core.credentials.secrets_provider import BaseSecretsProvider, secrets_provider_fm
-from agent_guard_core.proxy.audited_proxy import create_agent_guard_proxy_server
-from agent_guard_core.proxy.proxy_utils import get_audit_logger
-from agent_guard_core.utils.mcp_config_wizard import transform_mcp_servers
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
@@ -57,17 +53,60 @@ def mcp_proxy():
     help="debug mode"
 )
 @cap_option
+@click.option(
+    '--env-from',
+    'env_from',
+    required=False,
+    metavar='PROVIDER[/NAMESPACE]',
+    help="Pass the secrets of a provider namespace (i.e. conjur/data/my-agent) to the MCP server as environment "
+    "variables. They are not set in the proxy's own environment."
+)
 @click.argument('argv', nargs=-1)
-def mcp_proxy_start(is_debug: bool = False, cap: Optional[list[ProxyCapability]] = None, argv: tuple[str] = ()):
+def mcp_proxy_start(is_debug: bool = False,
+                    cap: Optional[list[ProxyCapability]] = None,
+                    env_from: Optional[str] = None,
+                    argv: tuple[str] = ()):
     if cap is None:
         cap = []
     
     if is_debug:
         logging.disable(logging.NOTSET)
-        
-    asyncio.run(_stdio_mcp_proxy_async(argv=argv, cap=cap, is_debug=is_debug))
 
-async def _stdio_mcp_proxy_async(cap: list[ProxyCapability], argv: tuple[str] = (), is_debug: bool = False):
+    env = _get_child_env(env_from) if env_from else None
+    asyncio.run(_stdio_mcp_proxy_async(argv=argv, cap=cap, is_debug=is_debug, env=env))
+
+
+def _get_child_env(env_from: str) -> dict[str, str]:
+    """
+    Fetches the secrets of a 'provider[/namespace]' source once, as the environment of the proxied MCP server.
+    """
+    from agent_guard_core.credentials.environment_manager import EnvironmentVariablesManager
+    from agent_guard_core.credentials.secrets_provider import SecretProviderException, create_secrets_provider
+
+    flavor, _, namespace = env_from.partition("/")
+    if secrets_provider_fm.get(flavor) is None:
+        raise click.BadParameter(f"unknown provider '{flavor}', choose from: {provider_list}", param_hint='--env-from')
+    try:
+        provider = create_secrets_provider(flavor, namespace)
+    except SecretProviderException as e:
+        raise click.BadParameter(str(e), param_hint='--env-from')
+    try:
+        # The MCP SDK adds a minimal default environment (PATH, HOME, ...) to the child's, so only the secrets
+        # are passed: copying os.environ would leak this process's variables to the server
+        return EnvironmentVariablesManager(provider).build_child_env(base_env={})
+    except SecretProviderException as e:
+        raise click.ClickException(f"Failed to fetch the secrets of {env_from}: {e}")
+
+
+async def _stdio_mcp_proxy_async(cap: list[ProxyCapability],
+                                 argv: tuple[str] = (),
+                                 is_debug: bool = False,
+                                 env: Optional[dict[str, str]] = None):
+    from mcp import ClientSession, StdioServerParameters, stdio_client, stdio_server
+
+    from agent_guard_core.proxy.audited_proxy import create_agent_guard_proxy_server
+    from agent_guard_core.proxy.proxy_utils import get_audit_logger
+
     session_id = uuid.uuid4().hex
     logger.debug(f"Starting up oroxy with session id {session_id}")
     stdio_params: Optional[StdioServerParameters] = None
@@ -75,14 +114,16 @@ async def _stdio_mcp_proxy_async(cap: list[ProxyCapability], argv: tuple[str] =
     if len(argv) == 0:
         raise click.BadArgumentUsage("Please provide a valid CLI to start an MCP server (i.e uvx mcp-server-fetch)")
     
-    stdio_params = StdioServerParameters(command=argv[0], args=argv[1:])
+    stdio_params = StdioServerParameters(command=argv[0], args=argv[1:], env=env)
     proxy_logger: Optional[logging.Logger] = None
 
     if ProxyCapability.AUDIT in cap:
         logger.debug("Enabling audit logging for the MCP proxy.")
         proxy_logger = get_audit_logger(session_id=session_id, log_level=logging.DEBUG if is_debug else logging.INFO)
     try:
-        logger.debug(f"Starting MCP server with config: {stdio_params.model_dump()}")
+        # Secret values stay out of the logs
+        logger.debug(f"Starting MCP server with config: {stdio_params.model_dump(exclude={'env'})}, "
+                     f"environment variables: {sorted(env or {})}")
         async with stdio_client(stdio_params, errlog=sys.stderr) as streams, ClientSession(*streams) as session:
             app = await create_agent_guard_proxy_server(remote_app=session, audit_logger=proxy_logger)
             async with stdio_server() as (read_stream, write_stream):
@@ -112,6 +153,8 @@ def proxy_apply_config(mcp_config_file: Optional[str] = None, cap: Optional[tupl
     Generates an Agent-Guard-Proxy-Enabled configuration from
     an existing MCP configuration file (i.e Claude Desktop, Claude Code, etc.)
     """
+    from agent_guard_core.utils.mcp_config_wizard import transform_mcp_servers
+
     if cap is None:
         cap = []
         
@@ -139,10 +182,6 @@ def config():
 def secrets():
     """Commands to manage secrets in Agent Guard."""
 
-default_provider = ConfigManager().get_config_value(
-    ConfigurationOptions.SECRET_PROVIDER.value
-) or CredentialsProvider.AWS_SECRETS_MANAGER
-
 provider_list = [provider.value for provider in CredentialsProvider]
 
 def provider_option(f):
@@ -152,12 +191,12 @@ def provider_option(f):
           f'Choose from: {provider_list}'))(f)
 
 def secret_name_option(f):
-    return click.option('--secret_key', '-k', 
-                        required=True, help='The name of the secret to store or retrieve.')(f)
+    return click.option('--secret_key', '-k', multiple=True,
+                        required=True, help='The name of the secret to store or retrieve. Repeat to handle several secrets.')(f)
 
 def secret_value_option(f):
-    return click.option('--secret_value', '-v', 
-                        required=True, help='The value of the secret to store.')(f)
+    return click.option('--secret_value', '-v', multiple=True,
+                        required=True, help='The value of the secret to store. Repeat once per --secret_key, in the same order.')(f)
 
 def namespace_option(f):
     return click.option('--namespace', '-n', 
@@ -177,6 +216,10 @@ def gcp_options(func):
                 **kwargs):
         provider = kwargs.get('provider')
         if provider == CredentialsProvider.GCP_SECRETS_MANAGER:
+            from agent_guard_core.credentials.gcp_secrets_manager_provider import (DEFAULT_PROJECT_ID,
+                                                                                   DEFAULT_REPLICATION_TYPE,
+                                                                                   DEFAULT_SECRET_ID)
+
             os.environ[GcpEnvVars.GCP_PROJECT_ID] = gcp_project_id or os.environ.get(GcpEnvVars.GCP_PROJECT_ID, DEFAULT_PROJECT_ID)
             os.environ[GcpEnvVars.GCP_SECRET_ID] = gcp_secret_id or os.environ.get(GcpEnvVars.GCP_SECRET_ID, DEFAULT_SECRET_ID)
             os.environ[GcpEnvVars.GCP_REGION] = gcp_region or os.environ.get(GcpEnvVars.GCP_REGION, str())
@@ -275,22 +318,22 @@ def config_conjur_options(func):
                 conjur_account: Optional[str] = None,
                 conjur_api_key: Optional[str] = None,
                 **kwargs):
-        config_manager = ConfigManager()
+        config_values = kwargs.setdefault('config_values', {})
         
         if conjur_authn_login:
-            config_manager.set_config_value(ConjurEnvVars.CONJUR_AUTHN_LOGIN, conjur_authn_login)
+            config_values[ConjurEnvVars.CONJUR_AUTHN_LOGIN] = conjur_authn_login
             
         if conjur_appliance_url:
-            config_manager.set_config_value(ConjurEnvVars.CONJUR_APPLIANCE_URL, conjur_appliance_url)
+            config_values[ConjurEnvVars.CONJUR_APPLIANCE_URL] = conjur_appliance_url
             
         if conjur_authenticator_id:
-            config_manager.set_config_value(ConjurEnvVars.CONJUR_AUTHENTICATOR_ID, conjur_authenticator_id)
+            config_values[ConjurEnvVars.CONJUR_AUTHENTICATOR_ID] = conjur_authenticator_id
             
         if conjur_account:
-            config_manager.set_config_value(ConjurEnvVars.CONJUR_ACCOUNT, conjur_account)
+            config_values[ConjurEnvVars.CONJUR_ACCOUNT] = conjur_account
             
         if conjur_api_key:
-            config_manager.set_config_value(ConjurEnvVars.CONJUR_API_KEY, conjur_api_key)
+            config_values[ConjurEnvVars.CONJUR_API_KEY] = conjur_api_key
             
         return func(*args, **kwargs)
     return wrapper
@@ -306,16 +349,16 @@ def config_aws_options(func):
                 aws_access_key_id: Optional[str] = None,
                 aws_secret_access_key: Optional[str] = None,
                 **kwargs):
-        config_manager = ConfigManager()
+        config_values = kwargs.setdefault('config_values', {})
         
         if aws_region:
-            config_manager.set_config_value(AwsEnvVars.AWS_REGION, aws_region)
+            config_values[AwsEnvVars.AWS_REGION] = aws_region
             
         if aws_access_key_id:
-            config_manager.set_config_value(AwsEnvVars.AWS_ACCESS_KEY_ID, aws_access_key_id)
+            config_values[AwsEnvVars.AWS_ACCESS_KEY_ID] = aws_access_key_id
             
         if aws_secret_access_key:
-            config_manager.set_config_value(AwsEnvVars.AWS_SECRET_ACCESS_KEY, aws_secret_access_key)
+            config_values[AwsEnvVars.AWS_SECRET_ACCESS_KEY] = aws_secret_access_key
             
         return func(*args, **kwargs)
     return wrapper
@@ -333,19 +376,19 @@ def config_gcp_options(func):
                 gcp_region: Optional[str] = None,
                 gcp_replication_type: Optional[str] = None,
                 **kwargs):
-        config_manager = ConfigManager()
+        config_values = kwargs.setdefault('config_values', {})
         
         if gcp_project_id:
-            config_manager.set_config_value(GcpEnvVars.GCP_PROJECT_ID, gcp_project_id)
+            config_values[GcpEnvVars.GCP_PROJECT_ID] = gcp_project_id
             
         if gcp_secret_id:
-            config_manager.set_config_value(GcpEnvVars.GCP_SECRET_ID, gcp_secret_id)
+            config_values[GcpEnvVars.GCP_SECRET_ID] = gcp_secret_id
             
         if gcp_region:
-            config_manager.set_config_value(GcpEnvVars.GCP_REGION, gcp_region)
+            config_values[GcpEnvVars.GCP_REGION] = gcp_region
             
         if gcp_replication_type:
-            config_manager.set_config_value(GcpEnvVars.GCP_REPLICATION_TYPE, gcp_replication_type)
+            config_values[GcpEnvVars.GCP_REPLICATION_TYPE] = gcp_replication_type
             
         return func(*args, **kwargs)
     return wrapper
@@ -370,11 +413,14 @@ def set(provider, secret_key, secret_value, namespace):
     if namespace:
         extra['namespace'] = namespace
 
+    if len(secret_key) != len(secret_value):
+        raise click.UsageError("Please provide exactly one --secret_value for each --secret_key.")
+
     provider: BaseSecretsProvider = secrets_provider_fm.get(provider)(**extra)
     if not provider.connect():
         raise click.ClickException(f"Failed to connect to provider: {provider}")
     
-    provider.store(key=secret_key, secret=secret_value)
+    provider.store_many(dict(zip(secret_key, secret_value)))
     
 @secrets.command()
 @provider_option
@@ -398,11 +444,16 @@ def get(provider, secret_key, namespace):
     if not provider.connect():
         raise click.ClickException(f"Failed to connect to provider: {provider}")
     
-    secret = provider.get(key=secret_key)
-    if secret is None:
-        raise click.ClickException(f"Failed to retrieve secret {secret_key} from provider: {provider}")
+    secrets = provider.get_many(secret_key)
+    missing = [key for key in secret_key if secrets.get(key) is None]
+    if missing:
+        raise click.ClickException(f"Failed to retrieve secret {', '.join(missing)} from provider: {provider}")
 
-    print(secret, end='')
+    if len(secret_key) == 1:
+        print(secrets[secret_key[0]], end='')
+    else:
+        for key in secret_key:
+            print(f"{key}={secrets[key]}")
 
 
 @config.command(name="set")
@@ -410,11 +461,13 @@ def get(provider, secret_key, namespace):
 @config_conjur_options
 @config_aws_options
 @config_gcp_options
-def config_set(provider, **kwargs):
+def config_set(provider, config_values=None, **kwargs):
     """Set configuration values"""
-    config_manager = ConfigManager()
+    config_values = dict(config_values or {})
     if provider:
-        config_manager.set_config_value(ConfigurationOptions.SECRET_PROVIDER.name, provider)
+        config_values[ConfigurationOptions.SECRET_PROVIDER.name] = provider
+    # All the options are written to the config file at once
+    ConfigManager().set_config_values(config_values)
     
     click.echo("Configuration updated successfully")
 
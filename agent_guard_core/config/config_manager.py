@@ -54,7 +54,15 @@ class ConfigManager:
         """
         Set a specific key to a value in the config file.
         """
-        self._config_dictionary[key] = value
+        self.set_config_values({key: value})
+
+    def set_config_values(self, values):
+        """
+        Set several keys in the config file with a single write.
+        """
+        if not values:
+            return
+        self._config_dictionary.update(values)
         self._config_provider.store_secret_dictionary(self._config_dictionary)
 
     def get_config_value(self, key):
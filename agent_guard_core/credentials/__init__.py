@@ -1,4 +1,50 @@
-from .aws_secrets_manager_provider import AWSSecretsProvider
-from .conjur_secrets_provider import ConjurSecretsProvider
-from .file_secrets_provider import FileSecretsProvider
-from .gcp_secrets_manager_provider import GCPSecretsProvider
+import importlib
+from typing import TYPE_CHECKING, Any
+
+# Public names and the module defining them. Modules are imported on first access,
+# so importing the package does not load the SDKs of every provider.
+_LAZY_ATTRIBUTES = {
+    "AsyncBaseSecretsProvider": ".async_secrets_provider",
+    "AsyncSecretsProviderAdapter": ".async_secrets_provider",
+    "AsyncAWSSecretsProvider": ".aws_secrets_manager_provider",
+    "AWSSecretsProvider": ".aws_secrets_manager_provider",
+    "CachingSecretsProvider": ".caching_secrets_provider",
+    "AsyncConjurSecretsProvider": ".conjur_secrets_provider",
+    "ConjurSecretsProvider": ".conjur_secrets_provider",
+    "AsyncFileSecretsProvider": ".file_secrets_provider",
+    "FileSecretsProvider": ".file_secrets_provider",
+    "AsyncGCPSecretsProvider": ".gcp_secrets_manager_provider",
+    "GCPSecretsProvider": ".gcp_secrets_manager_provider",
+    "AsyncInMemorySecretsProvider": ".memory_secrets_provider",
+    "InMemorySecretsProvider": ".memory_secrets_provider",
+    "PersistentSecretsCache": ".persistent_cache",
+    "AsyncTieredSecretsProvider": ".tiered_secrets_provider",
+    "TieredSecretsProvider": ".tiered_secrets_provider",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
+
+
+if TYPE_CHECKING:
+    from .async_secrets_provider import AsyncBaseSecretsProvider, AsyncSecretsProviderAdapter
+    from .aws_secrets_manager_provider import AsyncAWSSecretsProvider, AWSSecretsProvider
+    from .caching_secrets_provider import CachingSecretsProvider
+    from .conjur_secrets_provider import AsyncConjurSecretsProvider, ConjurSecretsProvider
+    from .file_secrets_provider import AsyncFileSecretsProvider, FileSecretsProvider
+    from .gcp_secrets_manager_provider import AsyncGCPSecretsProvider, GCPSecretsProvider
+    from .memory_secrets_provider import AsyncInMemorySecretsProvider, InMemorySecretsProvider
+    from .persistent_cache import PersistentSecretsCache
+    from .tiered_secrets_provider import AsyncTieredSecretsProvider, TieredSecretsProvider
@@ -0,0 +1,199 @@
+# this is a abstract class for asyncio-native secrets providers
+import abc
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Type
+
+from agent_guard_core.credentials.enum import CredentialsProvider
+from agent_guard_core.credentials.secrets_provider import BaseSecretsProvider, SecretProviderException
+from agent_guard_core.utils.flavor_manager import FlavorManager
+from agent_guard_core.utils.single_flight import SingleFlight
+
+# Key of the in-flight get_secret_dictionary() call of a provider
+_SECRET_DICTIONARY_FETCH = "secret_dictionary"
+
+
+class AsyncBaseSecretsProvider(abc.ABC):
+    """
+    The asyncio counterpart of BaseSecretsProvider.
+    Implementations never block the event loop while talking to the remote secret store.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.logger = logging.getLogger(__name__)
+        # Concurrent get_secret_dictionary() calls on this provider share one fetch
+        self._fetches: SingleFlight[str, Dict[str, str]] = SingleFlight()
+
+    @abc.abstractmethod
+    async def connect(self) -> bool:
+        pass
+
+    @abc.abstractmethod
+    async def get_secret_dictionary(self) -> Dict[str, str]:
+        pass
+
+    @abc.abstractmethod
+    async def store_secret_dictionary(self, secret_dictionary: Dict) -> None:
+        pass
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Retrieves a secret by key.
+
+        :param key: The name of the secret to retrieve.
+        :return: The secret value, or None if not found.
+        """
+        if not key:
+            self.logger.warning("get: key is missing")
+            return None
+
+        secret_dictionary = await self.get_secret_dictionary()
+        return secret_dictionary.get(key)
+
+    async def store(self, key: str, secret: str) -> None:
+        """
+        Stores a secret. Creates or updates the secret.
+
+        :param key: The name of the secret.
+        :param secret: The secret value to store.
+        :raises SecretProviderException: If key or secret is missing, or if there is an error storing the secret.
+        """
+        if not key or not secret:
+            message = "store: key or secret is missing"
+            self.logger.warning(message)
+            raise SecretProviderException(message)
+
+        secret_dictionary = await self.get_secret_dictionary()
+        secret_dictionary[key] = secret
+        await self.store_secret_dictionary(secret_dictionary)
+
+    async def delete(self, key: str) -> None:
+        """
+        Deletes a secret by key.
+
+        :param key: The name of the secret to delete.
+        :raises SecretProviderException: If key is missing or if there is an error deleting the secret.
+        """
+        if not key:
+            message = "delete secret failed, key is none or empty"
+            self.logger.warning(message)
+            raise SecretProviderException(message)
+
+        secret_dictionary = await self.get_secret_dictionary()
+        if key in secret_dictionary:
+            del secret_dictionary[key]
+            await self.store_secret_dictionary(secret_dictionary)
+
+    async def get_version_info(self) -> Optional[str]:
+        """
+        Returns an identifier of the current version of the secret dictionary, read from metadata only.
+        The default implementation returns None: the provider cannot tell without fetching the dictionary.
+
+        :return: A string that changes whenever the secret dictionary changes, an empty string if the
+         dictionary does not exist, or None if the version is not available.
+        """
+        return None
+
+    def fetch_stats(self) -> Dict[str, Any]:
+        """
+        Returns how many get_secret_dictionary() calls were made, and how many of them joined a fetch in flight.
+        """
+        return self._fetches.stats()
+
+    async def _fetch_once(self, fetch: Callable[[], Awaitable[Dict[str, str]]]) -> Dict[str, str]:
+        """
+        Awaits fetch(), or the fetch already in flight. Each caller gets its own copy of the dictionary.
+        """
+        return dict(await self._fetches.ado(_SECRET_DICTIONARY_FETCH, fetch))
+
+    def _forget_fetch(self) -> None:
+        """
+        Called after writes, so later reads do not join a fetch started before the write.
+        """
+        self._fetches.forget(_SECRET_DICTIONARY_FETCH)
+
+    async def aclose(self) -> None:
+        """
+        Releases network resources held by the provider.
+        """
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+
+class AsyncSecretsProviderAdapter(AsyncBaseSecretsProvider):
+    """
+    Exposes a blocking BaseSecretsProvider through the asyncio interface,
+    running each call in a worker thread so the event loop is never blocked.
+    """
+
+    def __init__(self, provider: BaseSecretsProvider):
+        """
+        :param provider: The blocking secrets provider to offload.
+        """
+        super().__init__()
+        if provider is None:
+            raise SecretProviderException("AsyncSecretsProviderAdapter: provider not provided")
+        self._provider = provider
+
+    @property
+    def provider(self) -> BaseSecretsProvider:
+        return self._provider
+
+    async def connect(self) -> bool:
+        return await asyncio.to_thread(self._provider.connect)
+
+    async def get_secret_dictionary(self) -> Dict[str, str]:
+        return await self._fetch_once(lambda: asyncio.to_thread(self._provider.get_secret_dictionary))
+
+    async def store_secret_dictionary(self, secret_dictionary: Dict) -> None:
+        try:
+            await asyncio.to_thread(self._provider.store_secret_dictionary, secret_dictionary)
+        finally:
+            self._forget_fetch()
+
+    async def get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._provider.get, key)
+
+    async def store(self, key: str, secret: str) -> None:
+        try:
+            await asyncio.to_thread(self._provider.store, key, secret)
+        finally:
+            self._forget_fetch()
+
+    async def delete(self, key: str) -> None:
+        try:
+            await asyncio.to_thread(self._provider.delete, key)
+        finally:
+            self._forget_fetch()
+
+    async def get_version_info(self) -> Optional[str]:
+        return await asyncio.to_thread(self._provider.get_version_info)
+
+    async def aclose(self) -> None:
+        await asyncio.to_thread(self._provider.close)
+
+
+# Third-party packages register their asyncio providers under this entry point group
+ASYNC_SECRETS_PROVIDERS_ENTRY_POINT_GROUP = "agent_guard_core.async_secrets_providers"
+
+async_secrets_provider_fm: FlavorManager[str, Type[AsyncBaseSecretsProvider]] = FlavorManager(
+    entry_point_group=ASYNC_SECRETS_PROVIDERS_ENTRY_POINT_GROUP)
+
+async_secrets_provider_fm.lazy_flavor(
+    CredentialsProvider.AWS_SECRETS_MANAGER,
+    "agent_guard_core.credentials.aws_secrets_manager_provider:AsyncAWSSecretsProvider")
+async_secrets_provider_fm.lazy_flavor(CredentialsProvider.CONJUR,
+                                      "agent_guard_core.credentials.conjur_secrets_provider:AsyncConjurSecretsProvider")
+async_secrets_provider_fm.lazy_flavor(CredentialsProvider.FILE_DOTENV,
+                                      "agent_guard_core.credentials.file_secrets_provider:AsyncFileSecretsProvider")
+async_secrets_provider_fm.lazy_flavor(
+    CredentialsProvider.GCP_SECRETS_MANAGER,
+    "agent_guard_core.credentials.gcp_secrets_manager_provider:AsyncGCPSecretsProvider")
+async_secrets_provider_fm.lazy_flavor(
+    CredentialsProvider.MEMORY, "agent_guard_core.credentials.memory_secrets_provider:AsyncInMemorySecretsProvider")
+async_secrets_provider_fm.lazy_flavor(CredentialsProvider.TIERED,
+                                      "agent_guard_core.credentials.tiered_secrets_provider:AsyncTieredSecretsProvider")
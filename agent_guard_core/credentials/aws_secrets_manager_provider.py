@@ -1,13 +1,16 @@
 import json
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional
 
 import boto3
 
 import logging
 logging.getLogger('botocore').setLevel(logging.CRITICAL)
 
-from agent_guard_core.credentials.enum import CredentialsProvider
+from agent_guard_core.credentials.async_secrets_provider import AsyncSecretsProviderAdapter, async_secrets_provider_fm
+from agent_guard_core.credentials.enum import CredentialsProvider, SecretsLayout
+from agent_guard_core.credentials.per_key_layout import PerKeyLayout
 from agent_guard_core.credentials.secrets_provider import secrets_provider_fm
+from agent_guard_core.utils.known_resources import KnownResources
 
 from .secrets_provider import BaseSecretsProvider, SecretProviderException
 
@@ -15,6 +18,12 @@ SERVICE_NAME = "secretsmanager"
 DEFAULT_REGION = "us-east-1"
 DEFAULT_NAMESPACE = "default"
 DEFAULT_SECRET_ID = "agentic_env_vars"
+MANIFEST_SUFFIX = ".manifest"
+# Maximum number of secrets per BatchGetSecretValue call
+BATCH_GET_MAX_SECRETS = 20
+
+# Secrets this process has seen, which can be written without trying to create them first
+_existing_secrets = KnownResources()
 
 
 @secrets_provider_fm.flavor(CredentialsProvider.AWS_SECRETS_MANAGER)
@@ -25,12 +34,16 @@ class AWSSecretsProvider(BaseSecretsProvider):
 
     def __init__(self,
                  region_name=DEFAULT_REGION,
-                 namespace: Optional[str] = None):
+                 namespace: Optional[str] = None,
+                 layout: str = SecretsLayout.BLOB):
         """
         Initializes the AWS Secrets Manager client with the specified region.
 
         :param region_name: AWS region name where the secrets manager is located. Defaults to 'us-east-1'.
         :param namespace: Optional namespace for the secrets. Defaults to 'default'.
+        :param layout: 'blob' stores the namespace as one JSON secret at {namespace}/agentic_env_vars.
+         'per-key' stores each key as its own secret at {namespace}/agentic_env_vars/{key},
+         listed by a manifest at {namespace}/agentic_env_vars.manifest. Defaults to 'blob'.
         """
         super().__init__()
         self._client = None
@@ -38,6 +51,17 @@ class AWSSecretsProvider(BaseSecretsProvider):
         namespace = DEFAULT_NAMESPACE if not namespace else namespace
         self._dictionary_path = f"{namespace}/{DEFAULT_SECRET_ID}"
 
+        if layout not in [item.value for item in SecretsLayout]:
+            raise SecretProviderException(f"Unsupported secrets layout: {layout}")
+        self._per_key: Optional[PerKeyLayout] = None
+        if layout == SecretsLayout.PER_KEY:
+            self._per_key = PerKeyLayout(key_path=lambda key: f"{self._dictionary_path}/{key}",
+                                         manifest_path=f"{self._dictionary_path}{MANIFEST_SUFFIX}",
+                                         read=self._read_secret,
+                                         write=self._write_secret,
+                                         remove=self._remove_secret,
+                                         read_many=self._read_secrets)
+
     def connect(self) -> bool:
         """
         Establishes a connection to the AWS Secrets Manager service.
@@ -60,6 +84,54 @@ class AWSSecretsProvider(BaseSecretsProvider):
                 "Error connecting to the secret provider: AWSSecretsProvider with this exception: %s"
                 % e.args[0])
 
+    def _read_secret(self, secret_id: str) -> Optional[str]:
+        self.connect()
+        try:
+            return self._client.get_secret_value(SecretId=secret_id).get("SecretString")
+        except self._client.exceptions.ResourceNotFoundException:
+            return None
+        except Exception as e:
+            self.logger.error("Error retrieving secret %s: %s", secret_id, e)
+            raise SecretProviderException(f"Error retrieving secret: {e}") from e
+
+    def _read_secrets(self, secret_ids: List[str]) -> Dict[str, Optional[str]]:
+        self.connect()
+        values: Dict[str, Optional[str]] = dict.fromkeys(secret_ids)
+        try:
+            for i in range(0, len(secret_ids), BATCH_GET_MAX_SECRETS):
+                response = self._client.batch_get_secret_value(
+                    SecretIdList=secret_ids[i:i + BATCH_GET_MAX_SECRETS])
+                for secret in response.get("SecretValues", []):
+                    values[secret["Name"]] = secret.get("SecretString")
+        except Exception as e:
+            self.logger.error("Error retrieving secrets: %s", e)
+            raise SecretProviderException(f"Error retrieving secrets: {e}") from e
+        return values
+
+    def _write_secret(self, secret_id: str, secret_text: str) -> None:
+        self.connect()
+        try:
+            try:
+                self._client.put_secret_value(SecretId=secret_id, SecretString=secret_text)
+            except self._client.exceptions.ResourceNotFoundException:
+                self._client.create_secret(Name=secret_id, SecretString=secret_text)
+        except Exception as e:
+            self.logger.error("Error storing secret: %s", e)
+            raise SecretProviderException(f"Error storing secret: {e}") from e
+
+    def _remove_secret(self, secret_id: str) -> None:
+        self.connect()
+        try:
+            self._client.delete_secret(SecretId=secret_id, ForceDeleteWithoutRecovery=True)
+        except self._client.exceptions.ResourceNotFoundException:
+            pass
+        except Exception as e:
+            self.logger.error("Error deleting secret: %s", e)
+            raise SecretProviderException(f"Error deleting secret: {e}") from e
+
+    def get_cache_key(self) -> str:
+        return f"{CredentialsProvider.AWS_SECRETS_MANAGER.value}:{self._region_name}:{self._dictionary_path}"
+
     def get_secret_dictionary(self) -> Dict[str, str]:
         """
         Retrieves the secret dictionary from AWS Secrets Manager.
@@ -67,6 +139,9 @@ class AWSSecretsProvider(BaseSecretsProvider):
         :return: A dictionary containing the secrets.
         :raises SecretProviderException: If there is an error retrieving the secrets.
         """
+        if self._per_key is not None:
+            return self._per_key.get_secret_dictionary()
+
         try:
             self.connect()
             response = self._client.get_secret_value(
@@ -77,12 +152,14 @@ class AWSSecretsProvider(BaseSecretsProvider):
                 message = "get: secret retrieval error"
                 self.logger.error(message)
                 raise SecretProviderException(message)
+            _existing_secrets.add(self.get_cache_key())
             secret_text = response["SecretString"]
             if secret_text:
                 secret_dict = json.loads(secret_text)
                 return secret_dict
 
         except self._client.exceptions.ResourceNotFoundException as e:
+            _existing_secrets.discard(self.get_cache_key())
             self.logger.warning("Secret not found: %s", e.args[0])
 
         except Exception as e:
@@ -90,6 +167,31 @@ class AWSSecretsProvider(BaseSecretsProvider):
 
         return {}
 
+    def get_version_info(self) -> Optional[str]:
+        """
+        Returns the ID of the AWSCURRENT version of the secret, from DescribeSecret, which does not return the value.
+        With the per-key layout, values change without a new version of any single secret, so None is returned.
+
+        :return: The version ID, an empty string if the secret does not exist, or None with the per-key layout.
+        :raises SecretProviderException: If there is an error describing the secret.
+        """
+        if self._per_key is not None:
+            return None
+
+        self.connect()
+        try:
+            response = self._client.describe_secret(SecretId=self._dictionary_path)
+        except self._client.exceptions.ResourceNotFoundException:
+            return ""
+        except Exception as e:
+            self.logger.error("Error describing secret %s: %s", self._dictionary_path, e)
+            raise SecretProviderException(f"Error describing secret: {e}") from e
+
+        for version_id, stages in response.get("VersionIdsToStages", {}).items():
+            if "AWSCURRENT" in stages:
+                return version_id
+        return ""
+
     def store_secret_dictionary(self, secret_dictionary: Dict):
         """
         Stores the secret dictionary in AWS Secrets Manager.
@@ -100,15 +202,30 @@ class AWSSecretsProvider(BaseSecretsProvider):
         if secret_dictionary is None:
             raise SecretProviderException("Dictionary not provided")
 
+        if self._per_key is not None:
+            self._per_key.store_secret_dictionary(secret_dictionary)
+            return
+
+        cache_key = self.get_cache_key()
         try:
             self.connect()
             secret_text = json.dumps(secret_dictionary)
-            self._client.create_secret(Name=self._dictionary_path,
-                                       SecretString=secret_text)
-
-        except self._client.exceptions.ResourceExistsException:
-            self._client.put_secret_value(SecretId=self._dictionary_path,
-                                          SecretString=secret_text)
+            if cache_key in _existing_secrets:
+                try:
+                    self._client.put_secret_value(SecretId=self._dictionary_path,
+                                                  SecretString=secret_text)
+                    return
+                except self._client.exceptions.ResourceNotFoundException:
+                    # Deleted by someone else since we last saw it
+                    _existing_secrets.discard(cache_key)
+
+            try:
+                self._client.create_secret(Name=self._dictionary_path,
+                                           SecretString=secret_text)
+            except self._client.exceptions.ResourceExistsException:
+                self._client.put_secret_value(SecretId=self._dictionary_path,
+                                              SecretString=secret_text)
+            _existing_secrets.add(cache_key)
         except Exception as e:
             self.logger.error("Error storing secret: %s", e.args[0])
             raise SecretProviderException("Error storing secret: %s" %
@@ -131,6 +248,10 @@ class AWSSecretsProvider(BaseSecretsProvider):
             self.logger.warning(message)
             raise SecretProviderException(message)
 
+        if self._per_key is not None:
+            self._per_key.store(key, secret)
+            return
+
         dictionary = self.get_secret_dictionary()
 
         if not dictionary:
@@ -150,6 +271,9 @@ class AWSSecretsProvider(BaseSecretsProvider):
         if not key:
             self.logger.warning("get: key is missing, proceeding with default")
 
+        if self._per_key is not None:
+            return self._per_key.get(key) if key else None
+
         dictionary = self.get_secret_dictionary()
 
         if dictionary:
@@ -167,8 +291,54 @@ class AWSSecretsProvider(BaseSecretsProvider):
             self.logger.warning(message)
             raise SecretProviderException(message)
 
+        if self._per_key is not None:
+            self._per_key.delete(key)
+            return
+
         dictionary = self.get_secret_dictionary()
 
         if dictionary:
             del dictionary[key]
             self.store_secret_dictionary(dictionary)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Retrieves several secrets from AWS Secrets Manager. With the per-key layout, only their keys are read.
+
+        :param keys: The names of the secrets to retrieve.
+        :return: A dictionary mapping each key to its value, or None if not found.
+        """
+        if self._per_key is not None:
+            return self._per_key.get_many(keys)
+        return super().get_many(keys)
+
+    def apply_changes(self, changes: Dict[str, Optional[str]]) -> None:
+        """
+        Stores and deletes several secrets in AWS Secrets Manager. With the per-key layout, only the changed keys
+        and the manifest are written.
+
+        :param changes: A dictionary mapping secret names to their new values, or to None to delete them.
+        """
+        if self._per_key is not None:
+            self._per_key.apply_changes(changes)
+            return
+        super().apply_changes(changes)
+
+
+@async_secrets_provider_fm.flavor(CredentialsProvider.AWS_SECRETS_MANAGER)
+class AsyncAWSSecretsProvider(AsyncSecretsProviderAdapter):
+    """
+    Manages storing and retrieving secrets from AWS Secrets Manager without blocking the event loop.
+    boto3 has no asyncio API, so each call runs in a worker thread.
+    """
+
+    def __init__(self,
+                 region_name=DEFAULT_REGION,
+                 namespace: Optional[str] = None,
+                 layout: str = SecretsLayout.BLOB):
+        """
+        :param region_name: AWS region name where the secrets manager is located. Defaults to 'us-east-1'.
+        :param namespace: Optional namespace for the secrets. Defaults to 'default'.
+        :param layout: 'blob' or 'per-key', see AWSSecretsProvider. Defaults to 'blob'.
+        """
+        super().__init__(AWSSecretsProvider(region_name=region_name, namespace=namespace, layout=layout))
@@ -0,0 +1,312 @@
+import contextlib
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from agent_guard_core.credentials.persistent_cache import PersistentSecretsCache
+from agent_guard_core.credentials.secrets_provider import (BaseSecretsProvider, SecretProviderException,
+                                                           secrets_provider_fm)
+from agent_guard_core.utils.single_flight import SingleFlight
+from agent_guard_core.utils.ttl_cache import DEFAULT_MAX_ENTRIES, DEFAULT_TTL_SECONDS, TTLCache
+
+# Age up to which a persisted dictionary is served right away, while it is refreshed in the background
+DEFAULT_MAX_STALENESS_SECONDS = 24 * 60 * 60
+# Empty dictionaries (namespace not found) are cached briefly, so a namespace created later is picked up soon
+DEFAULT_NEGATIVE_TTL_SECONDS = 5.0
+
+
+class CachingSecretsProvider(BaseSecretsProvider):
+    """
+    Wraps any secrets provider with an in-memory, read-through cache of its secret dictionary.
+
+    Repeated get_secret_dictionary() and get() calls are served from memory until the entry expires.
+    Writes go to the wrapped provider and invalidate the cached entry.
+
+    An empty dictionary, which providers return for a namespace that does not exist, is only cached for
+    negative_ttl seconds. With a stale_ttl, an expired dictionary is still served for that many seconds
+    while it is refreshed in the background, so readers only wait for the wrapped provider once the
+    dictionary is older than ttl + stale_ttl.
+
+    Several wrappers can share one TTLCache instance; entries are keyed by the wrapped provider's
+    get_cache_key(), so providers pointing at the same namespace share the cached dictionary.
+    Concurrent misses on the same key are collapsed into a single fetch, which the other callers wait for;
+    wrappers sharing a SingleFlight instance also share their in-flight fetches.
+
+    When the wrapped provider reports versions through get_version_info(), an expired entry is revalidated
+    with that metadata call first: if the version did not change, the dictionary fetched last is cached again
+    without downloading it.
+
+    With a persistent cache, the last dictionary fetched is also kept on disk, encrypted. A process that starts
+    with an empty memory cache serves the disk copy right away if it is younger than max_staleness, and refreshes
+    it from the wrapped provider in the background. If the wrapped provider fails, an older disk copy is served
+    as an offline fallback.
+    """
+
+    def __init__(self,
+                 provider: BaseSecretsProvider,
+                 ttl: float = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 cache: Optional[TTLCache[str, Dict[str, str]]] = None,
+                 persistent_cache: Optional[PersistentSecretsCache] = None,
+                 max_staleness: float = DEFAULT_MAX_STALENESS_SECONDS,
+                 offline_fallback: bool = True,
+                 single_flight: Optional[SingleFlight[str, Dict[str, str]]] = None,
+                 negative_ttl: float = DEFAULT_NEGATIVE_TTL_SECONDS,
+                 stale_ttl: Optional[float] = None,
+                 revalidate: bool = True):
+        """
+        :param provider: The secrets provider to wrap.
+        :param ttl: Number of seconds a fetched dictionary is served from memory. Defaults to 60.
+        :param max_entries: Maximum number of cached dictionaries. Ignored when a cache is given.
+        :param cache: Optional cache instance to share between several wrappers.
+        :param persistent_cache: Optional encrypted on-disk cache, to serve cold starts and outages.
+        :param max_staleness: Number of seconds a disk copy is served without waiting for the wrapped provider.
+         Defaults to one day.
+        :param offline_fallback: Serve the disk copy, whatever its age, when the wrapped provider fails.
+         Defaults to True.
+        :param single_flight: Optional instance to share in-flight fetches between several wrappers.
+        :param negative_ttl: Number of seconds an empty dictionary is served from memory. Defaults to 5.
+        :param stale_ttl: Number of seconds an expired dictionary is still served while it is refreshed
+         in the background. Defaults to the cache's stale_ttl, 0 unless a cache is given.
+        :param revalidate: Check the version of the dictionary before fetching it again. Defaults to True.
+        """
+        super().__init__()
+        if provider is None:
+            raise SecretProviderException("CachingSecretsProvider: provider not provided")
+
+        self._provider = provider
+        self._cache = cache if cache is not None else TTLCache(ttl=ttl, max_entries=max_entries)
+        self._persistent_cache = persistent_cache
+        self._max_staleness = max_staleness
+        self._offline_fallback = offline_fallback
+        self._single_flight = single_flight if single_flight is not None else SingleFlight()
+        self._negative_ttl = negative_ttl
+        self._stale_ttl = stale_ttl
+        self._revalidate = revalidate
+        # The version and contents of the dictionary fetched last, and how many fetches it saved
+        self._validated: Optional[Tuple[str, Dict[str, str]]] = None
+        self._revalidated = 0
+        # Background refreshes in flight, and a counter of writes so a refresh never caches a pre-write dictionary
+        self._refreshing: Set[str] = set()
+        self._generation = 0
+        self._refresh_lock = threading.Lock()
+
+    @classmethod
+    def from_flavor(cls, flavor: str, ttl: float = DEFAULT_TTL_SECONDS, **kwargs: Any) -> "CachingSecretsProvider":
+        """
+        Creates the provider registered under the given flavor and wraps it.
+
+        :param flavor: The flavor of the provider in secrets_provider_fm (i.e. 'aws-secretsmanager').
+        :param ttl: Number of seconds a fetched dictionary is served from memory.
+        :param kwargs: Arguments passed to the provider's constructor.
+        """
+        provider_cls = secrets_provider_fm.get(flavor)
+        if provider_cls is None:
+            raise SecretProviderException(f"Unknown secrets provider: {flavor}")
+        return cls(provider_cls(**kwargs), ttl=ttl)
+
+    @property
+    def provider(self) -> BaseSecretsProvider:
+        return self._provider
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the hit/miss counters of the underlying cache, the number of misses that joined
+        a fetch already in flight instead of calling the wrapped provider, and the number of fetches
+        skipped because the version of the dictionary did not change.
+        """
+        return {
+            **self._cache.stats(),
+            "collapsed": self._single_flight.stats()["collapsed"],
+            "revalidated": self._revalidated,
+        }
+
+    def invalidate(self) -> None:
+        """
+        Drops the cached dictionary, so the next read goes to the wrapped provider.
+        """
+        self._invalidate_memory()
+        if self._persistent_cache is not None:
+            self._persistent_cache.delete(self.get_cache_key())
+
+    def _invalidate_memory(self) -> None:
+        with self._refresh_lock:
+            self._generation += 1
+            self._validated = None
+        self._cache.invalidate(self.get_cache_key())
+        self._single_flight.forget(self.get_cache_key())
+
+    @contextlib.contextmanager
+    def _writing(self) -> Iterator[None]:
+        """
+        Invalidates the cache around a write to the wrapped provider. The disk copy is only dropped once
+        the write succeeded: a failed write may not have changed anything, and the copy is still needed
+        as an offline fallback.
+        """
+        try:
+            yield
+        except BaseException:
+            self._invalidate_memory()
+            raise
+        self.invalidate()
+
+    def get_cache_key(self) -> str:
+        return self._provider.get_cache_key()
+
+    def connect(self) -> bool:
+        return self._provider.connect()
+
+    def close(self) -> None:
+        self._provider.close()
+
+    def get_version_info(self) -> Optional[str]:
+        return self._provider.get_version_info()
+
+    def get_secret_dictionary(self) -> Dict[str, str]:
+        """
+        Retrieves the secret dictionary, from memory if a valid entry exists.
+
+        :return: A copy of the secret dictionary.
+        """
+        cache_key = self.get_cache_key()
+        entry = self._cache.lookup(cache_key)
+        if entry is None:
+            secret_dictionary = self._single_flight.do(cache_key, lambda: self._load(cache_key))
+        else:
+            secret_dictionary, stale = entry
+            if stale:
+                self._refresh_in_background(cache_key)
+        return dict(secret_dictionary)
+
+    def _cache_dictionary(self, cache_key: str, secret_dictionary: Dict[str, str]) -> None:
+        if secret_dictionary:
+            self._cache.set(cache_key, dict(secret_dictionary), stale_ttl=self._stale_ttl)
+        else:
+            self._cache.set(cache_key, {}, ttl=self._negative_ttl, stale_ttl=0)
+
+    def _read_provider(self) -> Dict[str, str]:
+        """
+        Fetches the dictionary from the wrapped provider, unless its version is the one fetched last.
+        """
+        with self._refresh_lock:
+            generation = self._generation
+        version = None
+        if self._revalidate:
+            try:
+                version = self._provider.get_version_info()
+            except Exception as e:
+                self.logger.warning("CachingSecretsProvider: version check failed: %s", e)
+
+        with self._refresh_lock:
+            validated = self._validated
+            if version is not None and validated is not None and validated[0] == version:
+                self._revalidated += 1
+                return dict(validated[1])
+
+        # The version was read first, so a change made in between is caught by the next check
+        secret_dictionary = self._provider.get_secret_dictionary() or {}
+        if version is not None:
+            with self._refresh_lock:
+                if generation == self._generation:
+                    self._validated = (version, dict(secret_dictionary))
+        return secret_dictionary
+
+    def _fetch(self, cache_key: str) -> Dict[str, str]:
+        with self._refresh_lock:
+            generation = self._generation
+        secret_dictionary = self._read_provider()
+        self._cache_if_current(cache_key, generation, secret_dictionary)
+        return secret_dictionary
+
+    def _cache_if_current(self, cache_key: str, generation: int, secret_dictionary: Dict[str, str]) -> None:
+        """
+        Caches a dictionary read from the wrapped provider, unless a write invalidated the cache since the read
+        started: the dictionary may then predate the write.
+        """
+        with self._refresh_lock:
+            if generation != self._generation:
+                return
+            if self._persistent_cache is not None:
+                self._persistent_cache.set(cache_key, secret_dictionary)
+            self._cache_dictionary(cache_key, secret_dictionary)
+
+    def _load(self, cache_key: str) -> Dict[str, str]:
+        """
+        Loads the dictionary on a memory cache miss, from the disk copy or from the wrapped provider,
+        and caches it in memory.
+        """
+        if self._persistent_cache is None:
+            return self._fetch(cache_key)
+
+        entry = self._persistent_cache.get(cache_key)
+        if entry is not None:
+            secret_dictionary, stored_at = entry
+            if time.time() - stored_at <= self._max_staleness:
+                self._cache_dictionary(cache_key, secret_dictionary)
+                self._refresh_in_background(cache_key)
+                return secret_dictionary
+
+        try:
+            return self._fetch(cache_key)
+        except Exception as e:
+            if entry is None or not self._offline_fallback:
+                raise
+            self.logger.warning("CachingSecretsProvider: serving the copy stored %d seconds ago, "
+                                "as the secrets provider failed: %s", time.time() - entry[1], e)
+            self._cache_dictionary(cache_key, entry[0])
+            return entry[0]
+
+    def _refresh_in_background(self, cache_key: str) -> None:
+        with self._refresh_lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+            generation = self._generation
+
+        def refresh():
+            try:
+                self._cache_if_current(cache_key, generation, self._read_provider())
+            except Exception as e:
+                self.logger.warning("CachingSecretsProvider: background refresh failed: %s", e)
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(cache_key)
+
+        threading.Thread(target=refresh, name="secrets-cache-refresh", daemon=True).start()
+
+    def store_secret_dictionary(self, secret_dictionary: Dict) -> None:
+        """
+        Stores the secret dictionary in the wrapped provider and invalidates the cached copy.
+        """
+        with self._writing():
+            self._provider.store_secret_dictionary(secret_dictionary)
+
+    def store(self, key: str, secret: str) -> None:
+        with self._writing():
+            self._provider.store(key, secret)
+
+    def get(self, key: str) -> Optional[str]:
+        if not key:
+            self.logger.warning("get: key is missing")
+            return None
+        return self.get_secret_dictionary().get(key)
+
+    def delete(self, key: str) -> None:
+        with self._writing():
+            self._provider.delete(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[str]]:
+        secret_dictionary = self.get_secret_dictionary()
+        return {key: secret_dictionary.get(key) for key in keys}
+
+    def store_many(self, secrets: Dict[str, str]) -> None:
+        with self._writing():
+            self._provider.store_many(secrets)
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        with self._writing():
+            self._provider.delete_many(keys)
+
+    def apply_changes(self, changes: Dict[str, Optional[str]]) -> None:
+        with self._writing():
+            self._provider.apply_changes(changes)
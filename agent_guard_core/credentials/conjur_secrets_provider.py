@@ -1,34 +1,97 @@
 """ Defines utility class ConjurSecretsProvider for authenticating to Conjur & retrieving secrets """
 
+import asyncio
 import base64
 import json
 import os
+import threading
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from http import HTTPStatus
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
-import boto3
-import requests
-from botocore.auth import SigV4Auth
-from botocore.awsrequest import AWSRequest
+import httpx
 from dotenv import load_dotenv
 
-from agent_guard_core.credentials.enum import ConjurEnvVars, CredentialsProvider
+from agent_guard_core.credentials.async_secrets_provider import AsyncBaseSecretsProvider, async_secrets_provider_fm
+from agent_guard_core.credentials.enum import ConjurEnvVars, CredentialsProvider, SecretsLayout
+from agent_guard_core.credentials.per_key_layout import PerKeyLayout
 from agent_guard_core.credentials.secrets_provider import (BaseSecretsProvider, SecretProviderException,
                                                            secrets_provider_fm)
+from agent_guard_core.utils.known_resources import KnownResources
 
 # Tokens should only be reused for 5 minutes (max lifetime is 8 minutes)
 DEFAULT_TOKEN_EXPIRATION = 8
 API_TOKEN_SAFETY_BUFFER = 3
 DEFAULT_API_TOKEN_DURATION = DEFAULT_TOKEN_EXPIRATION - API_TOKEN_SAFETY_BUFFER
+# The background refresher renews the token this long before it is due, so readers never find it expired
+TOKEN_REFRESH_LEAD_SECS = 30.0
+# Lower bound between two refresh attempts, also used as the retry delay after a failed attempt
+MIN_TOKEN_REFRESH_DELAY_SECS = 5.0
 
 DEFAULT_REGION = "us-east-1"
 DEFAULT_NAMESPACE = "data/default"
 DEFAULT_SECRET_ID = "agentic_env_vars"
 DEFAULT_CONJUR_ACCOUNT = "conjur"
+MANIFEST_SUFFIX = ".manifest"
 
 HTTP_TIMEOUT_SECS = 2.0
+# Connection pool of the HTTP client shared by all calls of a provider instance
+DEFAULT_MAX_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_EXPIRY_SECS = 30.0
+# Batch retrieval URLs are split to stay below the request line limits of common proxies and load balancers
+MAX_BATCH_URL_LENGTH = 4000
+
+# Variables this process has seen, which can be set without declaring them through policy first
+_existing_variables = KnownResources()
+
+# (url, body, headers) of a Conjur authentication request
+AuthnRequest = Tuple[str, str, Dict[str, str]]
+
+
+def get_conjur_headers(access_token: str) -> Dict[str, str]:
+    return {
+        "Authorization": f'Token token="{access_token}"',
+        "Content-Type": "text/plain",
+    }
+
+
+def get_http_client_options(http2: bool = False,
+                            max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                            keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY_SECS) -> Dict:
+    """
+    Returns the httpx client options used to talk to Conjur: a bounded pool of keep-alive connections,
+    gzip-compressed responses and, optionally, HTTP/2.
+    """
+    return {
+        "timeout": HTTP_TIMEOUT_SECS,
+        "http2": http2,
+        "limits": httpx.Limits(max_connections=max_connections,
+                               max_keepalive_connections=max_connections,
+                               keepalive_expiry=keepalive_expiry),
+        "headers": {"Accept-Encoding": "gzip"},
+    }
+
+
+def get_token_expiration(access_token: str) -> datetime:
+    """
+    Returns the time after which the access token should be renewed.
+    """
+    # Attempt to get the expiration from the token. If failing then the default expiration will be used
+    try:
+        # The token is in JSON format. Each field in the token is base64 encoded.
+        # So we decode the payload filed and then extract the expiration date from it
+        decoded_token_payload = base64.b64decode(
+            json.loads(access_token)["payload"].encode("ascii"))
+        token_expiration = json.loads(decoded_token_payload)["exp"]
+        return datetime.fromtimestamp(
+            token_expiration) - timedelta(minutes=API_TOKEN_SAFETY_BUFFER)
+    except Exception:
+        # If we can't extract the expiration from the token because we work with an older version
+        # of Conjur, then we use the default expiration
+        return datetime.now() + timedelta(
+            minutes=DEFAULT_API_TOKEN_DURATION)
 
 
 @secrets_provider_fm.flavor(CredentialsProvider.CONJUR)
@@ -43,7 +106,22 @@ class ConjurSecretsProvider(BaseSecretsProvider):
 
     def __init__(self,
                  namespace=DEFAULT_NAMESPACE,
-                 ext_authn_cred_provider=None):
+                 ext_authn_cred_provider=None,
+                 layout: str = SecretsLayout.BLOB,
+                 http2: bool = False,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 token_refresh: bool = False):
+        """
+        :param namespace: Conjur policy base branch. Defaults to 'data/default'.
+        :param ext_authn_cred_provider: Optional function returning the authn credential.
+        :param layout: 'blob' stores all secrets as one JSON variable {namespace}/agentic_env_vars.
+         'per-key' stores each key as its own variable {namespace}/agentic_env_vars/{key},
+         listed by a manifest variable {namespace}/agentic_env_vars.manifest. Defaults to 'blob'.
+        :param http2: Negotiate HTTP/2 with Conjur. Requires the 'h2' package. Defaults to False.
+        :param max_connections: Size of the keep-alive connection pool. Defaults to 10.
+        :param token_refresh: Renew the access token in a background thread before it expires,
+         so reads never wait for authentication. Stopped by close(). Defaults to False.
+        """
         super().__init__()
         load_dotenv()
 
@@ -85,20 +163,60 @@ class ConjurSecretsProvider(BaseSecretsProvider):
         # Define private vars initialized elsewhere
         self._access_token = None
         self._access_token_expiration = datetime.now()
+        self._token_lock = threading.Lock()
+        self._token_refresh = token_refresh
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._refresh_stop = threading.Event()
         self._region = None
+        self._client_options = get_http_client_options(http2=http2, max_connections=max_connections)
+        self._client: Optional[httpx.Client] = None
+        self._max_connections = max_connections
+
+        if layout not in [item.value for item in SecretsLayout]:
+            raise SecretProviderException(f"Unsupported secrets layout: {layout}")
+        self._per_key: Optional[PerKeyLayout] = None
+        if layout == SecretsLayout.PER_KEY:
+            self._per_key = PerKeyLayout(key_path=lambda key: f"{self._get_dictionary_variable_id()}/{key}",
+                                         manifest_path=f"{self._get_dictionary_variable_id()}{MANIFEST_SUFFIX}",
+                                         read=self._read_variable,
+                                         write=self._write_variable,
+                                         remove=self._remove_variable,
+                                         read_many=self.get_secrets)
+
+    def _get_client(self) -> httpx.Client:
+        """
+        Returns the HTTP client of this provider, creating it on first use.
+        All calls share its pool, so repeated calls reuse warm connections instead of new TCP+TLS handshakes.
+        """
+        if self._client is None:
+            try:
+                self._client = httpx.Client(**self._client_options)
+            except ImportError as e:
+                raise SecretProviderException(
+                    f"ConjurSecretsProvider: HTTP/2 requires the 'h2' package: {e}") from e
+        return self._client
 
-    # ---- AWS authentication ----
-    def _authenticate_aws_iam(self) -> bool:
+    def close(self) -> None:
         """
-        Authenticates with Conjur using AWS IAM role.
+        Stops the background token refresher and closes the pooled connections to Conjur.
+        """
+        self.stop_token_refresh()
+        if self._client is not None:
+            self._client.close()
+            self._client = None
 
-        This function uses AWS IAM credentials to authenticate with
-        Conjur. It signs a request using the STS temporary credentials
-        and then fetches an API token from Conjur.
+    # ---- AWS authentication ----
+    def _get_aws_iam_authn_request(self) -> AuthnRequest:
+        """
+        Builds the Conjur authentication request for the AWS IAM authenticator.
 
-        Returns:
-            bool: True if the authentication succeeded, False if it failed.
+        The request body holds the headers of an STS GetCallerIdentity request,
+        signed with the current AWS IAM credentials.
         """
+        # boto3 is only needed by this authenticator, and is slow to import
+        import boto3
+        from botocore.auth import SigV4Auth
+        from botocore.awsrequest import AWSRequest
 
         session = boto3.Session()
         credentials = session.get_credentials()
@@ -119,28 +237,28 @@ class ConjurSecretsProvider(BaseSecretsProvider):
         sigv4.add_auth(request)
         signed_headers = json.dumps(dict(request.headers))
 
-        # Fetch an access token from Conjur
         conjur_authenticate_uri = f'{self._url}/{self._authenticator_id}/{self._account}/{self._workload_id.replace("/", "%2F")}/authenticate'
         headers = {"Accept-Encoding": "base64"}
-        response = requests.post(
-            conjur_authenticate_uri,
-            data=signed_headers,
-            headers=headers,
-            timeout=HTTP_TIMEOUT_SECS,
-        )
-        if response.status_code == HTTPStatus.OK:
-            self._access_token = response.text
-            return True
-        return False
+        return conjur_authenticate_uri, signed_headers, headers
 
-    # ---- API key authentication ----
-    def _authenticate_api_key(self) -> bool:
+    def _authenticate_aws_iam(self) -> bool:
         """
-        Authenticates with Conjur using an API key.
+        Authenticates with Conjur using AWS IAM role.
+
+        This function uses AWS IAM credentials to authenticate with
+        Conjur. It signs a request using the STS temporary credentials
+        and then fetches an API token from Conjur.
 
         Returns:
             bool: True if the authentication succeeded, False if it failed.
         """
+        return self._post_authn_request(*self._get_aws_iam_authn_request())
+
+    # ---- API key authentication ----
+    def _get_api_key_authn_request(self) -> AuthnRequest:
+        """
+        Builds the Conjur authentication request for the API key authenticator.
+        """
 
         if self._ext_authn_cred_provider is not None:
             self.logger.debug(
@@ -161,36 +279,24 @@ class ConjurSecretsProvider(BaseSecretsProvider):
                 "ConjurSecretsProvider:_authenticate_api_key(): No API key provided."
             )
 
-        # Fetch an access token from Conjur
         conjur_authenticate_uri = f'{self._url}/authn/{self._account}/{self._workload_id.replace("/", "%2F")}/authenticate'
         headers = {"Accept-Encoding": "base64"}
-        response = requests.post(
-            conjur_authenticate_uri,
-            data=api_key,
-            headers=headers,
-            timeout=HTTP_TIMEOUT_SECS,
-        )
-        if response.status_code == HTTPStatus.OK:
-            self._access_token = response.text
-            return True
-        return False
+        return conjur_authenticate_uri, api_key, headers
 
-    # ---- JWT authentication ----
-    def _authenticate_jwt(self) -> bool:
+    def _authenticate_api_key(self) -> bool:
         """
-        Authenticates with Conjur using a JSON web token (JWT).
-
-        Default behavior is the JWT is expected to be in an environment
-        variable named CONJUR_AUTHN_JWT. As the JWT may expire if it has a
-        short TTL, the default behavior is intended for dev/test only.
-
-        The intention is the user should define an external function that
-        returns a current JWT per the operating environment. A reference to
-        the provider function should be passed at instance creation.
+        Authenticates with Conjur using an API key.
 
         Returns:
             bool: True if the authentication succeeded, False if it failed.
         """
+        return self._post_authn_request(*self._get_api_key_authn_request())
+
+    # ---- JWT authentication ----
+    def _get_jwt_authn_request(self) -> AuthnRequest:
+        """
+        Builds the Conjur authentication request for the JWT authenticator.
+        """
 
         if self._ext_authn_cred_provider is not None:
             self.logger.debug(
@@ -209,7 +315,6 @@ class ConjurSecretsProvider(BaseSecretsProvider):
             raise SecretProviderException(
                 "ConjurSecretsProvider:_authenticate_jwt(): No JWT provided.")
 
-        # Fetch an access token from Conjur
         conjur_authenticate_uri = (
             f"{self._url}/{self._authenticator_id}/{self._account}/authenticate"
         )
@@ -217,63 +322,273 @@ class ConjurSecretsProvider(BaseSecretsProvider):
             "Content-Type": "application/x-www-form-urlencoded",
             "Accept-Encoding": "base64",
         }
-        response = requests.post(
-            conjur_authenticate_uri,
-            data=f"jwt={local_jwt}",
+        return conjur_authenticate_uri, f"jwt={local_jwt}", headers
+
+    def _authenticate_jwt(self) -> bool:
+        """
+        Authenticates with Conjur using a JSON web token (JWT).
+
+        Default behavior is the JWT is expected to be in an environment
+        variable named CONJUR_AUTHN_JWT. As the JWT may expire if it has a
+        short TTL, the default behavior is intended for dev/test only.
+
+        The intention is the user should define an external function that
+        returns a current JWT per the operating environment. A reference to
+        the provider function should be passed at instance creation.
+
+        Returns:
+            bool: True if the authentication succeeded, False if it failed.
+        """
+        return self._post_authn_request(*self._get_jwt_authn_request())
+
+    def _get_authn_request(self) -> AuthnRequest:
+        """
+        Builds the authentication request matching the configured authenticator ID.
+
+        :return: A tuple of (url, body, headers) to POST to Conjur.
+        :raises SecretProviderException: If the authentication method cannot be determined.
+        """
+        if self._authenticator_id.startswith("authn-jwt"):
+            return self._get_jwt_authn_request()
+        if self._authenticator_id.startswith("authn-iam"):
+            return self._get_aws_iam_authn_request()
+        if not self._authenticator_id or self._authenticator_id.startswith(
+                "authn-api"):
+            return self._get_api_key_authn_request()
+        self.logger.error(
+            "connect(): Unable to determine authentication method from authenticator ID: %s",
+            self._authenticator_id,
+        )
+        raise SecretProviderException(
+            f"Unable to determine authentication method from authenticator ID: {self._authenticator_id}")
+
+    def _post_authn_request(self, url: str, data: str, headers: Dict[str, str]) -> bool:
+        response = self._get_client().post(
+            url,
+            content=data,
             headers=headers,
-            timeout=HTTP_TIMEOUT_SECS,
         )
         if response.status_code == HTTPStatus.OK:
             self._access_token = response.text
+            self._update_token_expiration()
             return True
 
         self.logger.error(
-            "ConjurSecretsProvider:_authenticate_jwt(): authentication error: %s",
+            "ConjurSecretsProvider: authentication error: %s",
             response.text,
         )
         return False
 
     def _get_conjur_headers(self) -> Dict[str, str]:
-        self.connect()
-        headers = {
-            "Authorization": f'Token token="{self._access_token}"',
-            "Content-Type": "text/plain",
-        }
+        # Callers authenticate once through connect() before sending their requests
+        return get_conjur_headers(self._access_token)
 
-        return headers
+    def _get_variable_url(self, variable_id: str) -> str:
+        return f"{self._url}/secrets/{self._account}/variable/{urllib.parse.quote(variable_id)}"
 
-    def _update_token_expiration(self):
-        # Attempt to get the expiration from the token. If failing then the default expiration will be used
+    def _get_batch_resource_id(self, variable_id: str) -> str:
+        return f"{self._account}:variable:{variable_id}"
+
+    def _get_batch_urls(self, variable_ids: List[str]) -> List[Tuple[List[str], str]]:
+        """
+        Splits the variables into batch retrieval requests whose URLs stay under MAX_BATCH_URL_LENGTH.
+
+        :return: A list of (variable IDs, URL) tuples.
+        """
+        base_url = f"{self._url}/secrets?variable_ids="
+        batches: List[Tuple[List[str], str]] = []
+        chunk: List[str] = []
+        url = base_url
+        for variable_id in variable_ids:
+            resource_id = urllib.parse.quote(self._get_batch_resource_id(variable_id), safe=":")
+            separator = "," if chunk else ""
+            if chunk and len(url) + len(separator) + len(resource_id) > MAX_BATCH_URL_LENGTH:
+                batches.append((chunk, url))
+                chunk, url, separator = [], base_url, ""
+            chunk.append(variable_id)
+            url += separator + resource_id
+        if chunk:
+            batches.append((chunk, url))
+        return batches
+
+    def _get_dictionary_variable_id(self) -> str:
+        return f"{self._branch}/{self._secret_name}"
+
+    def _get_policy_url(self) -> str:
+        return f"{self._url}/policies/{self._account}/policy/{urllib.parse.quote(self._branch)}"
+
+    def _get_policy_body(self, variable_id: Optional[str] = None) -> str:
+        return f"""
+                - !variable
+                  id: {variable_id or self._secret_name}
+                """
+
+    def _get_relative_variable_id(self, variable_id: str) -> str:
+        # Policies loaded into the namespace branch declare variables relative to it
+        return variable_id[len(self._branch) + 1:] if variable_id.startswith(f"{self._branch}/") else variable_id
+
+    def _read_variable(self, variable_id: str) -> Optional[str]:
+        """
+        Reads a variable, returning None if it does not exist or has no value.
+        """
+        self.connect()
         try:
-            # The token is in JSON format. Each field in the token is base64 encoded.
-            # So we decode the payload filed and then extract the expiration date from it
-            decoded_token_payload = base64.b64decode(
-                json.loads(self._access_token)["payload"].encode("ascii"))
-            token_expiration = json.loads(decoded_token_payload)["exp"]
-            self._access_token_expiration = datetime.fromtimestamp(
-                token_expiration) - timedelta(minutes=API_TOKEN_SAFETY_BUFFER)
-        except:
-            # If we can't extract the expiration from the token because we work with an older version
-            # of Conjur, then we use the default expiration
-            self._access_token_expiration = datetime.now() + timedelta(
-                minutes=DEFAULT_API_TOKEN_DURATION)
+            response = self._get_client().get(
+                self._get_variable_url(variable_id),
+                headers=self._get_conjur_headers(),
+            )
+        except Exception as e:
+            self.logger.error("Error retrieving secret: %s", e)
+            raise SecretProviderException(str(e)) from e
 
-    def connect(self) -> bool:
-        if not self._access_token or datetime.now(
-        ) > self._access_token_expiration:
-            if self._authenticator_id.startswith("authn-jwt"):
-                return self._authenticate_jwt()
-            if self._authenticator_id.startswith("authn-iam"):
-                return self._authenticate_aws_iam()
-            if not self._authenticator_id or self._authenticator_id.startswith(
-                    "authn-api"):
-                return self._authenticate_api_key()
-            self.logger.error(
-                "connect(): Unable to determine authentication method from authenticator ID: %s",
-                self._authenticator_id,
+        if response.status_code == HTTPStatus.NOT_FOUND:
+            return None
+        if response.status_code != HTTPStatus.OK:
+            self.logger.error("get_secret(): secret retrieval error: %s",
+                              response.text)
+            raise SecretProviderException(response.text)
+        return response.text
+
+    def _load_policy(self, policy_body: str, method: str = "POST") -> None:
+        response = self._get_client().request(
+            method,
+            self._get_policy_url(),
+            content=policy_body,
+            headers=self._get_conjur_headers(),
+        )
+        if response.status_code not in (HTTPStatus.OK, HTTPStatus.CREATED):
+            self.logger.error("Error loading policy: %s", response.text)
+            raise SecretProviderException(
+                f"Error storing secret: {response.text}")
+
+    def _write_variable(self, variable_id: str, secret_text: str) -> None:
+        """
+        Sets a variable's value, declaring the variable first if it does not exist yet.
+        """
+        self.connect()
+        try:
+            response = self._get_client().post(
+                self._get_variable_url(variable_id),
+                content=secret_text,
+                headers=self._get_conjur_headers(),
             )
+            if response.status_code == HTTPStatus.NOT_FOUND:
+                self._load_policy(self._get_policy_body(self._get_relative_variable_id(variable_id)))
+                response = self._get_client().post(
+                    self._get_variable_url(variable_id),
+                    content=secret_text,
+                    headers=self._get_conjur_headers(),
+                )
+            if response.status_code != HTTPStatus.CREATED:
+                self.logger.error("Error storing secret: %s", response.text)
+                raise SecretProviderException(
+                    f"Error storing secret: {response.text}")
+        except SecretProviderException:
+            raise
+        except Exception as e:
+            message = f"Error storing secret: {e}"
+            self.logger.error(message)
+            raise SecretProviderException(message) from e
+
+    def _remove_variable(self, variable_id: str) -> None:
+        """
+        Deletes a variable by updating the namespace policy with a !delete statement.
+        """
+        self.connect()
+        policy_body = f"""
+                - !delete
+                  record: !variable {self._get_relative_variable_id(variable_id)}
+                """
+        try:
+            self._load_policy(policy_body, method="PATCH")
+        except SecretProviderException:
+            raise
+        except Exception as e:
+            message = f"Error deleting secret: {e}"
+            self.logger.error(message)
+            raise SecretProviderException(message) from e
+
+    def _update_token_expiration(self):
+        self._access_token_expiration = get_token_expiration(self._access_token)
+
+    def _is_token_valid(self) -> bool:
+        return bool(self._access_token) and datetime.now() <= self._access_token_expiration
+
+    def _authenticate(self) -> bool:
+        if self._authenticator_id.startswith("authn-jwt"):
+            return self._authenticate_jwt()
+        if self._authenticator_id.startswith("authn-iam"):
+            return self._authenticate_aws_iam()
+        if not self._authenticator_id or self._authenticator_id.startswith(
+                "authn-api"):
+            return self._authenticate_api_key()
+        self.logger.error(
+            "connect(): Unable to determine authentication method from authenticator ID: %s",
+            self._authenticator_id,
+        )
         return False
 
+    def connect(self) -> bool:
+        """
+        Authenticates with Conjur if there is no valid access token.
+        Concurrent callers wait for a single authentication request.
+
+        :return: True if a valid access token is available, False if authentication failed.
+        """
+        if self._is_token_valid():
+            return True
+
+        with self._token_lock:
+            if self._is_token_valid():
+                return True
+            authenticated = self._authenticate()
+
+        if authenticated and self._token_refresh:
+            self.start_token_refresh()
+        return authenticated
+
+    def _get_token_refresh_delay(self) -> float:
+        delay = (self._access_token_expiration - datetime.now()).total_seconds() - TOKEN_REFRESH_LEAD_SECS
+        return max(delay, MIN_TOKEN_REFRESH_DELAY_SECS)
+
+    def _refresh_token_loop(self) -> None:
+        while not self._refresh_stop.wait(self._get_token_refresh_delay()):
+            try:
+                with self._token_lock:
+                    refreshed = self._authenticate()
+            except Exception as e:
+                refreshed = False
+                self.logger.warning("ConjurSecretsProvider: background token refresh error: %s", e)
+            if not refreshed:
+                # Retry after the minimal delay; readers fall back to authenticating on expiry
+                self._refresh_stop.wait(MIN_TOKEN_REFRESH_DELAY_SECS)
+
+    def start_token_refresh(self) -> None:
+        """
+        Starts renewing the access token in a background thread, TOKEN_REFRESH_LEAD_SECS before it expires.
+        Does nothing if the refresher is already running.
+        """
+        with self._token_lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_stop.clear()
+            self._refresh_thread = threading.Thread(target=self._refresh_token_loop,
+                                                    name="conjur-token-refresh",
+                                                    daemon=True)
+            self._refresh_thread.start()
+
+    def stop_token_refresh(self) -> None:
+        """
+        Stops the background token refresher, if running.
+        """
+        self._refresh_stop.set()
+        thread, self._refresh_thread = self._refresh_thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def get_cache_key(self) -> str:
+        return f"{CredentialsProvider.CONJUR.value}:{self._url}:{self._account}:{self._branch}/{self._secret_name}"
+
     def get_secret(self, secret_id: str) -> Optional[str]:
         """
         Retrieves a singular secret variable from Conjur.
@@ -281,28 +596,53 @@ class ConjurSecretsProvider(BaseSecretsProvider):
         :return: A string containing the secret value, None if secret is empty or not found..
         :raises SecretProviderException: If there is an error retrieving the secrets.
         """
-        self.connect()
-        url = f"{self._url}/secrets/{self._account}/variable/{urllib.parse.quote(f'{secret_id}')}"
+        secret = self._read_variable(secret_id)
+        if secret is None:
+            self.logger.error("Secret %s: not found or has empty value.",
+                              secret_id)
+        return secret
 
+    def _read_batch(self, variable_ids: List[str], url: str) -> Dict[str, Optional[str]]:
         try:
-            response = requests.get(
-                url,
-                headers=self._get_conjur_headers(),
-                timeout=HTTP_TIMEOUT_SECS,
-            )
-            if response.status_code == HTTPStatus.NOT_FOUND:
-                self.logger.error("Secret %s: not found or has empty value.",
-                                  secret_id)
-                return None
-            if response.status_code != HTTPStatus.OK:
-                self.logger.error("get_secret(): secret retrieval error: %s",
-                                  response.text)
-                raise SecretProviderException(response.text)
-            return response.text
+            response = self._get_client().get(url, headers=self._get_conjur_headers())
         except Exception as e:
-            self.logger.error("Error retrieving secret: %s", e)
+            self.logger.error("Error retrieving secrets: %s", e)
             raise SecretProviderException(str(e)) from e
 
+        if response.status_code == HTTPStatus.NOT_FOUND:
+            # Conjur rejects the whole batch if one variable is missing or empty; tell them apart one by one
+            return {variable_id: self._read_variable(variable_id) for variable_id in variable_ids}
+        if response.status_code != HTTPStatus.OK:
+            self.logger.error("get_secrets(): secrets retrieval error: %s", response.text)
+            raise SecretProviderException(response.text)
+
+        values = response.json()
+        return {variable_id: values.get(self._get_batch_resource_id(variable_id)) for variable_id in variable_ids}
+
+    def get_secrets(self, secret_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Retrieves several secret variables from Conjur using the batch retrieval endpoint.
+        Long lists are split into several requests, which are sent concurrently.
+
+        :param secret_ids: The IDs of the variables to retrieve.
+        :return: A dictionary mapping each ID to its value, or None if not found or empty.
+        :raises SecretProviderException: If there is an error retrieving the secrets.
+        """
+        secret_ids = list(dict.fromkeys(secret_ids))
+        if not secret_ids:
+            return {}
+
+        self.connect()
+        batches = self._get_batch_urls(secret_ids)
+        if len(batches) == 1:
+            return self._read_batch(*batches[0])
+
+        secrets: Dict[str, Optional[str]] = {}
+        with ThreadPoolExecutor(max_workers=min(len(batches), self._max_connections)) as executor:
+            for values in executor.map(lambda batch: self._read_batch(*batch), batches):
+                secrets.update(values)
+        return secrets
+
     def get_secret_dictionary(self) -> Dict[str, str]:
         """
         Retrieves the secret dictionary from Conjur.
@@ -310,17 +650,19 @@ class ConjurSecretsProvider(BaseSecretsProvider):
         :return: A dictionary containing the secrets.
         :raises SecretProviderException: If there is an error retrieving the secrets.
         """
+        if self._per_key is not None:
+            return self._per_key.get_secret_dictionary()
 
         self.connect()
-        url = f"{self._url}/secrets/{self._account}/variable/{urllib.parse.quote(f'{self._branch}/{self._secret_name}')}"
+        url = self._get_variable_url(self._get_dictionary_variable_id())
 
         try:
-            response = requests.get(
+            response = self._get_client().get(
                 url,
                 headers=self._get_conjur_headers(),
-                timeout=HTTP_TIMEOUT_SECS,
             )
             if response.status_code == HTTPStatus.NOT_FOUND:
+                _existing_variables.discard(self.get_cache_key())
                 self.logger.error("Secret %s: not found or has empty value.",
                                   self._secret_name)
                 return {}
@@ -328,6 +670,7 @@ class ConjurSecretsProvider(BaseSecretsProvider):
                 self.logger.error("get: secret retrieval error: %s",
                                   response.text)
                 raise SecretProviderException(response.text)
+            _existing_variables.add(self.get_cache_key())
             return json.loads(response.text)
         except Exception as e:
             self.logger.error("Error retrieving secret: %s", e.args[0])
@@ -345,35 +688,47 @@ class ConjurSecretsProvider(BaseSecretsProvider):
         if secret_dictionary is None:
             raise SecretProviderException("Dictionary not provided")
 
+        if self._per_key is not None:
+            self._per_key.store_secret_dictionary(secret_dictionary)
+            return
+
         self.connect()
-        url = f"{self._url}/policies/{self._account}/policy/{urllib.parse.quote(self._branch)}"
-        policy_body = f"""
-                - !variable
-                  id: {self._secret_name}
-                """
+        cache_key = self.get_cache_key()
+        variable_url = self._get_variable_url(self._get_dictionary_variable_id())
+        secret_text = json.dumps(secret_dictionary)
         try:
-            response = requests.post(
-                url,
-                data=policy_body,
-                headers=self._get_conjur_headers(),
-                timeout=HTTP_TIMEOUT_SECS,
-            )
-            if response.status_code != HTTPStatus.CREATED:
-                self.logger.error("Error creating secret: %s", response.text)
-                raise SecretProviderException(
-                    f"Error storing secret: {response.text}")
-
-            set_secret_url = f"{self._url}/secrets/conjur/variable/{urllib.parse.quote(f'{self._branch}/{self._secret_name}')}"
-            response = requests.post(
-                set_secret_url,
-                data=json.dumps(secret_dictionary),
-                headers=self._get_conjur_headers(),
-                timeout=HTTP_TIMEOUT_SECS,
-            )
+            response = None
+            if cache_key in _existing_variables:
+                response = self._get_client().post(
+                    variable_url,
+                    content=secret_text,
+                    headers=self._get_conjur_headers(),
+                )
+                if response.status_code == HTTPStatus.NOT_FOUND:
+                    # Deleted by someone else since we last saw it
+                    _existing_variables.discard(cache_key)
+
+            if cache_key not in _existing_variables:
+                response = self._get_client().post(
+                    self._get_policy_url(),
+                    content=self._get_policy_body(),
+                    headers=self._get_conjur_headers(),
+                )
+                if response.status_code != HTTPStatus.CREATED:
+                    self.logger.error("Error creating secret: %s", response.text)
+                    raise SecretProviderException(
+                        f"Error storing secret: {response.text}")
+
+                response = self._get_client().post(
+                    variable_url,
+                    content=secret_text,
+                    headers=self._get_conjur_headers(),
+                )
             if response.status_code != HTTPStatus.CREATED:
                 self.logger.error("Error storing secret: %s", response.text)
                 raise SecretProviderException(
                     f"Error storing secret: {response.text}")
+            _existing_variables.add(cache_key)
         except Exception as e:
             message = f"Error storing secret: {e.args[0]}"
             self.logger.error(message)
@@ -397,6 +752,10 @@ class ConjurSecretsProvider(BaseSecretsProvider):
             self.logger.warning(message)
             raise SecretProviderException(message)
 
+        if self._per_key is not None:
+            self._per_key.store(key, secret)
+            return
+
         dictionary = self.get_secret_dictionary()
 
         if not dictionary:
@@ -416,6 +775,9 @@ class ConjurSecretsProvider(BaseSecretsProvider):
         if not key:
             self.logger.warning("get: key is missing, proceeding with default")
 
+        if self._per_key is not None:
+            return self._per_key.get(key) if key else None
+
         dictionary = self.get_secret_dictionary()
 
         if dictionary:
@@ -434,8 +796,241 @@ class ConjurSecretsProvider(BaseSecretsProvider):
             self.logger.warning(message)
             raise SecretProviderException(message)
 
+        if self._per_key is not None:
+            self._per_key.delete(key)
+            return
+
         dictionary = self.get_secret_dictionary()
 
         if dictionary:
             del dictionary[key]
             self.store_secret_dictionary(dictionary)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Retrieves several secrets from Conjur. With the per-key layout, only their keys are read.
+
+        :param keys: The names of the secrets to retrieve.
+        :return: A dictionary mapping each key to its value, or None if not found.
+        """
+        if self._per_key is not None:
+            return self._per_key.get_many(keys)
+        return super().get_many(keys)
+
+    def apply_changes(self, changes: Dict[str, Optional[str]]) -> None:
+        """
+        Stores and deletes several secrets in Conjur. With the per-key layout, only the changed keys
+        and the manifest are written.
+
+        :param changes: A dictionary mapping secret names to their new values, or to None to delete them.
+        """
+        if self._per_key is not None:
+            self._per_key.apply_changes(changes)
+            return
+        super().apply_changes(changes)
+
+
+@async_secrets_provider_fm.flavor(CredentialsProvider.CONJUR)
+class AsyncConjurSecretsProvider(AsyncBaseSecretsProvider):
+    """
+    Manages storing and retrieving secrets from Conjur over an asyncio httpx client.
+
+    namespace: Conjur policy base branch
+    ext_authn_cred_provider: externally defined function to provide Conjur authn creds (authn method dependent)
+    """
+
+    def __init__(self,
+                 namespace=DEFAULT_NAMESPACE,
+                 ext_authn_cred_provider=None,
+                 http2: bool = False,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS):
+        super().__init__()
+        # The blocking provider holds the configuration and builds the requests; it never sends any
+        self._provider = ConjurSecretsProvider(namespace=namespace,
+                                               ext_authn_cred_provider=ext_authn_cred_provider)
+        self._client_options = get_http_client_options(http2=http2, max_connections=max_connections)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._access_token = None
+        self._access_token_expiration = datetime.now()
+        self._connect_lock = asyncio.Lock()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            try:
+                self._client = httpx.AsyncClient(**self._client_options)
+            except ImportError as e:
+                raise SecretProviderException(
+                    f"AsyncConjurSecretsProvider: HTTP/2 requires the 'h2' package: {e}") from e
+        return self._client
+
+    def _is_token_valid(self) -> bool:
+        return bool(self._access_token) and datetime.now() <= self._access_token_expiration
+
+    async def connect(self) -> bool:
+        """
+        Authenticates with Conjur if there is no valid access token.
+        Concurrent callers wait for a single authentication request.
+
+        :return: True if a valid access token is available, False if authentication failed.
+        """
+        if self._is_token_valid():
+            return True
+
+        async with self._connect_lock:
+            if self._is_token_valid():
+                return True
+
+            # Building the request may read cloud credentials, so keep it off the event loop
+            url, data, headers = await asyncio.to_thread(self._provider._get_authn_request)
+            response = await self._get_client().post(url, content=data, headers=headers)
+            if response.status_code == HTTPStatus.OK:
+                self._access_token = response.text
+                self._access_token_expiration = get_token_expiration(self._access_token)
+                return True
+
+            self.logger.error("AsyncConjurSecretsProvider: authentication error: %s", response.text)
+            return False
+
+    async def _get_conjur_headers(self) -> Dict[str, str]:
+        await self.connect()
+        return get_conjur_headers(self._access_token)
+
+    async def get_secret(self, secret_id: str) -> Optional[str]:
+        """
+        Retrieves a singular secret variable from Conjur.
+
+        :return: A string containing the secret value, None if secret is empty or not found.
+        :raises SecretProviderException: If there is an error retrieving the secrets.
+        """
+        try:
+            response = await self._get_client().get(self._provider._get_variable_url(secret_id),
+                                                    headers=await self._get_conjur_headers())
+            if response.status_code == HTTPStatus.NOT_FOUND:
+                self.logger.error("Secret %s: not found or has empty value.", secret_id)
+                return None
+            if response.status_code != HTTPStatus.OK:
+                self.logger.error("get_secret(): secret retrieval error: %s", response.text)
+                raise SecretProviderException(response.text)
+            return response.text
+        except SecretProviderException:
+            raise
+        except Exception as e:
+            self.logger.error("Error retrieving secret: %s", e)
+            raise SecretProviderException(str(e)) from e
+
+    async def _read_batch(self, variable_ids: List[str], url: str) -> Dict[str, Optional[str]]:
+        try:
+            response = await self._get_client().get(url, headers=await self._get_conjur_headers())
+        except Exception as e:
+            self.logger.error("Error retrieving secrets: %s", e)
+            raise SecretProviderException(str(e)) from e
+
+        if response.status_code == HTTPStatus.NOT_FOUND:
+            # Conjur rejects the whole batch if one variable is missing or empty; tell them apart one by one
+            values = await asyncio.gather(*(self.get_secret(variable_id) for variable_id in variable_ids))
+            return dict(zip(variable_ids, values))
+        if response.status_code != HTTPStatus.OK:
+            self.logger.error("get_secrets(): secrets retrieval error: %s", response.text)
+            raise SecretProviderException(response.text)
+
+        values = response.json()
+        return {
+            variable_id: values.get(self._provider._get_batch_resource_id(variable_id))
+            for variable_id in variable_ids
+        }
+
+    async def get_secrets(self, secret_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Retrieves several secret variables from Conjur using the batch retrieval endpoint.
+        Long lists are split into several requests, which are sent concurrently.
+
+        :param secret_ids: The IDs of the variables to retrieve.
+        :return: A dictionary mapping each ID to its value, or None if not found or empty.
+        :raises SecretProviderException: If there is an error retrieving the secrets.
+        """
+        secret_ids = list(dict.fromkeys(secret_ids))
+        if not secret_ids:
+            return {}
+
+        await self.connect()
+        batches = self._provider._get_batch_urls(secret_ids)
+        secrets: Dict[str, Optional[str]] = {}
+        for values in await asyncio.gather(*(self._read_batch(*batch) for batch in batches)):
+            secrets.update(values)
+        return secrets
+
+    async def get_secret_dictionary(self) -> Dict[str, str]:
+        """
+        Retrieves the secret dictionary from Conjur.
+
+        :return: A dictionary containing the secrets.
+        :raises SecretProviderException: If there is an error retrieving the secrets.
+        """
+        return await self._fetch_once(self._fetch_secret_dictionary)
+
+    async def _fetch_secret_dictionary(self) -> Dict[str, str]:
+        secret_text = await self.get_secret(self._provider._get_dictionary_variable_id())
+        if secret_text is None:
+            _existing_variables.discard(self._provider.get_cache_key())
+            return {}
+        _existing_variables.add(self._provider.get_cache_key())
+        try:
+            return json.loads(secret_text)
+        except Exception as e:
+            self.logger.error("Error retrieving secret: %s", e)
+            raise SecretProviderException(str(e)) from e
+
+    async def store_secret_dictionary(self, secret_dictionary: Dict) -> None:
+        """
+        Stores the secret dictionary in Conjur.
+
+        :param secret_dictionary: The dictionary containing secrets to store.
+        :raises SecretProviderException: If there is an error storing the secrets.
+        """
+        try:
+            await self._store_secret_dictionary(secret_dictionary)
+        finally:
+            self._forget_fetch()
+
+    async def _store_secret_dictionary(self, secret_dictionary: Dict) -> None:
+        if secret_dictionary is None:
+            raise SecretProviderException("Dictionary not provided")
+
+        cache_key = self._provider.get_cache_key()
+        variable_url = self._provider._get_variable_url(self._provider._get_dictionary_variable_id())
+        secret_text = json.dumps(secret_dictionary)
+        try:
+            client = self._get_client()
+            response = None
+            if cache_key in _existing_variables:
+                response = await client.post(variable_url,
+                                             content=secret_text,
+                                             headers=await self._get_conjur_headers())
+                if response.status_code == HTTPStatus.NOT_FOUND:
+                    # Deleted by someone else since we last saw it
+                    _existing_variables.discard(cache_key)
+
+            if cache_key not in _existing_variables:
+                response = await client.post(self._provider._get_policy_url(),
+                                             content=self._provider._get_policy_body(),
+                                             headers=await self._get_conjur_headers())
+                if response.status_code != HTTPStatus.CREATED:
+                    self.logger.error("Error creating secret: %s", response.text)
+                    raise SecretProviderException(f"Error storing secret: {response.text}")
+
+                response = await client.post(variable_url,
+                                             content=secret_text,
+                                             headers=await self._get_conjur_headers())
+            if response.status_code != HTTPStatus.CREATED:
+                self.logger.error("Error storing secret: %s", response.text)
+                raise SecretProviderException(f"Error storing secret: {response.text}")
+            _existing_variables.add(cache_key)
+        except Exception as e:
+            message = f"Error storing secret: {e.args[0]}"
+            self.logger.error(message)
+            raise SecretProviderException(message) from e
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
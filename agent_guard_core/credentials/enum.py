@@ -6,6 +6,8 @@ class CredentialsProvider(str, Enum):
     CONJUR = "conjur"
     FILE_DOTENV = "file-dotenv"
     GCP_SECRETS_MANAGER = "gcp-secretsmanager"
+    MEMORY = "memory"
+    TIERED = "tiered"
     
 class ConjurEnvVars(str, Enum):
     CONJUR_AUTHN_LOGIN = "CONJUR_AUTHN_LOGIN" 
@@ -26,4 +28,29 @@ class GcpEnvVars(str, Enum):
     GCP_PROJECT_ID = "GCP_PROJECT_ID"
     GCP_SECRET_ID = "GCP_SECRET_ID"
     GCP_REGION = "GCP_REGION"
-    GCP_REPLICATION_TYPE = "GCP_REPLICATION_TYPE"
\ No newline at end of file
+    GCP_REPLICATION_TYPE = "GCP_REPLICATION_TYPE"
+
+class CacheEnvVars(str, Enum):
+    AGENT_GUARD_CACHE_SECRET = "AGENT_GUARD_CACHE_SECRET"
+
+class TieredEnvVars(str, Enum):
+    # Comma-separated provider flavors, fastest first (i.e. "memory,file-dotenv,conjur")
+    AGENT_GUARD_TIERS = "AGENT_GUARD_TIERS"
+
+class SecretsLayout(str, Enum):
+    # The whole namespace is stored as one JSON document
+    BLOB = "blob"
+    # Each secret is stored as its own remote secret, plus a manifest listing the keys
+    PER_KEY = "per-key"
+
+class WritePolicy(str, Enum):
+    # Writes return once every tier has been updated
+    WRITE_THROUGH = "write-through"
+    # Writes return once the fastest tier has been updated; slower tiers are updated by a background worker
+    WRITE_BEHIND = "write-behind"
+
+class EnvVarsScope(str, Enum):
+    # Secrets are populated into os.environ, visible to the whole process and its subprocesses
+    PROCESS = "process"
+    # Secrets are only visible through getenv() in the current contextvars context (thread or asyncio task)
+    CONTEXT = "context"
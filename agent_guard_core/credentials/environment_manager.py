@@ -1,25 +1,88 @@
-import gc
+import asyncio
+import functools
+import inspect
 import logging
 import os
-from typing import Awaitable, Callable, Dict, Optional
+import random
+import threading
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple, TypeVar, Union
 
-from agent_guard_core.credentials.secrets_provider import BaseSecretsProvider
+from agent_guard_core.credentials.async_secrets_provider import AsyncBaseSecretsProvider
+from agent_guard_core.credentials.enum import EnvVarsScope
+from agent_guard_core.credentials.secrets_provider import BaseSecretsProvider, SecretProviderException
+from agent_guard_core.utils.secret_buffer import SecretBuffer
 
 """
 The EnvironmentVariablesManager class provides functionality for storing,
 retrieving, and deleting environment variables in a secrets provider. It also
 has methods for populating and depopulating OS environment variables based on
 the stored secrets. Use set_env_vars decorator to seamlessly manage environment
-variables around function execution.
+variables around function execution. When running on an event loop, use
+`async with` (or pass an AsyncBaseSecretsProvider) so secret fetches do not block it.
+With scope='context', secrets are not written to os.environ: they are only visible through
+getenv() in the current thread or asyncio task, so concurrent agents can use different secrets.
 
 Caveats
-   * When secrets are populated and depopulated, we delete their references from the garbage collector.
-     However, Python strings are immutable, so an old copy persists in memory.
-     Advanced techniques such as memory dumps can reveal them.
-   * When setting a new secret key, bear in mind it can override an existing environment variable with the same name.
+   * Python strings are immutable, so secrets returned as str, or populated into os.environ, persist in memory
+     until the allocator reuses it; advanced techniques such as memory dumps can reveal them.
+     Use get_env_var_buffer() to hold a secret in a SecretBuffer, which is wiped when released.
+   * When setting a new secret key, bear in mind it can override an existing environment variable with the same name
+     until the secrets are depopulated, when its previous value is restored.
      Avoid overriding system variables such as PATH, SHELL, only if you are sure of what you are doing.
 """
 
+# Fraction of the watch interval by which each wait is randomly shortened or lengthened
+DEFAULT_WATCH_JITTER = 0.1
+
+# Called with the keys of the populated environment variables that changed
+ChangeListener = Callable[[Set[str]], None]
+FuncT = TypeVar("FuncT", bound=Callable[..., Any])
+
+
+class _ContextScope(NamedTuple):
+    manager: "EnvironmentVariablesManager"
+    parent: Optional["_ContextScope"]
+
+
+# The innermost context-scoped manager populated in the current context, linked to the enclosing ones
+_context_scope: ContextVar[Optional[_ContextScope]] = ContextVar("agent_guard_context_scope", default=None)
+
+
+def getenv(key: str, default: Optional[str] = None) -> Optional[str]:
+    """
+    Drop-in replacement for os.getenv() that first looks up the secrets populated by context-scoped
+    EnvironmentVariablesManagers in the current context, innermost first, then os.environ.
+    Asyncio tasks see the scopes entered by the code that created them; new threads start with none.
+
+    :param key: The name of the environment variable.
+    :param default: The value returned if the variable is not set.
+    :return: The value of the environment variable, or default.
+    """
+    scope = _context_scope.get()
+    while scope is not None:
+        value = scope.manager._scoped_env_vars.get(key)
+        if value is not None:
+            return value
+        scope = scope.parent
+    return os.environ.get(key, default)
+
+
+def get_scoped_env_vars() -> Dict[str, str]:
+    """
+    Returns the secrets populated by context-scoped EnvironmentVariablesManagers in the current context,
+    inner scopes overriding outer ones. os.environ is not included.
+    """
+    scopes = []
+    scope = _context_scope.get()
+    while scope is not None:
+        scopes.append(scope.manager._scoped_env_vars)
+        scope = scope.parent
+    env_vars: Dict[str, str] = {}
+    for scoped_env_vars in reversed(scopes):
+        env_vars.update(scoped_env_vars)
+    return env_vars
+
 
 class EnvironmentVariablesManager:
     """
@@ -28,15 +91,65 @@ class EnvironmentVariablesManager:
     as well as populating and depopulating them from the OS environment.
     """
 
-    def __init__(self, secret_provider: BaseSecretsProvider):
+    def __init__(self,
+                 secret_provider: Union[BaseSecretsProvider, AsyncBaseSecretsProvider],
+                 secret_ids: Optional[Union[Iterable[str], Dict[str, str]]] = None,
+                 watch_interval: Optional[float] = None,
+                 watch_jitter: float = DEFAULT_WATCH_JITTER,
+                 scope: Union[EnvVarsScope, str] = EnvVarsScope.PROCESS):
         """
         Initialize the EnvironmentVariablesManager.
 
         :param secret_provider: The secret provider to use for storing and retrieving secrets.
+         An AsyncBaseSecretsProvider can only be used through the asynchronous methods.
+        :param secret_ids: Optional individual secrets to expose instead of the provider's secret dictionary,
+         fetched with a single batch call to the provider's get_secrets() (i.e. ConjurSecretsProvider).
+         Either a dictionary mapping environment variable keys to secret IDs, or a list of secret IDs,
+         each exposed under the last segment of its ID.
+        :param watch_interval: Optional number of seconds between checks for rotated secrets while the environment
+         variables are populated. Changed variables are updated in place and the change listeners are called.
+         Disabled by default.
+        :param watch_jitter: Fraction of watch_interval by which each wait is randomly shortened or lengthened,
+         so agents started together do not poll the provider in lockstep. Defaults to 0.1.
+        :param scope: 'process' populates os.environ. 'context' leaves os.environ untouched and exposes the secrets
+         through getenv() to the current thread or asyncio task, and the tasks it creates, until depopulated.
+         Defaults to 'process'.
         """
-        self.secret_provider: BaseSecretsProvider = secret_provider
+        self.secret_provider: Union[BaseSecretsProvider, AsyncBaseSecretsProvider] = secret_provider
         self._logger: logging.Logger = logging.getLogger(__name__)
 
+        self._secret_ids: Optional[Dict[str, str]] = None
+        if secret_ids is not None:
+            if not hasattr(secret_provider, "get_secrets"):
+                raise SecretProviderException(
+                    f"{type(secret_provider).__name__} does not support retrieving secrets by ID")
+            if isinstance(secret_ids, dict):
+                self._secret_ids = dict(secret_ids)
+            else:
+                self._secret_ids = {secret_id.rsplit("/", 1)[-1]: secret_id for secret_id in secret_ids}
+
+        if watch_interval is not None and watch_interval <= 0:
+            raise SecretProviderException("watch_interval must be positive")
+        self._watch_interval = watch_interval
+        self._watch_jitter = watch_jitter
+        self._listeners: List[ChangeListener] = []
+        # The keys populated, mapped to the value each one shadowed (None if it was not set),
+        # and the version of the secrets they were populated from
+        self._populated = False
+        self._shadowed: Dict[str, Optional[str]] = {}
+        self._version: Optional[str] = None
+        self._watch_lock = threading.Lock()
+        self._watch_stop: Optional[threading.Event] = None
+        self._watch_task: Optional[asyncio.Task] = None
+
+        try:
+            self._scope = EnvVarsScope(scope)
+        except ValueError as e:
+            raise SecretProviderException(f"Unknown environment variables scope: {scope}") from e
+        # Context scope: the secrets read by getenv(), and the number of contexts they are populated in
+        self._scoped_env_vars: Dict[str, str] = {}
+        self._context_count = 0
+
     def __enter__(self):
         """
         Context manager entry method: populates environment variables into the system.
@@ -57,6 +170,23 @@ class EnvironmentVariablesManager:
         """
         self.depopulate_env_vars()
 
+    async def __aenter__(self):
+        """
+        Asynchronous context manager entry method: populates environment variables into the system
+        without blocking the event loop.
+
+        :return: The EnvironmentVariablesManager instance.
+        """
+        await self.apopulate_env_vars()
+        return self
+
+    async def __aexit__(self, exc_type: Optional[type],
+                        exc_val: Optional[BaseException], exc_tb: Optional[object]):
+        """
+        Asynchronous context manager exit method: removes environment variables from the system.
+        """
+        await self.adepopulate_env_vars()
+
     def list_env_vars(self) -> Dict[str, str]:
         """
         List all environment variables stored in the secret provider.
@@ -64,12 +194,53 @@ class EnvironmentVariablesManager:
         :return: A dictionary of environment variables.
         """
         try:
-            secret_dictionary = self.secret_provider.get_secret_dictionary()
+            return self._fetch_env_vars()
+        except Exception as e:
+            self._logger.warning("Failed to list environment variables: %s",
+                                 e.args[0])
+            return {}
+
+    def _fetch_env_vars(self) -> Dict[str, str]:
+        if self._secret_ids is not None:
+            return self._map_secret_ids(self.secret_provider.get_secrets(self._secret_ids.values()))
+        return self.secret_provider.get_secret_dictionary()
+
+    async def alist_env_vars(self) -> Dict[str, str]:
+        """
+        List all environment variables stored in the secret provider without blocking the event loop.
+        Blocking providers are called in a worker thread.
+
+        :return: A dictionary of environment variables.
+        """
+        try:
+            return await self._afetch_env_vars()
         except Exception as e:
             self._logger.warning("Failed to list environment variables: %s",
                                  e.args[0])
             return {}
-        return secret_dictionary
+
+    async def _afetch_env_vars(self) -> Dict[str, str]:
+        if self._secret_ids is not None:
+            secret_ids = list(self._secret_ids.values())
+            if isinstance(self.secret_provider, AsyncBaseSecretsProvider):
+                secrets = await self.secret_provider.get_secrets(secret_ids)
+            else:
+                secrets = await asyncio.to_thread(self.secret_provider.get_secrets, secret_ids)
+            return self._map_secret_ids(secrets)
+        if isinstance(self.secret_provider, AsyncBaseSecretsProvider):
+            return await self.secret_provider.get_secret_dictionary()
+        return await asyncio.to_thread(self.secret_provider.get_secret_dictionary)
+
+    def _map_secret_ids(self, secrets: Dict[str, Optional[str]]) -> Dict[str, str]:
+        env_vars = {}
+        for key, secret_id in self._secret_ids.items():
+            value = secrets.get(secret_id)
+            if value is None:
+                self._logger.warning("Secret %s of environment variable %s: not found or has empty value",
+                                     secret_id, key)
+                continue
+            env_vars[key] = value
+        return env_vars
 
     def add_env_var(self, key: str, value: str) -> None:
         """
@@ -87,14 +258,50 @@ class EnvironmentVariablesManager:
         :param key: The key of the environment variable.
         :return: The value of the environment variable, or None if not found.
         """
-        secret_dictionary: Dict[str, str] = self.list_env_vars()
-        secret_value: Optional[str] = secret_dictionary.get(key)
+        return self.list_env_vars().get(key)
+
+    def get_env_var_buffer(self, key: str, lock: bool = False) -> Optional[SecretBuffer]:
+        """
+        Retrieve an environment variable from the secret provider into a SecretBuffer, which the caller
+        releases once done with the secret to overwrite it with zeros. The str copies made by the provider
+        while fetching the secret are not covered.
+
+        :param key: The key of the environment variable.
+        :param lock: Lock the buffer in RAM, so the secret is never written to swap.
+        :return: The value of the environment variable, or None if not found.
+        """
+        value = self.list_env_vars().get(key)
+        return SecretBuffer(value, lock=lock) if value is not None else None
 
-        # Clear the secret dictionary from process references
-        del secret_dictionary
-        gc.collect()
+    def add_env_vars(self, env_vars: Dict[str, str]) -> None:
+        """
+        Add several environment variables to the secret provider with a single write.
 
-        return secret_value
+        :param env_vars: A dictionary mapping environment variable keys to their values.
+        """
+        try:
+            self.secret_provider.store_many({
+                key.strip(): value.strip()
+                for key, value in env_vars.items()
+            })
+        except Exception as e:
+            self._logger.error("Failed to set environment variables %s: %s",
+                               list(env_vars.keys()), e.args[0])
+
+    def get_env_vars(self, keys: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Retrieve several environment variables from the secret provider with a single fetch.
+
+        :param keys: The keys of the environment variables.
+        :return: A dictionary mapping each key to its value, or None if not found.
+        """
+        keys = list(keys)
+        try:
+            return self.secret_provider.get_many(keys)
+        except Exception as e:
+            self._logger.warning("Failed to get environment variables: %s",
+                                 e.args[0])
+            return {key: None for key in keys}
 
     def _set_env_var(self, key: str, value: str) -> None:
         """
@@ -112,10 +319,6 @@ class EnvironmentVariablesManager:
         except Exception as e:
             self._logger.error("Failed to set environment variable '%s': %s",
                                key, e.args[0])
-        finally:
-            # Clear the secret dictionary from process references
-            del secret_dictionary
-            gc.collect()
 
     def _remove_env_var(self, key: str) -> None:
         """
@@ -134,70 +337,486 @@ class EnvironmentVariablesManager:
             self._logger.error(
                 "Failed to remove environment variable '%s': %s", key,
                 e.args[0])
-        finally:
-            # Clear the secret dictionary from process references
-            del secret_dictionary
-            gc.collect()
 
     def populate_env_vars(self) -> None:
         """
         Populate environment variables from the secret provider into the system environment.
+        With a watch_interval, a background thread then keeps them up to date until they are depopulated.
         """
-        env_vars: Dict[str, str] = self.list_env_vars()
-        for key, value in env_vars.items():
-            os.environ[key] = value
-            self._logger.info("Populating environment variable with key: %s",
-                              key)
-            del value
+        # The version is read first, so a change made while fetching is caught by the first check
+        version = self._read_version() if self._watch_interval else None
+        try:
+            env_vars: Optional[Dict[str, str]] = self._fetch_env_vars()
+        except Exception as e:
+            self._logger.warning("Failed to list environment variables: %s", e)
+            env_vars = None
+        self._populate_env_vars(env_vars, version)
+        if self._watch_interval and self._watch_stop is None:
+            self._watch_stop = threading.Event()
+            threading.Thread(target=self._watch, args=(self._watch_stop,), name="secrets-watcher",
+                             daemon=True).start()
+
+    async def apopulate_env_vars(self) -> None:
+        """
+        Populate environment variables from the secret provider into the system environment
+        without blocking the event loop.
+        With a watch_interval, a task on the running event loop then keeps them up to date until they are depopulated.
+        """
+        version = await self._aread_version() if self._watch_interval else None
+        try:
+            env_vars: Optional[Dict[str, str]] = await self._afetch_env_vars()
+        except Exception as e:
+            self._logger.warning("Failed to list environment variables: %s", e)
+            env_vars = None
+        self._populate_env_vars(env_vars, version)
+        if self._watch_interval and self._watch_task is None:
+            self._watch_task = asyncio.get_running_loop().create_task(self._awatch())
+
+    def _populate_env_vars(self, env_vars: Optional[Dict[str, str]], version: Optional[str] = None) -> None:
+        """
+        :param env_vars: The environment variables fetched, or None if the fetch failed. A failed fetch keeps
+         what is already populated and its version, so a transient error does not wipe the environment and
+         the watcher retries; with nothing populated yet, nothing is.
+        """
+        with self._watch_lock:
+            if env_vars is not None or not self._populated:
+                for key in env_vars or {}:
+                    self._logger.info("Populating environment variable with key: %s",
+                                      key)
+                self._set_env_vars(env_vars or {})
+                self._version = version if env_vars is not None else None
+            self._populated = True
+            if self._scope == EnvVarsScope.CONTEXT:
+                _context_scope.set(_ContextScope(self, _context_scope.get()))
+                self._context_count += 1
+
+    def _set_env_vars(self, env_vars: Dict[str, str]) -> Set[str]:
+        """
+        Makes the system environment hold env_vars, recording the values they shadow, and restores
+        the variables populated before that are not in env_vars. The caller holds _watch_lock.
 
-        # Clear the secret dictionary from process references
-        del env_vars
-        gc.collect()
+        :return: The keys whose value changed.
+        """
+        if self._scope == EnvVarsScope.CONTEXT:
+            changed = {
+                key for key in self._scoped_env_vars.keys() | env_vars.keys()
+                if self._scoped_env_vars.get(key) != env_vars.get(key)
+            }
+            # Replaced rather than updated, so getenv() in other threads never sees a partial update
+            self._scoped_env_vars = dict(env_vars)
+            return changed
+
+        changed = set()
+        for key, value in env_vars.items():
+            current = os.environ.get(key)
+            if key not in self._shadowed:
+                self._shadowed[key] = current
+            if current != value:
+                os.environ[key] = value
+                changed.add(key)
+        for key in [key for key in self._shadowed if key not in env_vars]:
+            self._restore_env_var(key)
+            changed.add(key)
+        return changed
+
+    def _restore_env_var(self, key: str) -> None:
+        shadowed = self._shadowed.pop(key)
+        if shadowed is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = shadowed
 
     def depopulate_env_vars(self) -> None:
         """
-        Remove environment variables from the system environment.
+        Remove the populated environment variables from the system environment, restoring the values they
+        shadowed. The keys were recorded when populating, so the secret provider is not called.
+        In context scope, the secrets are removed from the current context instead. Depopulating from a context
+        that did not populate them, i.e. another asyncio task, still drops one population.
+        """
+        if self._depopulate_env_vars():
+            self._stop_watching()
+
+    async def adepopulate_env_vars(self) -> None:
+        """
+        The asyncio counterpart of depopulate_env_vars(). It does not call the secret provider either.
+        """
+        if self._depopulate_env_vars():
+            self._stop_watching()
+
+    def _depopulate_env_vars(self) -> bool:
+        """
+        :return: True once the secrets are no longer populated anywhere, False while other contexts
+         still hold a context-scoped population.
         """
-        env_vars: Dict[str, str] = self.list_env_vars()
-        for key in env_vars.keys():
-            if key in os.environ:
-                del os.environ[key]
+        with self._watch_lock:
+            if self._scope == EnvVarsScope.CONTEXT:
+                return self._depopulate_context()
+
+            for key in list(self._shadowed):
+                self._restore_env_var(key)
                 self._logger.info("Removing environment variable with key: %s",
                                   key)
+            self._populated = False
+            return True
+
+    def _depopulate_context(self) -> bool:
+        scope = _context_scope.get()
+        while scope is not None and scope.manager is not self:
+            scope = scope.parent
+        if scope is not None:
+            # Scopes entered inside this one and not exited are dropped along with it
+            _context_scope.set(scope.parent)
+        elif self._context_count > 0:
+            # Populated in another context, i.e. another asyncio task, whose scope cannot be exited from here:
+            # one population is dropped anyway, and getenv() there finds no secrets once none are left
+            self._logger.warning("Depopulating context-scoped environment variables populated in another context")
+        if self._context_count > 0:
+            self._context_count -= 1
+        if self._context_count > 0:
+            return False
+        self._scoped_env_vars = {}
+        self._populated = False
+        return True
+
+    def build_child_env(self, base_env: Optional[Mapping[str, str]] = None) -> Dict[str, str]:
+        """
+        Builds the environment of a child process: base_env with the secrets from the provider on top.
+        The environment of this process is not modified, so the secrets are only visible to the child:
+
+        ```
+        subprocess.run(argv, env=manager.build_child_env())
+        ```
+
+        :param base_env: The variables to start from. Defaults to a copy of os.environ.
+        :return: A new dictionary, fetched with a single call to the provider.
+        :raises SecretProviderException: If the secrets could not be retrieved.
+        """
+        env = dict(os.environ if base_env is None else base_env)
+        try:
+            env.update(self._fetch_env_vars())
+        except Exception as e:
+            raise SecretProviderException(f"Failed to retrieve the environment variables of the child: {e}") from e
+        return env
+
+    async def abuild_child_env(self, base_env: Optional[Mapping[str, str]] = None) -> Dict[str, str]:
+        """
+        The asyncio counterpart of build_child_env().
+        """
+        env = dict(os.environ if base_env is None else base_env)
+        try:
+            env.update(await self._afetch_env_vars())
+        except Exception as e:
+            raise SecretProviderException(f"Failed to retrieve the environment variables of the child: {e}") from e
+        return env
+
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        """
+        Registers a function called with the keys of the populated environment variables that changed,
+        i.e. to rebuild clients holding a rotated API key. Listeners are called from the watcher thread,
+        or from the event loop when populated with apopulate_env_vars().
+
+        :param listener: A function taking the set of changed keys.
+        """
+        self._listeners.append(listener)
+
+    def remove_change_listener(self, listener: ChangeListener) -> None:
+        """
+        Unregisters a function registered with add_change_listener().
+        """
+        self._listeners.remove(listener)
+
+    def check_for_changes(self) -> Set[str]:
+        """
+        Updates the populated environment variables whose secrets changed in the provider, and calls the
+        change listeners. When the provider reports versions, only the version is read if it did not change.
+        The watcher calls this every watch_interval seconds; it can also be called directly.
+
+        :return: The keys of the environment variables that were updated, added or removed.
+        :raises SecretProviderException: If the secrets could not be retrieved.
+        """
+        version = self._read_version()
+        if version is not None and version == self._version:
+            return set()
+        try:
+            env_vars = self._fetch_env_vars()
+        except Exception as e:
+            raise SecretProviderException(f"Failed to check environment variables for changes: {e}") from e
+        return self._apply_changes(env_vars, version)
+
+    async def acheck_for_changes(self) -> Set[str]:
+        """
+        The asyncio counterpart of check_for_changes().
+        """
+        version = await self._aread_version()
+        if version is not None and version == self._version:
+            return set()
+        try:
+            env_vars = await self._afetch_env_vars()
+        except Exception as e:
+            raise SecretProviderException(f"Failed to check environment variables for changes: {e}") from e
+        return self._apply_changes(env_vars, version)
 
-        # Clear the secret dictionary from process references
-        del env_vars
-        gc.collect()
+    def _read_version(self) -> Optional[str]:
+        # Individual secrets have no version covering all of them
+        if self._secret_ids is not None or isinstance(self.secret_provider, AsyncBaseSecretsProvider):
+            return None
+        try:
+            return self.secret_provider.get_version_info()
+        except Exception as e:
+            self._logger.warning("Failed to read the version of the secrets: %s", e)
+            return None
+
+    async def _aread_version(self) -> Optional[str]:
+        if self._secret_ids is not None:
+            return None
+        try:
+            if isinstance(self.secret_provider, AsyncBaseSecretsProvider):
+                return await self.secret_provider.get_version_info()
+            return await asyncio.to_thread(self.secret_provider.get_version_info)
+        except Exception as e:
+            self._logger.warning("Failed to read the version of the secrets: %s", e)
+            return None
+
+    def _apply_changes(self, env_vars: Dict[str, str], version: Optional[str]) -> Set[str]:
+        with self._watch_lock:
+            # Depopulated while the secrets were being fetched
+            if not self._populated:
+                return set()
+            changed = self._set_env_vars(env_vars)
+            self._version = version
+
+        if changed:
+            self._logger.info("Updated rotated environment variables with keys: %s", sorted(changed))
+            for listener in list(self._listeners):
+                try:
+                    listener(set(changed))
+                except Exception as e:
+                    self._logger.error("Environment variables change listener failed: %s", e)
+        return changed
+
+    def _get_watch_delay(self) -> float:
+        return self._watch_interval * random.uniform(1 - self._watch_jitter, 1 + self._watch_jitter)
+
+    def _watch(self, stop: threading.Event) -> None:
+        while not stop.wait(self._get_watch_delay()):
+            try:
+                self.check_for_changes()
+            except Exception as e:
+                self._logger.warning("%s", e)
+
+    async def _awatch(self) -> None:
+        while True:
+            await asyncio.sleep(self._get_watch_delay())
+            try:
+                await self.acheck_for_changes()
+            except Exception as e:
+                self._logger.warning("%s", e)
+
+    def _stop_watching(self) -> None:
+        if self._watch_stop is not None:
+            self._watch_stop.set()
+            self._watch_stop = None
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            self._watch_task = None
 
     @staticmethod
-    def set_env_vars(
-        secret_provider: BaseSecretsProvider
-    ) -> Callable[[Callable[..., Awaitable]], Callable[..., Awaitable]]:
+    def set_env_vars(secret_provider: Union[BaseSecretsProvider, AsyncBaseSecretsProvider]) -> Callable[[FuncT], FuncT]:
         """
         Decorator that populates environment variables from the given secret
         provider before the wrapped function is called, and depopulates them
         afterwards. This ensures that any environment variables needed for the
         function are ready before execution and cleaned up afterward.
 
+        Concurrent calls share the population: the first call in populates the environment variables,
+        calls made while they are populated reuse them, and the last call out depopulates them.
+        Every function decorated by the same decorator shares it, i.e. with_secrets = set_env_vars(provider).
+
         :param secret_provider: The secret provider to use for managing environment variables.
-        :return: A decorator for asynchronous functions.
+         Wrap it in a CachingSecretsProvider so consecutive calls do not fetch the secrets every time.
+        :return: A decorator for synchronous or asynchronous functions.
         """
+        population = _SharedPopulation(EnvironmentVariablesManager(secret_provider=secret_provider))
 
-        def async_decorator(
-                func: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+        def decorator(func: FuncT) -> FuncT:
+            if inspect.iscoroutinefunction(func):
 
-            async def wrapper(*args, **kwargs) -> Awaitable:
-                env_var_mgr = EnvironmentVariablesManager(
-                    secret_provider=secret_provider)
-                env_var_mgr.populate_env_vars()
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    await population.aacquire()
+                    try:
+                        return await func(*args, **kwargs)
+                    finally:
+                        population.release()
 
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                population.acquire()
                 try:
-                    result = await func(*args, **kwargs)
+                    return func(*args, **kwargs)
                 finally:
-                    env_var_mgr.depopulate_env_vars()
-
-                return result
+                    population.release()
 
             return wrapper
 
-        return async_decorator
+        return decorator
+
+
+class _Population:
+    """
+    A population in progress, which callers arriving meanwhile wait for instead of populating again.
+    """
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop]):
+        # The event loop populating, or None for a thread
+        self.loop = loop
+        self.waiters = 0
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+        self._futures: List["asyncio.Future[None]"] = []
+
+    def add_future(self, loop: asyncio.AbstractEventLoop) -> "asyncio.Future[None]":
+        future = loop.create_future()
+        self._futures.append(future)
+        return future
+
+    def finish(self, error: Optional[BaseException]) -> None:
+        self.error = error
+        self.done.set()
+        # The waiting tasks may run on other event loops than the populating one
+        for future in self._futures:
+            future.get_loop().call_soon_threadsafe(_resolve_future, future)
+
+
+def _resolve_future(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def _get_running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class _SharedPopulation:
+    """
+    Keeps the environment variables of a manager populated while at least one caller is inside:
+    the first caller in populates them, and the last one out depopulates them.
+    Threads and tasks arriving while the first caller populates wait for it without holding any lock,
+    so a fetch in a thread never blocks an event loop.
+    """
+
+    def __init__(self, manager: EnvironmentVariablesManager):
+        self._manager = manager
+        self._count = 0
+        self._population: Optional[_Population] = None
+        # Only guards the fields above; never held while fetching secrets
+        self._lock = threading.Lock()
+
+    def _enter(self, loop: Optional[asyncio.AbstractEventLoop]) -> Tuple[Optional[_Population], bool]:
+        """
+        Counts the caller in if the environment variables are populated, otherwise starts a population
+        or joins the one in progress. The caller holds _lock.
+
+        :return: The population to run or wait for, or None if the caller was counted in,
+         and whether the caller runs it.
+        """
+        if self._population is None:
+            if self._count > 0:
+                self._count += 1
+                return None, False
+            self._population = _Population(loop)
+            return self._population, True
+        self._population.waiters += 1
+        return self._population, False
+
+    def _finish(self, population: _Population, error: Optional[BaseException] = None) -> None:
+        if error is not None and self._manager._populated:
+            # i.e. cancelled once the secrets were set: no caller is counted in to depopulate them
+            self._manager.depopulate_env_vars()
+        with self._lock:
+            self._population = None
+            if error is None:
+                # The waiters are counted in along with the caller that populated
+                self._count += 1 + population.waiters
+            population.finish(error)
+
+    @staticmethod
+    def _joined(population: _Population) -> bool:
+        """
+        :return: True once the population the caller waited for succeeded, False if it was cancelled
+         and the caller should start over.
+        :raises Exception: The error of the failed population.
+        """
+        if population.error is None:
+            return True
+        if isinstance(population.error, asyncio.CancelledError):
+            return False
+        raise population.error
+
+    def acquire(self) -> None:
+        running_loop = _get_running_loop()
+        while True:
+            with self._lock:
+                if running_loop is not None and self._population is not None and \
+                        self._population.loop is running_loop:
+                    raise SecretProviderException("set_env_vars: a synchronous call cannot wait for the secrets "
+                                                  "being populated on its own event loop")
+                population, owner = self._enter(None)
+            if population is None:
+                return
+
+            if owner:
+                try:
+                    self._manager.populate_env_vars()
+                except BaseException as e:
+                    self._finish(population, e)
+                    raise
+                self._finish(population)
+                return
+
+            population.done.wait()
+            if self._joined(population):
+                return
+
+    async def aacquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                population, owner = self._enter(loop)
+                future = population.add_future(loop) if population is not None and not owner else None
+            if population is None:
+                return
+
+            if owner:
+                try:
+                    await self._manager.apopulate_env_vars()
+                except BaseException as e:
+                    self._finish(population, e)
+                    raise
+                self._finish(population)
+                return
+
+            try:
+                await future
+            except asyncio.CancelledError:
+                with self._lock:
+                    counted_in = population.done.is_set() and population.error is None
+                    if not population.done.is_set():
+                        population.waiters -= 1
+                if counted_in:
+                    self.release()
+                raise
+            if self._joined(population):
+                return
+
+    def release(self) -> None:
+        # Depopulating restores the environment locally, so it does not block the event loop
+        with self._lock:
+            self._count -= 1
+            if self._count == 0:
+                self._manager.depopulate_env_vars()
@@ -1,28 +1,131 @@
+import contextlib
+import io
+import json
 import os
-from typing import Dict, Optional
+import re
+import stat
+import tempfile
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
-from dotenv import dotenv_values
+try:
+    import fcntl
+except ImportError:  # Windows: writes stay atomic, but concurrent read-modify-writes are not serialized
+    fcntl = None
 
+from agent_guard_core.credentials.async_secrets_provider import AsyncSecretsProviderAdapter, async_secrets_provider_fm
 from agent_guard_core.credentials.enum import CredentialsProvider
 from agent_guard_core.credentials.secrets_provider import (BaseSecretsProvider, SecretProviderException,
                                                            secrets_provider_fm)
 
+# A KEY=value line as written by store_secret_dictionary(), which dotenv reads back verbatim:
+# an unquoted key, and an unquoted value with no surrounding whitespace
+_SIMPLE_LINE = re.compile(r"([^=#\s'\"][^=#\s]*)=((?:[^\s'\"](?:[^\r\n]*\S)?)?)")
+# A value dotenv reads back verbatim without quoting
+_SIMPLE_VALUE = re.compile(r"(?:[^\s'\"](?:[^\r\n]*\S)?)?")
+# Inline comments, which dotenv strips from unquoted values
+_INLINE_COMMENT = re.compile(r"\s#")
+# Variable expansion, which dotenv resolves against os.environ
+_INTERPOLATION = "${"
+
+# Parsed files by path, with the (st_mtime_ns, st_size, st_ino) of the version they were parsed from
+FileSignature = Tuple[int, int, int]
+_parse_cache: Dict[str, Tuple[FileSignature, Dict[str, str]]] = {}
+_parse_cache_lock = threading.Lock()
+
+# Sidecar file holding the advisory lock that serializes writers of a secrets file
+LOCK_FILE_SUFFIX = ".lock"
+ResultT = TypeVar("ResultT")
+# Journal mode: append-only log of changes made since the last snapshot of the secrets file
+JOURNAL_FILE_SUFFIX = ".journal"
+DEFAULT_COMPACTION_THRESHOLD = 1000
+
+
+def _get_file_signature(stat: os.stat_result) -> FileSignature:
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def _parse_simple_dotenv(text: str) -> Optional[Dict[str, str]]:
+    """
+    Parses dotenv text in a single pass, giving the same result as dotenv_values().
+    Only handles plain KEY=value lines; returns None if the text uses any other syntax.
+    """
+    if "\r" in text or _INTERPOLATION in text:
+        return None
+
+    dictionary = {}
+    for line in text.split("\n"):
+        if not line:
+            continue
+        match = _SIMPLE_LINE.fullmatch(line)
+        if match is None:
+            return None
+        key, value = match.groups()
+        if _INLINE_COMMENT.search(value):
+            return None
+        dictionary[key] = value
+    return dictionary
+
+
+def _format_dotenv_line(key: str, value: str) -> str:
+    """
+    Formats a KEY=value line that dotenv reads back as the same value. Values that cannot be written
+    unquoted are double-quoted, escaping the characters dotenv decodes in double-quoted values.
+    """
+    if _SIMPLE_VALUE.fullmatch(value) and not _INLINE_COMMENT.search(value):
+        return f"{key}={value}\n"
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\r", "\\r")
+    return f'{key}="{escaped}"\n'
+
+
+def _check_values(values: Iterable[Optional[str]]) -> None:
+    # dotenv expands ${VARIABLES} whatever the quoting, so such values would not read back as written
+    if any(value is not None and _INTERPOLATION in value for value in values):
+        raise SecretProviderException(f"values containing '{_INTERPOLATION}' cannot be stored in a dotenv file")
+
+
+def parse_dotenv_text(text: str) -> Dict[str, str]:
+    """
+    Parses the content of a dotenv file, using a fast parser for the plain KEY=value lines
+    written by FileSecretsProvider and python-dotenv for anything else.
+    """
+    dictionary = _parse_simple_dotenv(text)
+    if dictionary is None:
+        # Only files using more than plain KEY=value lines need python-dotenv
+        from dotenv import dotenv_values
+        dictionary = dotenv_values(stream=io.StringIO(text))
+    return dictionary
+
 
 @secrets_provider_fm.flavor(CredentialsProvider.FILE_DOTENV)
 class FileSecretsProvider(BaseSecretsProvider):
     """
     FileSecretsProvider is a class that implements the BaseSecretsProvider interface.
     It provides methods to store, retrieve, and delete secrets in a file-based storage.
+
+    In journal mode, writes append set/delete records to a '<file>.journal' file instead of rewriting
+    the dotenv file, and reads replay them on top of an in-memory index. Once the journal holds
+    compaction_threshold records, the dotenv file is rewritten as a snapshot and the journal is cleared.
+    Every process using the file must enable journal mode to see the latest changes.
     """
 
-    def __init__(self, namespace: str = ".env"):
+    def __init__(self,
+                 namespace: str = ".env",
+                 journal: bool = False,
+                 compaction_threshold: int = DEFAULT_COMPACTION_THRESHOLD):
         """
         Initialize the FileSecretsProvider with a namespace.
 
         :param namespace: The namespace to use for storing secrets.
          It can include slashes to represent a directory structure.
+        :param journal: Append changes to a journal file, so single-key writes do not rewrite the whole file.
+         Defaults to False.
+        :param compaction_threshold: Number of journal records after which the journal is compacted
+         into the dotenv file. Defaults to 1000.
         """
         super().__init__()
+        if compaction_threshold < 1:
+            raise SecretProviderException("compaction_threshold must be at least 1")
         if not namespace:
             raise SecretProviderException("Namespace cannot be empty")
 
@@ -47,6 +150,165 @@ class FileSecretsProvider(BaseSecretsProvider):
                 raise SecretProviderException(
                     f"Failed to create secrets file: {e}")
 
+        self._journal_path = f"{self._dictionary_path}{JOURNAL_FILE_SUFFIX}" if journal else None
+        self._compaction_threshold = compaction_threshold
+        # Journal mode state: the replayed dictionary, and what it was built from
+        self._index: Dict[str, str] = {}
+        self._index_snapshot: Optional[FileSignature] = None
+        self._journal_offset = 0
+        self._journal_records = 0
+        self._index_lock = threading.RLock()
+
+    def get_cache_key(self) -> str:
+        return f"{CredentialsProvider.FILE_DOTENV.value}:{self._dictionary_path}"
+
+    @contextlib.contextmanager
+    def _lock(self, shared: bool = False) -> Iterator[None]:
+        """
+        Holds an advisory lock on the secrets file, shared by all processes using it.
+
+        :param shared: Take a shared (reader) lock instead of an exclusive (writer) one.
+        """
+        if fcntl is None:
+            yield
+            return
+
+        with open(f"{self._dictionary_path}{LOCK_FILE_SUFFIX}", "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _write_secret_dictionary(self, secret_dictionary: Dict) -> None:
+        """
+        Replaces the file atomically: readers see either the previous or the new content, never a partial one.
+        """
+        _check_values(secret_dictionary.values())
+        dictionary_text = "".join(_format_dotenv_line(key, value) for key, value in secret_dictionary.items() if key)
+        base_path, file_name = os.path.split(self._dictionary_path)
+        fd, temp_path = tempfile.mkstemp(prefix=f".{file_name}.", suffix=".tmp", dir=base_path)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(dictionary_text)
+                f.flush()
+                os.fsync(f.fileno())
+            with contextlib.suppress(FileNotFoundError):
+                os.chmod(temp_path, stat.S_IMODE(os.stat(self._dictionary_path).st_mode))
+            os.replace(temp_path, self._dictionary_path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(temp_path)
+            raise
+
+    @contextlib.contextmanager
+    def _locked_dictionary(self) -> Iterator[Dict[str, str]]:
+        """
+        Read-modify-write of the secret dictionary under the file lock, so concurrent
+        writers in other processes cannot lose each other's updates.
+        The file is only rewritten if the dictionary was changed.
+        """
+        try:
+            with self._lock():
+                dictionary = self.get_secret_dictionary()
+                original = dict(dictionary)
+                yield dictionary
+                if dictionary != original:
+                    self._write_secret_dictionary(dictionary)
+        except SecretProviderException:
+            raise
+        except Exception as e:
+            raise SecretProviderException(str(e.args[0])) from e
+
+    def _read_index(self, read: Callable[[Dict[str, str]], ResultT]) -> ResultT:
+        """
+        Journal mode: applies read() to the up-to-date index.
+        """
+        try:
+            # Writers hold the exclusive lock, so the snapshot and the journal are read in a consistent state
+            with self._lock(shared=True), self._index_lock:
+                return read(self._refresh_index())
+        except SecretProviderException:
+            raise
+        except Exception as e:
+            raise SecretProviderException(e) from e
+
+    def _refresh_index(self) -> Dict[str, str]:
+        """
+        Brings the journal mode index up to date: rebuilds it if the snapshot was rewritten,
+        then applies the journal records appended since the last refresh.
+        The caller holds the file lock and the index lock.
+        """
+        try:
+            snapshot = _get_file_signature(os.stat(self._dictionary_path))
+        except FileNotFoundError:
+            snapshot = None
+        try:
+            journal_size = os.stat(self._journal_path).st_size
+        except FileNotFoundError:
+            journal_size = 0
+
+        if snapshot != self._index_snapshot or journal_size < self._journal_offset:
+            self._index = self._read_snapshot()
+            self._index_snapshot = snapshot
+            self._journal_offset = 0
+            self._journal_records = 0
+
+        if journal_size > self._journal_offset:
+            with open(self._journal_path, "rb") as f:
+                f.seek(self._journal_offset)
+                data = f.read()
+            # A record is only complete once its line ends
+            end = data.rfind(b"\n") + 1
+            for line in data[:end].splitlines():
+                if not line:
+                    continue
+                record = json.loads(line)
+                if record["op"] == "set":
+                    self._index[record["key"]] = record["value"]
+                else:
+                    self._index.pop(record["key"], None)
+                self._journal_records += 1
+            self._journal_offset += end
+        return self._index
+
+    def _append_journal(self, records: List[Dict[str, str]]) -> None:
+        _check_values(record.get("value") for record in records)
+        try:
+            with self._lock(), self._index_lock:
+                with open(self._journal_path, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(record) + "\n" for record in records))
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._refresh_index()
+                journal_records = self._journal_records
+        except Exception as e:
+            raise SecretProviderException(str(e.args[0])) from e
+
+        if journal_records >= self._compaction_threshold:
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Journal mode: rewrites the dotenv file with the current secrets and clears the journal.
+
+        :raises SecretProviderException: If there is an error writing the secrets to the file.
+        """
+        if self._journal_path is None:
+            return
+        try:
+            with self._lock(), self._index_lock:
+                self._write_secret_dictionary(self._refresh_index())
+                self._clear_journal()
+        except Exception as e:
+            raise SecretProviderException(str(e.args[0])) from e
+
+    def _clear_journal(self) -> None:
+        # The snapshot was just rewritten, so every index gets rebuilt on its next refresh
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self._journal_path)
+        self._index_snapshot = None
+
     def get_secret_dictionary(self) -> Dict[str, str]:
         """
         Retrieve the secret dictionary from the file.
@@ -54,17 +316,55 @@ class FileSecretsProvider(BaseSecretsProvider):
         :return: A dictionary containing the secrets.
         :raises SecretProviderException: If there is an error reading the secrets from the file.
         """
-        secret_dictionary = {}
+        if self._journal_path is not None:
+            return self._read_index(dict)
+
+        return self._read_snapshot()
+
+    def _read_snapshot(self) -> Dict[str, str]:
         try:
-            if os.path.exists(self._dictionary_path):
-                secret_dictionary = dotenv_values(self._dictionary_path)
-            else:
-                return {}
+            with open(self._dictionary_path, encoding="utf-8") as f:
+                signature = _get_file_signature(os.fstat(f.fileno()))
+                with _parse_cache_lock:
+                    cached = _parse_cache.get(self._dictionary_path)
+                if cached is not None and cached[0] == signature:
+                    return dict(cached[1])
+                text = f.read()
+        except FileNotFoundError:
+            return {}
         except Exception as e:
             raise SecretProviderException(e) from e
 
+        try:
+            secret_dictionary = parse_dotenv_text(text)
+        except Exception as e:
+            raise SecretProviderException(e) from e
+
+        # Expanded variables depend on the environment, not only on the file
+        if _INTERPOLATION not in text:
+            with _parse_cache_lock:
+                _parse_cache[self._dictionary_path] = (signature, dict(secret_dictionary))
         return secret_dictionary
 
+    def get_version_info(self) -> Optional[str]:
+        """
+        Returns the modification time, size and inode of the file, and in journal mode the size of the journal,
+        which change with every write. Values expanded from ${VARIABLES} are not covered.
+
+        :return: The file signature, or an empty string if neither the file nor the journal exist.
+        """
+        parts = []
+        for path in filter(None, [self._dictionary_path, self._journal_path]):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                parts.append("")
+                continue
+            # The journal is only ever appended to, or removed along with a rewrite of the file
+            parts.append(str(stat.st_size) if path == self._journal_path else
+                         "/".join(str(item) for item in _get_file_signature(stat)))
+        return ":".join(parts) if any(parts) else ""
+
     def store_secret_dictionary(self, secret_dictionary: Dict):
         """
         Store the secret dictionary to the file.
@@ -72,14 +372,11 @@ class FileSecretsProvider(BaseSecretsProvider):
         :param secret_dictionary: A dictionary containing the secrets to store.
         :raises SecretProviderException: If there is an error writing the secrets to the file.
         """
-        dictionary_text = ""
-        for key, value in secret_dictionary.items():
-            if key:
-                dictionary_text += f'{key}={value}\n'
         try:
-            with open(self._dictionary_path, "w+") as f:
-                f.write(dictionary_text)
-
+            with self._lock(), self._index_lock:
+                self._write_secret_dictionary(secret_dictionary)
+                if self._journal_path is not None:
+                    self._clear_journal()
         except Exception as e:
             raise SecretProviderException(str(e.args[0]))
 
@@ -99,9 +396,12 @@ class FileSecretsProvider(BaseSecretsProvider):
         :param secret: The secret to store.
         :raises SecretProviderException: If there is an error writing the secret to the file.
         """
-        dictionary: Dict = self.get_secret_dictionary()
-        dictionary[key] = secret
-        self.store_secret_dictionary(dictionary)
+        if self._journal_path is not None:
+            self._append_journal([{"op": "set", "key": key, "value": secret}])
+            return
+
+        with self._locked_dictionary() as dictionary:
+            dictionary[key] = secret
 
     def get(self, key: str) -> Optional[str]:
         """
@@ -110,6 +410,9 @@ class FileSecretsProvider(BaseSecretsProvider):
         :param key: The key for the secret.
         :return: The secret if it exists, otherwise None.
         """
+        if self._journal_path is not None:
+            return self._read_index(lambda index: index.get(key))
+
         dictionary: Dict = self.get_secret_dictionary()
         return dictionary.get(key)
 
@@ -125,7 +428,92 @@ class FileSecretsProvider(BaseSecretsProvider):
             raise SecretProviderException(
                 "delete secret failed, key is none or empty")
 
+        if self._journal_path is not None:
+            self._append_journal([{"op": "del", "key": key}])
+            return
+
+        with self._locked_dictionary() as dictionary:
+            dictionary.pop(key, None)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Retrieve several secrets from the file with a single read.
+
+        :param keys: The keys of the secrets.
+        :return: A dictionary mapping each key to its secret, or None if it does not exist.
+        """
+        if self._journal_path is not None:
+            return self._read_index(lambda index: {key: index.get(key) for key in keys})
+
         dictionary: Dict = self.get_secret_dictionary()
-        if dictionary and key in dictionary:
-            del dictionary[key]
-            self.store_secret_dictionary(dictionary)
+        return {key: dictionary.get(key) for key in keys}
+
+    def store_many(self, secrets: Dict[str, str]) -> None:
+        """
+        Store several secrets in the file with a single read and a single write.
+
+        :param secrets: A dictionary mapping keys to the secrets to store.
+        :raises SecretProviderException: If a key or secret is missing, or if there is an error writing the secrets
+         to the file.
+        """
+        self._check_secrets(secrets)
+        if self._journal_path is not None:
+            self._append_journal([{"op": "set", "key": key, "value": secret} for key, secret in secrets.items()])
+            return
+
+        with self._locked_dictionary() as dictionary:
+            dictionary.update(secrets)
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        """
+        Delete several secrets from the file with a single read and a single write.
+
+        :param keys: The keys of the secrets.
+        :raises SecretProviderException: If a key is none or empty.
+        """
+        keys = self._check_keys(keys)
+        if self._journal_path is not None:
+            self._append_journal([{"op": "del", "key": key} for key in keys])
+            return
+
+        with self._locked_dictionary() as dictionary:
+            for key in keys:
+                dictionary.pop(key, None)
+
+    def apply_changes(self, changes: Dict[str, Optional[str]]) -> None:
+        """
+        Store and delete several secrets with a single read and a single write.
+
+        :param changes: A dictionary mapping keys to the secrets to store, or to None to delete them.
+        :raises SecretProviderException: If there is an error writing the secrets to the file.
+        """
+        if not changes:
+            return
+
+        if self._journal_path is not None:
+            self._append_journal([{"op": "set", "key": key, "value": secret} if secret is not None else {
+                "op": "del",
+                "key": key
+            } for key, secret in changes.items()])
+            return
+
+        with self._locked_dictionary() as dictionary:
+            for key, secret in changes.items():
+                if secret is None:
+                    dictionary.pop(key, None)
+                else:
+                    dictionary[key] = secret
+
+
+@async_secrets_provider_fm.flavor(CredentialsProvider.FILE_DOTENV)
+class AsyncFileSecretsProvider(AsyncSecretsProviderAdapter):
+    """
+    Exposes FileSecretsProvider through the asyncio interface, doing file I/O in a worker thread.
+    """
+
+    def __init__(self, namespace: str = ".env"):
+        """
+        :param namespace: The namespace to use for storing secrets.
+         It can include slashes to represent a directory structure.
+        """
+        super().__init__(FileSecretsProvider(namespace=namespace))
@@ -1,11 +1,14 @@
 import json
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 
 from google.api_core.exceptions import AlreadyExists, NotFound
 from google.cloud import secretmanager
 
-from agent_guard_core.credentials.enum import CredentialsProvider
+from agent_guard_core.credentials.async_secrets_provider import AsyncBaseSecretsProvider, async_secrets_provider_fm
+from agent_guard_core.credentials.enum import CredentialsProvider, SecretsLayout
+from agent_guard_core.credentials.per_key_layout import PerKeyLayout
 from agent_guard_core.credentials.secrets_provider import secrets_provider_fm
+from agent_guard_core.utils.known_resources import KnownResources
 
 from .secrets_provider import BaseSecretsProvider, SecretProviderException
 
@@ -14,6 +17,12 @@ DEFAULT_SECRET_ID = "agentic_env_vars"
 DEFAULT_SECRET_VERSION = "latest"
 DEFAULT_REPLICATION_TYPE = "automatic"
 SUPPORTED_REPLICATION_TYPES = ["automatic", "user_managed"]
+# Secret IDs used by the per-key layout: {secret_id}-key-{key} and {secret_id}-manifest
+PER_KEY_INFIX = "-key-"
+MANIFEST_SUFFIX = "-manifest"
+
+# Secrets this process has seen, which can be written without trying to create them first
+_existing_secrets = KnownResources()
 
 
 @secrets_provider_fm.flavor(CredentialsProvider.GCP_SECRETS_MANAGER)
@@ -26,7 +35,8 @@ class GCPSecretsProvider(BaseSecretsProvider):
                  project_id: str = DEFAULT_PROJECT_ID,
                  secret_id: str = DEFAULT_SECRET_ID,
                  region: Optional[str] = None,
-                 replication_type: str = DEFAULT_REPLICATION_TYPE):
+                 replication_type: str = DEFAULT_REPLICATION_TYPE,
+                 layout: str = SecretsLayout.BLOB):
         """
         Initializes the GCP Secret Manager client with the specified configuration.
 
@@ -34,7 +44,10 @@ class GCPSecretsProvider(BaseSecretsProvider):
         :param secret_id: The secret ID to use. Defaults to 'agentic_env_vars'.
         :param region: Optional region for the secret. Defaults to None.
         :param replication_type: Replication type for the secret. Defaults to 'automatic'.
-        :raises SecretProviderException: If the replication type is not supported.
+        :param layout: 'blob' stores all secrets as one JSON secret named secret_id.
+         'per-key' stores each key as its own secret named {secret_id}-key-{key},
+         listed by a manifest secret named {secret_id}-manifest. Defaults to 'blob'.
+        :raises SecretProviderException: If the replication type or layout is not supported.
         """
         super().__init__()
         self._project_id = project_id
@@ -49,6 +62,16 @@ class GCPSecretsProvider(BaseSecretsProvider):
             )
         self._replication_type = replication_type
 
+        if layout not in [item.value for item in SecretsLayout]:
+            raise SecretProviderException(f"Unsupported secrets layout: {layout}")
+        self._per_key: Optional[PerKeyLayout] = None
+        if layout == SecretsLayout.PER_KEY:
+            self._per_key = PerKeyLayout(key_path=lambda key: f"{self._secret_id}{PER_KEY_INFIX}{key}",
+                                         manifest_path=f"{self._secret_id}{MANIFEST_SUFFIX}",
+                                         read=self._read_secret,
+                                         write=self._write_secret,
+                                         remove=self._remove_secret)
+
     def connect(self) -> bool:
         """
         Establishes a connection to the GCP Secret Manager service.
@@ -67,17 +90,79 @@ class GCPSecretsProvider(BaseSecretsProvider):
             raise SecretProviderException(
                 f"GCP Secret Manager init failed: {e}") from e
 
-    def _get_secret_path(self) -> str:
+    def _get_secret_path(self, secret_id: Optional[str] = None) -> str:
+        secret_id = secret_id or self._secret_id
         if self._region is not None:
-            return f"projects/{self._project_id}/locations/{self._region}/secrets/{self._secret_id}"
-        return f"projects/{self._project_id}/secrets/{self._secret_id}"
+            return f"projects/{self._project_id}/locations/{self._region}/secrets/{secret_id}"
+        return f"projects/{self._project_id}/secrets/{secret_id}"
 
-    def _get_version_path(self) -> str:
-        return f"{self._get_secret_path()}/versions/{DEFAULT_SECRET_VERSION}"
+    def _get_version_path(self, secret_id: Optional[str] = None) -> str:
+        return f"{self._get_secret_path(secret_id)}/versions/{DEFAULT_SECRET_VERSION}"
 
     def _get_secret_parent(self) -> str:
         return f"projects/{self._project_id}"
 
+    def _get_replication_config(self) -> Dict:
+        if self._replication_type == "user_managed" and self._region:
+            return {"user_managed": {"replicas": [{"location": self._region}]}}
+        return {self._replication_type: {}}
+
+    def _create_secret(self, secret_id: str) -> None:
+        try:
+            self._client.create_secret(
+                request={
+                    "parent": self._get_secret_parent(),
+                    "secret_id": secret_id,
+                    "secret": {
+                        "replication": self._get_replication_config()
+                    }
+                })
+        except AlreadyExists:
+            pass  # Secret already exists
+
+    def _read_secret(self, secret_id: str) -> Optional[str]:
+        self.connect()
+        try:
+            response = self._client.access_secret_version(
+                request={"name": self._get_version_path(secret_id)})
+            return response.payload.data.decode("utf-8")
+        except NotFound:
+            return None
+        except Exception as e:
+            self.logger.error("Failed to retrieve secret:%s", e)
+            raise SecretProviderException(f"Error retrieving secret: {e}") from e
+
+    def _write_secret(self, secret_id: str, secret_text: str) -> None:
+        self.connect()
+        request = {
+            "parent": self._get_secret_path(secret_id),
+            "payload": {
+                "data": secret_text.encode("utf-8")
+            }
+        }
+        try:
+            try:
+                self._client.add_secret_version(request=request)
+            except NotFound:
+                self._create_secret(secret_id)
+                self._client.add_secret_version(request=request)
+        except Exception as e:
+            self.logger.error("Failed to add secret version:%s", e)
+            raise SecretProviderException(f"Error storing secret:{e}") from e
+
+    def _remove_secret(self, secret_id: str) -> None:
+        self.connect()
+        try:
+            self._client.delete_secret(request={"name": self._get_secret_path(secret_id)})
+        except NotFound:
+            pass
+        except Exception as e:
+            self.logger.error("Failed to delete secret:%s", e)
+            raise SecretProviderException(f"Error deleting secret:{e}") from e
+
+    def get_cache_key(self) -> str:
+        return f"{CredentialsProvider.GCP_SECRETS_MANAGER.value}:{self._get_secret_path()}"
+
     def get_secret_dictionary(self) -> Dict[str, str]:
         """
         Retrieves the secret dictionary from GCP Secret Manager.
@@ -85,14 +170,19 @@ class GCPSecretsProvider(BaseSecretsProvider):
         :return: A dictionary containing the secrets.
         :raises SecretProviderException: If there is an error retrieving the secrets.
         """
+        if self._per_key is not None:
+            return self._per_key.get_secret_dictionary()
+
         self.connect()
         try:
             version_path = self._get_version_path()
             response = self._client.access_secret_version(
                 request={"name": version_path})
+            _existing_secrets.add(self._get_secret_path())
             secret_text = response.payload.data.decode("utf-8")
             return json.loads(secret_text)
         except NotFound:
+            _existing_secrets.discard(self._get_secret_path())
             self.logger.warning("Secret not found: %s", self._secret_id)
             return {}
         except Exception as e:
@@ -100,6 +190,27 @@ class GCPSecretsProvider(BaseSecretsProvider):
             raise SecretProviderException(
                 f"Error retrieving secret: {e}") from e
 
+    def get_version_info(self) -> Optional[str]:
+        """
+        Returns the resource name of the latest secret version, i.e. 'projects/p/secrets/s/versions/7',
+        from GetSecretVersion, which does not return the payload.
+        With the per-key layout, values change without a new version of any single secret, so None is returned.
+
+        :return: The version name, an empty string if the secret does not exist, or None with the per-key layout.
+        :raises SecretProviderException: If there is an error retrieving the version metadata.
+        """
+        if self._per_key is not None:
+            return None
+
+        self.connect()
+        try:
+            return self._client.get_secret_version(request={"name": self._get_version_path()}).name
+        except NotFound:
+            return ""
+        except Exception as e:
+            self.logger.error("Failed to retrieve secret version:%s", e)
+            raise SecretProviderException(f"Error retrieving secret version: {e}") from e
+
     def store_secret_dictionary(self, secret_dictionary: Dict[str,
                                                               str]) -> None:
         """
@@ -111,25 +222,37 @@ class GCPSecretsProvider(BaseSecretsProvider):
         if secret_dictionary is None:
             raise SecretProviderException("Dictionary not provided")
 
+        if self._per_key is not None:
+            self._per_key.store_secret_dictionary(secret_dictionary)
+            return
+
         self.connect()
         secret_text = json.dumps(secret_dictionary)
-        try:
-            replication_config = {self._replication_type: {}}
-            if self._replication_type == "user_managed" and self._region:
-                replication_config = {
-                    "user_managed": {
-                        "replicas": [{
-                            "location": self._region
-                        }]
-                    }
-                }
+        secret_path = self._get_secret_path()
+        request = {
+            "parent": secret_path,
+            "payload": {
+                "data": secret_text.encode("utf-8")
+            }
+        }
+        if secret_path in _existing_secrets:
+            try:
+                self._client.add_secret_version(request=request)
+                return
+            except NotFound:
+                # Deleted by someone else since we last saw it
+                _existing_secrets.discard(secret_path)
+            except Exception as e:
+                self.logger.error("Failed to add secret version:%s", e)
+                raise SecretProviderException(f"Error storing secret:{e}") from e
 
+        try:
             self._client.create_secret(
                 request={
                     "parent": self._get_secret_parent(),
                     "secret_id": self._secret_id,
                     "secret": {
-                        "replication": replication_config
+                        "replication": self._get_replication_config()
                     }
                 })
         except AlreadyExists:
@@ -140,13 +263,8 @@ class GCPSecretsProvider(BaseSecretsProvider):
 
         # Add a version to the secret
         try:
-            self._client.add_secret_version(
-                request={
-                    "parent": self._get_secret_path(),
-                    "payload": {
-                        "data": secret_text.encode("utf-8")
-                    }
-                })
+            self._client.add_secret_version(request=request)
+            _existing_secrets.add(secret_path)
         except Exception as e:
             self.logger.error("Failed to add secret version:%s", e)
             raise SecretProviderException(f"Error storing secret:{e}") from e
@@ -162,6 +280,10 @@ class GCPSecretsProvider(BaseSecretsProvider):
         if not key or not secret:
             raise SecretProviderException("store: key or secret is missing")
 
+        if self._per_key is not None:
+            self._per_key.store(key, secret)
+            return
+
         secret_dict = self.get_secret_dictionary()
         secret_dict[key] = secret
         self.store_secret_dictionary(secret_dict)
@@ -177,6 +299,9 @@ class GCPSecretsProvider(BaseSecretsProvider):
             self.logger.warning("get: key is missing")
             return None
 
+        if self._per_key is not None:
+            return self._per_key.get(key)
+
         secret_dict = self.get_secret_dictionary()
         return secret_dict.get(key)
 
@@ -190,7 +315,184 @@ class GCPSecretsProvider(BaseSecretsProvider):
         if not key:
             raise SecretProviderException("delete: key is missing")
 
+        if self._per_key is not None:
+            self._per_key.delete(key)
+            return
+
         secret_dict = self.get_secret_dictionary()
         if key in secret_dict:
             del secret_dict[key]
             self.store_secret_dictionary(secret_dict)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Retrieves several secrets from GCP Secret Manager. With the per-key layout, only their keys are read.
+
+        :param keys: The names of the secrets to retrieve.
+        :return: A dictionary mapping each key to its value, or None if not found.
+        """
+        if self._per_key is not None:
+            return self._per_key.get_many(keys)
+        return super().get_many(keys)
+
+    def apply_changes(self, changes: Dict[str, Optional[str]]) -> None:
+        """
+        Stores and deletes several secrets in GCP Secret Manager. With the per-key layout, only the changed keys
+        and the manifest are written.
+
+        :param changes: A dictionary mapping secret names to their new values, or to None to delete them.
+        """
+        if self._per_key is not None:
+            self._per_key.apply_changes(changes)
+            return
+        super().apply_changes(changes)
+
+
+@async_secrets_provider_fm.flavor(CredentialsProvider.GCP_SECRETS_MANAGER)
+class AsyncGCPSecretsProvider(AsyncBaseSecretsProvider):
+    """
+    Manages storing and retrieving secrets from Google Cloud Secret Manager using its asyncio client.
+    """
+
+    def __init__(self,
+                 project_id: str = DEFAULT_PROJECT_ID,
+                 secret_id: str = DEFAULT_SECRET_ID,
+                 region: Optional[str] = None,
+                 replication_type: str = DEFAULT_REPLICATION_TYPE):
+        """
+        :param project_id: GCP project ID where the secret manager is located. Defaults to 'default'.
+        :param secret_id: The secret ID to use. Defaults to 'agentic_env_vars'.
+        :param region: Optional region for the secret. Defaults to None.
+        :param replication_type: Replication type for the secret. Defaults to 'automatic'.
+        :raises SecretProviderException: If the replication type is not supported.
+        """
+        super().__init__()
+        # The blocking provider holds the configuration and builds the resource paths; its client is never created
+        self._provider = GCPSecretsProvider(project_id=project_id,
+                                            secret_id=secret_id,
+                                            region=region,
+                                            replication_type=replication_type)
+        self._client = None
+
+    async def connect(self) -> bool:
+        """
+        Creates the asyncio GCP Secret Manager client.
+
+        :return: True if connection is successful.
+        :raises SecretProviderException: If there is an error initializing the client.
+        """
+        if self._client:
+            return True
+        try:
+            self._client = secretmanager.SecretManagerServiceAsyncClient()
+            return True
+        except Exception as e:
+            self.logger.error("Error initializing Secret Manager client: %s",
+                              e)
+            raise SecretProviderException(
+                f"GCP Secret Manager init failed: {e}") from e
+
+    async def get_secret_dictionary(self) -> Dict[str, str]:
+        """
+        Retrieves the secret dictionary from GCP Secret Manager.
+
+        :return: A dictionary containing the secrets.
+        :raises SecretProviderException: If there is an error retrieving the secrets.
+        """
+        return await self._fetch_once(self._fetch_secret_dictionary)
+
+    async def _fetch_secret_dictionary(self) -> Dict[str, str]:
+        await self.connect()
+        try:
+            response = await self._client.access_secret_version(
+                request={"name": self._provider._get_version_path()})
+            _existing_secrets.add(self._provider._get_secret_path())
+            return json.loads(response.payload.data.decode("utf-8"))
+        except NotFound:
+            _existing_secrets.discard(self._provider._get_secret_path())
+            self.logger.warning("Secret not found: %s", self._provider._secret_id)
+            return {}
+        except Exception as e:
+            self.logger.error("Failed to retrieve secret:%s", e)
+            raise SecretProviderException(
+                f"Error retrieving secret: {e}") from e
+
+    async def get_version_info(self) -> Optional[str]:
+        """
+        Returns the resource name of the latest secret version, from GetSecretVersion.
+
+        :return: The version name, or an empty string if the secret does not exist.
+        :raises SecretProviderException: If there is an error retrieving the version metadata.
+        """
+        await self.connect()
+        try:
+            response = await self._client.get_secret_version(request={"name": self._provider._get_version_path()})
+            return response.name
+        except NotFound:
+            return ""
+        except Exception as e:
+            self.logger.error("Failed to retrieve secret version:%s", e)
+            raise SecretProviderException(f"Error retrieving secret version: {e}") from e
+
+    async def store_secret_dictionary(self, secret_dictionary: Dict[str, str]) -> None:
+        """
+        Stores the secret dictionary in GCP Secret Manager.
+
+        :param secret_dictionary: The dictionary containing secrets to store.
+        :raises SecretProviderException: If the dictionary is None or if there is an error storing the secrets.
+        """
+        try:
+            await self._store_secret_dictionary(secret_dictionary)
+        finally:
+            self._forget_fetch()
+
+    async def _store_secret_dictionary(self, secret_dictionary: Dict[str, str]) -> None:
+        if secret_dictionary is None:
+            raise SecretProviderException("Dictionary not provided")
+
+        await self.connect()
+        secret_text = json.dumps(secret_dictionary)
+        secret_path = self._provider._get_secret_path()
+        request = {
+            "parent": secret_path,
+            "payload": {
+                "data": secret_text.encode("utf-8")
+            }
+        }
+        if secret_path in _existing_secrets:
+            try:
+                await self._client.add_secret_version(request=request)
+                return
+            except NotFound:
+                # Deleted by someone else since we last saw it
+                _existing_secrets.discard(secret_path)
+            except Exception as e:
+                self.logger.error("Failed to add secret version:%s", e)
+                raise SecretProviderException(f"Error storing secret:{e}") from e
+
+        try:
+            await self._client.create_secret(
+                request={
+                    "parent": self._provider._get_secret_parent(),
+                    "secret_id": self._provider._secret_id,
+                    "secret": {
+                        "replication": self._provider._get_replication_config()
+                    }
+                })
+        except AlreadyExists:
+            pass  # Secret already exists
+        except Exception as e:
+            self.logger.error("Failed to create secret:%s", e)
+            raise SecretProviderException(f"Error creating secret:{e}") from e
+
+        try:
+            await self._client.add_secret_version(request=request)
+            _existing_secrets.add(secret_path)
+        except Exception as e:
+            self.logger.error("Failed to add secret version:%s", e)
+            raise SecretProviderException(f"Error storing secret:{e}") from e
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.transport.close()
+            self._client = None
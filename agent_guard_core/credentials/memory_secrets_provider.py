@@ -0,0 +1,90 @@
+import threading
+from typing import Dict, Iterable, Optional
+
+from agent_guard_core.credentials.async_secrets_provider import AsyncSecretsProviderAdapter, async_secrets_provider_fm
+from agent_guard_core.credentials.enum import CredentialsProvider
+from agent_guard_core.credentials.secrets_provider import (BaseSecretsProvider, SecretProviderException,
+                                                           secrets_provider_fm)
+
+
+@secrets_provider_fm.flavor(CredentialsProvider.MEMORY)
+class InMemorySecretsProvider(BaseSecretsProvider):
+    """
+    Keeps secrets in a dictionary owned by the provider instance, for the lifetime of the process.
+    Mostly useful as the fastest tier of a TieredSecretsProvider.
+    """
+
+    def __init__(self, namespace: str = "default"):
+        """
+        :param namespace: The namespace the secrets belong to. Two instances never share their secrets,
+         even with the same namespace.
+        """
+        super().__init__()
+        self._namespace = namespace
+        self._dictionary: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def get_cache_key(self) -> str:
+        return f"{CredentialsProvider.MEMORY.value}:{self._namespace}:{id(self)}"
+
+    def connect(self) -> bool:
+        return True
+
+    def get_secret_dictionary(self) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._dictionary)
+
+    def store_secret_dictionary(self, secret_dictionary: Dict) -> None:
+        with self._lock:
+            self._dictionary = dict(secret_dictionary)
+
+    def get(self, key: str) -> Optional[str]:
+        if not key:
+            self.logger.warning("get: key is missing")
+            return None
+        with self._lock:
+            return self._dictionary.get(key)
+
+    def store(self, key: str, secret: str) -> None:
+        if not key or not secret:
+            message = "store: key or secret is missing"
+            self.logger.warning(message)
+            raise SecretProviderException(message)
+        with self._lock:
+            self._dictionary[key] = secret
+
+    def delete(self, key: str) -> None:
+        if not key:
+            message = "delete secret failed, key is none or empty"
+            self.logger.warning(message)
+            raise SecretProviderException(message)
+        with self._lock:
+            self._dictionary.pop(key, None)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[str]]:
+        with self._lock:
+            return {key: self._dictionary.get(key) for key in keys}
+
+    def store_many(self, secrets: Dict[str, str]) -> None:
+        self._check_secrets(secrets)
+        with self._lock:
+            self._dictionary.update(secrets)
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        keys = self._check_keys(keys)
+        with self._lock:
+            for key in keys:
+                self._dictionary.pop(key, None)
+
+
+@async_secrets_provider_fm.flavor(CredentialsProvider.MEMORY)
+class AsyncInMemorySecretsProvider(AsyncSecretsProviderAdapter):
+    """
+    Exposes InMemorySecretsProvider through the asyncio interface.
+    """
+
+    def __init__(self, namespace: str = "default"):
+        """
+        :param namespace: The namespace the secrets belong to.
+        """
+        super().__init__(InMemorySecretsProvider(namespace=namespace))
@@ -0,0 +1,129 @@
+import json
+import logging
+import re
+from typing import Callable, Dict, Iterable, List, Optional
+
+from agent_guard_core.credentials.secrets_provider import SecretProviderException
+
+# Secret names that can be embedded in every provider's remote identifiers
+VALID_KEY_PATTERN = re.compile(r"^[A-Za-z0-9_\-]+$")
+
+
+class PerKeyLayout:
+    """
+    Stores each secret of a namespace as its own remote secret, plus a small manifest listing the keys.
+
+    The layout only knows how to combine remote operations; the provider supplies them:
+    - read(path): returns the remote value, or None if it does not exist
+    - write(path, text): creates or updates the remote value
+    - remove(path): deletes the remote value, ignoring missing ones
+    - read_many(paths): optional, returns {path: value or None} using a batch API
+
+    Single-key reads and writes transfer only that key's value (and, when the set of keys changes, the manifest),
+    instead of the whole namespace.
+    """
+
+    def __init__(self,
+                 key_path: Callable[[str], str],
+                 manifest_path: str,
+                 read: Callable[[str], Optional[str]],
+                 write: Callable[[str, str], None],
+                 remove: Callable[[str], None],
+                 read_many: Optional[Callable[[List[str]], Dict[str, Optional[str]]]] = None):
+        self._key_path = key_path
+        self._manifest_path = manifest_path
+        self._read = read
+        self._write = write
+        self._remove = remove
+        self._read_many = read_many
+        self.logger = logging.getLogger(__name__)
+
+    def _path(self, key: str) -> str:
+        if not key or not VALID_KEY_PATTERN.match(key):
+            raise SecretProviderException(
+                f"Invalid secret key for the per-key layout: '{key}'. "
+                "Only letters, digits, '_' and '-' are allowed.")
+        return self._key_path(key)
+
+    def get_manifest(self) -> List[str]:
+        """
+        Returns the keys of the namespace, as listed in the manifest.
+        """
+        manifest_text = self._read(self._manifest_path)
+        if not manifest_text:
+            return []
+        try:
+            return list(json.loads(manifest_text))
+        except Exception as e:
+            raise SecretProviderException(f"Corrupted secrets manifest {self._manifest_path}: {e}") from e
+
+    def _store_manifest(self, keys: Iterable[str]) -> None:
+        self._write(self._manifest_path, json.dumps(sorted(set(keys))))
+
+    def _read_paths(self, keys: List[str]) -> Dict[str, Optional[str]]:
+        paths = {key: self._path(key) for key in keys}
+        if self._read_many is not None and paths:
+            values = self._read_many(list(paths.values()))
+            return {key: values.get(path) for key, path in paths.items()}
+        return {key: self._read(path) for key, path in paths.items()}
+
+    def get(self, key: str) -> Optional[str]:
+        return self._read(self._path(key))
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[str]]:
+        return self._read_paths(list(keys))
+
+    def get_secret_dictionary(self) -> Dict[str, str]:
+        values = self._read_paths(self.get_manifest())
+        return {key: value for key, value in values.items() if value is not None}
+
+    def store_many(self, secrets: Dict[str, str]) -> None:
+        for key, secret in secrets.items():
+            self._write(self._path(key), secret)
+
+        manifest = self.get_manifest()
+        if not set(secrets).issubset(manifest):
+            self._store_manifest(list(manifest) + list(secrets))
+
+    def store(self, key: str, secret: str) -> None:
+        self.store_many({key: secret})
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        for key in keys:
+            self._remove(self._path(key))
+
+        manifest = self.get_manifest()
+        if set(keys).intersection(manifest):
+            self._store_manifest(set(manifest).difference(keys))
+
+    def delete(self, key: str) -> None:
+        self.delete_many([key])
+
+    def apply_changes(self, changes: Dict[str, Optional[str]]) -> None:
+        """
+        Writes the keys mapped to a secret and removes the keys mapped to None, then updates the manifest once.
+        """
+        for key, secret in changes.items():
+            if secret is None:
+                self._remove(self._path(key))
+            else:
+                self._write(self._path(key), secret)
+
+        manifest = set(self.get_manifest())
+        updated = manifest.union(key for key, secret in changes.items() if secret is not None).difference(
+            key for key, secret in changes.items() if secret is None)
+        if updated != manifest:
+            self._store_manifest(updated)
+
+    def store_secret_dictionary(self, secret_dictionary: Dict[str, str]) -> None:
+        """
+        Replaces the whole namespace: writes every key, removes keys that are no longer present
+        and rewrites the manifest.
+        """
+        removed_keys = set(self.get_manifest()).difference(secret_dictionary)
+        for key, secret in secret_dictionary.items():
+            self._write(self._path(key), secret)
+        for key in removed_keys:
+            self._remove(self._path(key))
+        self._store_manifest(secret_dictionary.keys())
@@ -0,0 +1,140 @@
+import base64
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from agent_guard_core.credentials.enum import CacheEnvVars
+from agent_guard_core.credentials.secrets_provider import SecretProviderException
+
+DEFAULT_CACHE_DIR = Path.home() / ".agent_guard"
+DEFAULT_CACHE_PATH = DEFAULT_CACHE_DIR / "cache.db"
+DEFAULT_KEY_PATH = DEFAULT_CACHE_DIR / "cache.key"
+KEY_FILE_BYTES = 32
+HKDF_INFO = b"agent-guard-persistent-cache"
+SQLITE_TIMEOUT_SECS = 5.0
+
+
+def _get_fernet(local_secret: bytes):
+    try:
+        from cryptography.fernet import Fernet
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+    except ImportError as e:
+        raise SecretProviderException(
+            "PersistentSecretsCache requires the 'cryptography' package: "
+            "pip install agent-guard-core[cache]") from e
+
+    key = HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=HKDF_INFO).derive(local_secret)
+    return Fernet(base64.urlsafe_b64encode(key))
+
+
+def _read_or_create_key_file(key_path: Path) -> bytes:
+    """
+    The key is written to a temporary file, then linked into place, which fails if the key file exists:
+    processes racing to create it all read the complete key written by the winner, never a partial one.
+    """
+    key_path.parent.mkdir(parents=True, exist_ok=True)
+    if key_path.exists():
+        return key_path.read_bytes()
+
+    # mkstemp creates the file readable only by its owner
+    fd, temp_path = tempfile.mkstemp(prefix=f".{key_path.name}.", suffix=".tmp", dir=key_path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(os.urandom(KEY_FILE_BYTES))
+            f.flush()
+            os.fsync(f.fileno())
+        with contextlib.suppress(FileExistsError):
+            os.link(temp_path, key_path)
+    finally:
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
+    return key_path.read_bytes()
+
+
+class PersistentSecretsCache:
+    """
+    An encrypted on-disk store of the last secret dictionary fetched from each provider.
+
+    Entries live in a SQLite database, keyed by a hash of the provider's get_cache_key() and encrypted with
+    Fernet. The key is derived from a local secret: the AGENT_GUARD_CACHE_SECRET environment variable if set,
+    otherwise a random key file created next to the database, readable only by its owner.
+    """
+
+    def __init__(self,
+                 path: Union[str, Path] = DEFAULT_CACHE_PATH,
+                 key_path: Union[str, Path] = DEFAULT_KEY_PATH,
+                 local_secret: Optional[Union[str, bytes]] = None):
+        """
+        :param path: Path of the SQLite database. Defaults to ~/.agent_guard/cache.db.
+        :param key_path: Path of the key file, used when no local secret is given. Defaults to ~/.agent_guard/cache.key.
+        :param local_secret: Secret to derive the encryption key from. Defaults to AGENT_GUARD_CACHE_SECRET,
+         then to the key file.
+        """
+        local_secret = local_secret or os.getenv(CacheEnvVars.AGENT_GUARD_CACHE_SECRET)
+        if local_secret is None:
+            local_secret = _read_or_create_key_file(Path(key_path))
+        elif isinstance(local_secret, str):
+            local_secret = local_secret.encode("utf-8")
+        self._fernet = _get_fernet(local_secret)
+
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        # Create the database readable only by its owner before SQLite opens it
+        with contextlib.suppress(FileExistsError):
+            os.close(os.open(self._path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600))
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self._path, timeout=SQLITE_TIMEOUT_SECS, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS entries ("
+                                     "key TEXT PRIMARY KEY, stored_at REAL NOT NULL, payload BLOB NOT NULL)")
+
+    @staticmethod
+    def _hash_key(cache_key: str) -> str:
+        # Provider cache keys include URLs and namespaces, which are not stored in clear
+        return hashlib.sha256(cache_key.encode("utf-8")).hexdigest()
+
+    def get(self, cache_key: str) -> Optional[Tuple[Dict[str, str], float]]:
+        """
+        Returns the stored dictionary and the time.time() it was stored at, or None if there is no usable entry.
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT stored_at, payload FROM entries WHERE key = ?",
+                                           (self._hash_key(cache_key), )).fetchone()
+        if row is None:
+            return None
+
+        stored_at, payload = row
+        try:
+            return json.loads(self._fernet.decrypt(payload)), stored_at
+        except Exception:
+            # Written with another key, or corrupted: drop it
+            self.delete(cache_key)
+            return None
+
+    def set(self, cache_key: str, secret_dictionary: Dict[str, str]) -> None:
+        payload = self._fernet.encrypt(json.dumps(secret_dictionary).encode("utf-8"))
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO entries (key, stored_at, payload) VALUES (?, ?, ?)",
+                                     (self._hash_key(cache_key), time.time(), payload))
+
+    def delete(self, cache_key: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM entries WHERE key = ?", (self._hash_key(cache_key), ))
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
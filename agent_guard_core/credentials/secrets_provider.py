@@ -1,8 +1,11 @@
 # this is a abstract class for secrets provider
 import abc
+import contextlib
+import inspect
 import logging
-from typing import Dict, Optional, Type
+from typing import Dict, Iterable, Iterator, List, Optional, Type
 
+from agent_guard_core.credentials.enum import CredentialsProvider
 from agent_guard_core.utils.flavor_manager import FlavorManager
 
 
@@ -41,4 +44,201 @@ class BaseSecretsProvider(abc.ABC):
     def store_secret_dictionary(self, secret_dictionary: Dict):
         pass
 
-secrets_provider_fm: FlavorManager[str, Type[BaseSecretsProvider]] = FlavorManager()
\ No newline at end of file
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Retrieves several secrets at once.
+        The default implementation reads the secret dictionary once.
+
+        :param keys: The names of the secrets to retrieve.
+        :return: A dictionary mapping each key to its value, or None if not found.
+        """
+        secret_dictionary = self.get_secret_dictionary() or {}
+        return {key: secret_dictionary.get(key) for key in keys}
+
+    def store_many(self, secrets: Dict[str, str]) -> None:
+        """
+        Stores several secrets at once, with a single apply_changes() call.
+
+        :param secrets: A dictionary mapping secret names to their values.
+        :raises SecretProviderException: If a key or secret is missing.
+        """
+        self.apply_changes(self._check_secrets(secrets))
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        """
+        Deletes several secrets at once, with a single apply_changes() call.
+
+        :param keys: The names of the secrets to delete.
+        :raises SecretProviderException: If a key is missing.
+        """
+        self.apply_changes(dict.fromkeys(self._check_keys(keys)))
+
+    def apply_changes(self, changes: Dict[str, Optional[str]]) -> None:
+        """
+        Stores and deletes several secrets with a single write.
+        The default implementation reads the secret dictionary once and stores it back once, if it changed.
+
+        :param changes: A dictionary mapping secret names to their new values, or to None to delete them.
+        """
+        if not changes:
+            return
+
+        original = self.get_secret_dictionary() or {}
+        secret_dictionary = dict(original)
+        for key, secret in changes.items():
+            if secret is None:
+                secret_dictionary.pop(key, None)
+            else:
+                secret_dictionary[key] = secret
+        if secret_dictionary != original:
+            self.store_secret_dictionary(secret_dictionary)
+
+    def _check_secrets(self, secrets: Dict[str, str]) -> Dict[str, str]:
+        if any(not key or secret is None for key, secret in secrets.items()):
+            message = "store_many: key or secret is missing"
+            self.logger.warning(message)
+            raise SecretProviderException(message)
+        return secrets
+
+    def _check_keys(self, keys: Iterable[str]) -> List[str]:
+        keys = list(keys)
+        if any(not key for key in keys):
+            message = "delete secrets failed, key is none or empty"
+            self.logger.warning(message)
+            raise SecretProviderException(message)
+        return keys
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator["SecretsBatch"]:
+        """
+        Accumulates the writes made through the yielded batch in memory, and applies them with
+        a single apply_changes() call when the block exits. Nothing is written if the block raises.
+
+        ```
+        with provider.batch() as batch:
+            batch.store("key1", "secret1")
+            batch.store("key2", "secret2")
+        ```
+        """
+        batch = SecretsBatch(self)
+        yield batch
+        batch.flush()
+
+    def get_version_info(self) -> Optional[str]:
+        """
+        Returns an identifier of the current version of the secret dictionary, read from metadata only,
+        so callers holding a copy can tell whether it is still current without downloading it again.
+        The default implementation returns None: the provider cannot tell without fetching the dictionary.
+
+        :return: A string that changes whenever the secret dictionary changes, an empty string if the
+         dictionary does not exist, or None if the version is not available.
+        """
+        return None
+
+    def close(self) -> None:
+        """
+        Releases resources held by the provider, such as pooled network connections.
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def get_cache_key(self) -> str:
+        """
+        Returns a key identifying the remote location this provider reads from (provider + namespace).
+        Providers pointing at the same location return the same key, so caches can be shared between them.
+        """
+        return f"{self.__class__.__name__}:{id(self)}"
+
+class SecretsBatch:
+    """
+    Writes accumulated in memory for a secrets provider. Later writes to a key replace earlier ones.
+    """
+
+    def __init__(self, provider: BaseSecretsProvider):
+        """
+        :param provider: The provider the writes are applied to.
+        """
+        self._provider = provider
+        self._changes: Dict[str, Optional[str]] = {}
+
+    def store(self, key: str, secret: str) -> None:
+        if not key or secret is None:
+            raise SecretProviderException("store: key or secret is missing")
+        self._changes[key] = secret
+
+    def delete(self, key: str) -> None:
+        if not key:
+            raise SecretProviderException("delete secret failed, key is none or empty")
+        self._changes[key] = None
+
+    def store_many(self, secrets: Dict[str, str]) -> None:
+        for key, secret in secrets.items():
+            self.store(key, secret)
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self.delete(key)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Retrieves a secret, as it will be once the batch is applied.
+        """
+        if key in self._changes:
+            return self._changes[key]
+        return self._provider.get(key)
+
+    def flush(self) -> None:
+        """
+        Applies the accumulated writes to the provider with a single write.
+        """
+        changes, self._changes = self._changes, {}
+        self._provider.apply_changes(changes)
+
+
+# Third-party packages register their providers under this entry point group
+SECRETS_PROVIDERS_ENTRY_POINT_GROUP = "agent_guard_core.secrets_providers"
+
+secrets_provider_fm: FlavorManager[str, Type[BaseSecretsProvider]] = FlavorManager(
+    entry_point_group=SECRETS_PROVIDERS_ENTRY_POINT_GROUP)
+
+# Provider modules are imported on first use, so only the SDKs of the providers in use get loaded
+secrets_provider_fm.lazy_flavor(CredentialsProvider.AWS_SECRETS_MANAGER,
+                                "agent_guard_core.credentials.aws_secrets_manager_provider:AWSSecretsProvider")
+secrets_provider_fm.lazy_flavor(CredentialsProvider.CONJUR,
+                                "agent_guard_core.credentials.conjur_secrets_provider:ConjurSecretsProvider")
+secrets_provider_fm.lazy_flavor(CredentialsProvider.FILE_DOTENV,
+                                "agent_guard_core.credentials.file_secrets_provider:FileSecretsProvider")
+secrets_provider_fm.lazy_flavor(CredentialsProvider.GCP_SECRETS_MANAGER,
+                                "agent_guard_core.credentials.gcp_secrets_manager_provider:GCPSecretsProvider")
+secrets_provider_fm.lazy_flavor(CredentialsProvider.MEMORY,
+                                "agent_guard_core.credentials.memory_secrets_provider:InMemorySecretsProvider")
+secrets_provider_fm.lazy_flavor(CredentialsProvider.TIERED,
+                                "agent_guard_core.credentials.tiered_secrets_provider:TieredSecretsProvider")
+# Constructor parameter holding the namespace, for the providers that do not name it 'namespace'
+_NAMESPACE_PARAMETERS = {CredentialsProvider.GCP_SECRETS_MANAGER: "secret_id"}
+
+
+def create_secrets_provider(flavor: str, namespace: Optional[str] = None) -> BaseSecretsProvider:
+    """
+    Creates the provider registered under the given flavor, passing the namespace to the constructor
+    parameter that provider takes it as (i.e. secret_id for GCP).
+
+    :param flavor: The flavor of the provider in secrets_provider_fm (i.e. 'conjur').
+    :param namespace: Optional namespace. Defaults to the provider's own default.
+    :raises SecretProviderException: If the flavor is unknown or the provider does not take a namespace.
+    """
+    provider_cls = secrets_provider_fm.get(flavor)
+    if provider_cls is None:
+        raise SecretProviderException(f"Unknown secrets provider: {flavor}")
+    if not namespace:
+        return provider_cls()
+
+    parameter = _NAMESPACE_PARAMETERS.get(flavor, "namespace")
+    parameters = inspect.signature(provider_cls).parameters
+    if parameter not in parameters and not any(p.kind == p.VAR_KEYWORD for p in parameters.values()):
+        raise SecretProviderException(f"The {flavor} secrets provider does not support namespaces")
+    return provider_cls(**{parameter: namespace})
@@ -0,0 +1,310 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from agent_guard_core.credentials.async_secrets_provider import AsyncSecretsProviderAdapter, async_secrets_provider_fm
+from agent_guard_core.credentials.enum import CredentialsProvider, TieredEnvVars, WritePolicy
+from agent_guard_core.credentials.secrets_provider import (BaseSecretsProvider, SecretProviderException,
+                                                           create_secrets_provider, secrets_provider_fm)
+from agent_guard_core.utils.ttl_cache import DEFAULT_TTL_SECONDS
+
+# Maximum number of writes waiting for the slower tiers; further writes block until the worker catches up
+DEFAULT_WRITE_QUEUE_SIZE = 1000
+
+Tier = Union[BaseSecretsProvider, str]
+# A write to replay on the slower tiers: the provider method name and its arguments
+_Write = Tuple[str, Tuple[Any, ...]]
+
+
+def _create_tier(tier: Tier, namespace: Optional[str]) -> BaseSecretsProvider:
+    if isinstance(tier, BaseSecretsProvider):
+        return tier
+
+    return create_secrets_provider(tier.strip(), namespace)
+
+
+@secrets_provider_fm.flavor(CredentialsProvider.TIERED)
+class TieredSecretsProvider(BaseSecretsProvider):
+    """
+    Stacks several secrets providers, fastest first, i.e. an in-memory tier, then a file, then Conjur.
+    The last tier is the source of truth; the others hold copies of its secret dictionary.
+
+    Reads go through the tiers in order and are served by the first tier holding a non-empty dictionary.
+    The faster tiers that missed are then filled with that dictionary, so the next read stops at them.
+    Every refresh_interval seconds, and on the first read, a read checks the version of the last tier instead,
+    and refills every faster tier when it changed, so rotations and writes made directly to the source are seen.
+    A last tier that reports no version is read again and copied to the faster tiers every refresh_interval.
+
+    Writes first make sure the faster tiers hold the whole dictionary, then apply the change to every tier,
+    slowest first. With the write-behind policy, only the fastest tier is written before returning: the change
+    is queued and applied to the slower tiers by a background worker. Call flush() to wait for queued writes;
+    close() and interpreter shutdown flush them too.
+    """
+
+    def __init__(self,
+                 tiers: Optional[Sequence[Tier]] = None,
+                 namespace: Optional[str] = None,
+                 write_policy: Union[WritePolicy, str] = WritePolicy.WRITE_THROUGH,
+                 queue_size: int = DEFAULT_WRITE_QUEUE_SIZE,
+                 refresh_interval: float = DEFAULT_TTL_SECONDS):
+        """
+        :param tiers: The providers to stack, fastest first, as instances or flavors of secrets_provider_fm.
+         Defaults to the comma-separated flavors in AGENT_GUARD_TIERS.
+        :param namespace: The namespace passed to the tiers given as flavors, i.e. as the secret_id for GCP.
+        :param write_policy: 'write-through' or 'write-behind'. Defaults to 'write-through'.
+        :param queue_size: Maximum number of queued writes in write-behind mode. Defaults to 1000.
+        :param refresh_interval: Number of seconds between checks of the last tier for changes. Defaults to 60;
+         0 checks on every read.
+        """
+        super().__init__()
+        if tiers is None:
+            tiers = [flavor for flavor in os.getenv(TieredEnvVars.AGENT_GUARD_TIERS, "").split(",") if flavor.strip()]
+        if not tiers:
+            raise SecretProviderException(
+                f"TieredSecretsProvider: no tiers provided, set {TieredEnvVars.AGENT_GUARD_TIERS.value}")
+        if queue_size < 1:
+            raise SecretProviderException("queue_size must be at least 1")
+        if refresh_interval < 0:
+            raise SecretProviderException("refresh_interval must not be negative")
+        try:
+            self._write_policy = WritePolicy(write_policy)
+        except ValueError as e:
+            raise SecretProviderException(f"Unknown write policy: {write_policy}") from e
+
+        self._tiers: List[BaseSecretsProvider] = [_create_tier(tier, namespace) for tier in tiers]
+        self._write_lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[_Write]]" = queue.Queue(maxsize=queue_size)
+        self._worker: Optional[threading.Thread] = None
+        self._write_errors: List[Exception] = []
+        self._closed = False
+        self._refresh_interval = refresh_interval
+        # The version of the last tier the faster tiers were last refilled from, and when it was checked
+        self._source_version: Optional[str] = None
+        self._checked_at: Optional[float] = None
+        if self._write_policy == WritePolicy.WRITE_BEHIND:
+            atexit.register(self.close)
+
+    @property
+    def tiers(self) -> List[BaseSecretsProvider]:
+        return list(self._tiers)
+
+    def get_cache_key(self) -> str:
+        return f"{CredentialsProvider.TIERED.value}:" + "|".join(tier.get_cache_key() for tier in self._tiers)
+
+    def connect(self) -> bool:
+        return all([tier.connect() for tier in self._tiers])
+
+    def get_version_info(self) -> Optional[str]:
+        return self._tiers[-1].get_version_info()
+
+    def get_secret_dictionary(self) -> Dict[str, str]:
+        """
+        Retrieves the secret dictionary from the fastest tier holding one, and fills the faster tiers with it.
+        When a check of the last tier is due and its version changed, the dictionary is read from it instead.
+
+        :return: The secret dictionary.
+        """
+        # While writes are queued, the fastest tier is ahead of the last one
+        if len(self._tiers) > 1 and not self._has_pending_writes() and self._refresh_is_due():
+            refreshed = self._refresh_from_source()
+            if refreshed is not None:
+                return refreshed
+
+        missed: List[BaseSecretsProvider] = []
+        secret_dictionary: Dict[str, str] = {}
+        last_index = len(self._tiers) - 1
+        for index, tier in enumerate(self._tiers):
+            try:
+                secret_dictionary = tier.get_secret_dictionary() or {}
+            except Exception as e:
+                if index == last_index:
+                    raise
+                self.logger.warning("TieredSecretsProvider: skipping tier %s: %s", tier.__class__.__name__, e)
+                continue
+
+            # While writes are queued, the fastest tier is ahead of the others, even when it is empty
+            if secret_dictionary or index == last_index or (index == 0 and self._has_pending_writes()):
+                break
+            missed.append(tier)
+
+        if secret_dictionary:
+            self._fill(missed, secret_dictionary)
+        return secret_dictionary
+
+    def _refresh_is_due(self) -> bool:
+        return self._checked_at is None or time.monotonic() - self._checked_at >= self._refresh_interval
+
+    def _refresh_from_source(self) -> Optional[Dict[str, str]]:
+        """
+        Refills the faster tiers from the last tier if its version changed since the last refill.
+
+        :return: The secret dictionary of the last tier, or None if the faster tiers are current or it is unreachable.
+        """
+        source = self._tiers[-1]
+        try:
+            # Read the version before the dictionary, so a change made in between is refilled on the next check
+            version = source.get_version_info()
+            if version is not None and version == self._source_version:
+                self._checked_at = time.monotonic()
+                return None
+            secret_dictionary = source.get_secret_dictionary() or {}
+        except Exception as e:
+            # Serve the copies held by the faster tiers while the source is unreachable
+            self.logger.warning("TieredSecretsProvider: failed to refresh from tier %s: %s", source.__class__.__name__,
+                                e)
+            return None
+
+        self._fill(self._tiers[:-1], secret_dictionary)
+        self._source_version = version
+        self._checked_at = time.monotonic()
+        return secret_dictionary
+
+    def _fill(self, tiers: Sequence[BaseSecretsProvider], secret_dictionary: Dict[str, str]) -> None:
+        for tier in tiers:
+            try:
+                tier.store_secret_dictionary(secret_dictionary)
+            except Exception as e:
+                self.logger.warning("TieredSecretsProvider: failed to fill tier %s: %s", tier.__class__.__name__, e)
+
+    def get(self, key: str) -> Optional[str]:
+        if not key:
+            self.logger.warning("get: key is missing")
+            return None
+        return self.get_secret_dictionary().get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[str]]:
+        secret_dictionary = self.get_secret_dictionary()
+        return {key: secret_dictionary.get(key) for key in keys}
+
+    def store_secret_dictionary(self, secret_dictionary: Dict) -> None:
+        self._write("store_secret_dictionary", dict(secret_dictionary), warm=False)
+
+    def store(self, key: str, secret: str) -> None:
+        if not key or not secret:
+            message = "store: key or secret is missing"
+            self.logger.warning(message)
+            raise SecretProviderException(message)
+        self._write("store", key, secret)
+
+    def delete(self, key: str) -> None:
+        if not key:
+            message = "delete secret failed, key is none or empty"
+            self.logger.warning(message)
+            raise SecretProviderException(message)
+        self._write("delete", key)
+
+    def store_many(self, secrets: Dict[str, str]) -> None:
+        self._write("store_many", dict(secrets))
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        self._write("delete_many", list(keys))
+
+    def apply_changes(self, changes: Dict[str, Optional[str]]) -> None:
+        if changes:
+            self._write("apply_changes", dict(changes))
+
+    def _write(self, method: str, *args: Any, warm: bool = True) -> None:
+        # A single-key write to an empty faster tier would leave it holding a partial dictionary
+        if warm and len(self._tiers) > 1:
+            self.get_secret_dictionary()
+
+        if self._write_policy == WritePolicy.WRITE_THROUGH:
+            for tier in reversed(self._tiers):
+                getattr(tier, method)(*args)
+            return
+
+        if self._closed:
+            raise SecretProviderException("TieredSecretsProvider is closed")
+        # Keep the queue in the order the writes were applied to the fastest tier
+        with self._write_lock:
+            getattr(self._tiers[0], method)(*args)
+            if len(self._tiers) > 1:
+                self._start_worker()
+                self._queue.put((method, args))
+
+    def _has_pending_writes(self) -> bool:
+        return self._queue.unfinished_tasks > 0
+
+    def _start_worker(self) -> None:
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._write_behind_loop, name="secrets-write-behind", daemon=True)
+            self._worker.start()
+
+    def _write_behind_loop(self) -> None:
+        while True:
+            write = self._queue.get()
+            try:
+                if write is None:
+                    return
+                method, args = write
+                for tier in reversed(self._tiers[1:]):
+                    getattr(tier, method)(*args)
+            except Exception as e:
+                self.logger.error("TieredSecretsProvider: write-behind %s failed: %s", write[0], e)
+                self._write_errors.append(e)
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """
+        Waits until every queued write has been applied to the slower tiers.
+
+        :raises SecretProviderException: If queued writes failed since the last flush.
+        """
+        if self._worker is not None:
+            self._queue.join()
+
+        errors, self._write_errors = self._write_errors, []
+        if errors:
+            raise SecretProviderException(
+                f"TieredSecretsProvider: {len(errors)} queued writes failed, last error: {errors[-1]}")
+
+    def close(self) -> None:
+        """
+        Flushes queued writes, stops the write-behind worker and closes every tier.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        try:
+            self.flush()
+        finally:
+            if self._worker is not None:
+                self._queue.put(None)
+                self._worker.join()
+                self._worker = None
+            for tier in self._tiers:
+                tier.close()
+
+
+@async_secrets_provider_fm.flavor(CredentialsProvider.TIERED)
+class AsyncTieredSecretsProvider(AsyncSecretsProviderAdapter):
+    """
+    Exposes TieredSecretsProvider through the asyncio interface, running tier calls in a worker thread.
+    """
+
+    def __init__(self,
+                 tiers: Optional[Sequence[Tier]] = None,
+                 namespace: Optional[str] = None,
+                 write_policy: Union[WritePolicy, str] = WritePolicy.WRITE_THROUGH,
+                 queue_size: int = DEFAULT_WRITE_QUEUE_SIZE,
+                 refresh_interval: float = DEFAULT_TTL_SECONDS):
+        """
+        :param tiers: The providers to stack, fastest first, as instances or flavors of secrets_provider_fm.
+         Defaults to the comma-separated flavors in AGENT_GUARD_TIERS.
+        :param namespace: The namespace passed to the tiers given as flavors, i.e. as the secret_id for GCP.
+        :param write_policy: 'write-through' or 'write-behind'. Defaults to 'write-through'.
+        :param queue_size: Maximum number of queued writes in write-behind mode. Defaults to 1000.
+        :param refresh_interval: Number of seconds between checks of the last tier for changes. Defaults to 60;
+         0 checks on every read.
+        """
+        super().__init__(
+            TieredSecretsProvider(tiers=tiers,
+                                  namespace=namespace,
+                                  write_policy=write_policy,
+                                  queue_size=queue_size,
+                                  refresh_interval=refresh_interval))
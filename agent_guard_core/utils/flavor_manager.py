@@ -1,4 +1,7 @@
 import abc
+import importlib
+from enum import Enum
+from importlib.metadata import entry_points
 from typing import Any, Callable, Generic, Optional, TypeVar, Union, cast, overload
 
 KeyT = TypeVar("KeyT")
@@ -95,17 +98,56 @@ class FlavorManager(Generic[KeyT, ValT]):
 
     Notice that you don't refer to the implementation classes in this code - hence decoupling has been achieved.
     In addition, future implementations don't need to be added to your code - adding them to the flavor manager does that automatically.
+
+    Flavors can also be registered lazily, by import path, so the module implementing them (and its dependencies)
+    is only imported the first time the flavor is looked up:
+    ```
+    base_flavor_manager.lazy_flavor("hello", "my_package.hello:Hello")
+    ```
+    A manager created with an entry point group also resolves unknown flavors from the installed packages' entry points,
+    so other packages can add flavors without changing this one:
+    ```
+    [project.entry-points."my_package.bases"]
+    hey = "other_package.hey:Hey"
+    ```
     """
 
-    def __init__(self) -> None:
+    def __init__(self, entry_point_group: Optional[str] = None) -> None:
+        """
+        :param entry_point_group: Entry point group searched for flavors that were not registered.
+        """
         self._flavors: dict[KeyT, ValT] = {}
+        self._lazy_flavors: dict[KeyT, str] = {}
+        self._entry_point_group = entry_point_group
 
     def __setitem__(self, key: KeyT, value: ValT) -> None:
         self._flavors[key] = value
 
     def __getitem__(self, key: KeyT) -> ValT:
+        if key not in self._flavors:
+            self._resolve(key)
         return self._flavors[key]
 
+    def lazy_flavor(self, flavor: KeyT, import_path: str) -> None:
+        """
+        Registers a flavor by the import path of its value, in the form "package.module:attribute".
+        The module is imported the first time the flavor is looked up.
+        """
+        self._lazy_flavors[flavor] = import_path
+
+    def _resolve(self, flavor: KeyT) -> None:
+        import_path = self._lazy_flavors.get(flavor)
+        if import_path is not None:
+            module_name, _, attribute = import_path.partition(":")
+            self[flavor] = getattr(importlib.import_module(module_name), attribute)
+            return
+
+        if self._entry_point_group is not None:
+            name = flavor.value if isinstance(flavor, Enum) else str(flavor)
+            for entry_point in entry_points(group=self._entry_point_group, name=name):
+                self[flavor] = entry_point.load()
+                return
+
     @overload
     def get(self, flavor: KeyT, default: T) -> Union[ValT, T]:
         ...
@@ -118,6 +160,8 @@ class FlavorManager(Generic[KeyT, ValT]):
         """
         Returns the value of the given flavor. Similar api as dict's get()
         """
+        if flavor not in self._flavors:
+            self._resolve(flavor)
         return self._flavors.get(flavor, default)
 
     @overload
@@ -152,7 +196,7 @@ class FlavorManager(Generic[KeyT, ValT]):
     
     def flavor_of(self, value: ValT) -> KeyT:
         """
-        returns the key of this specific value
+        returns the key of this specific value, among the flavors that were already resolved
         """
         for key, val in self._flavors.items():
             if val == value:
@@ -0,0 +1,32 @@
+import threading
+from typing import Hashable, Set
+
+
+class KnownResources:
+    """
+    A thread-safe, per-process record of remote resources known to exist.
+
+    Providers use it to skip the create/declare call that precedes a write once the target secret
+    or variable has been seen. Entries must be discarded when the remote service reports the resource
+    as missing, so a resource deleted by another process is re-created on the next write.
+    """
+
+    def __init__(self):
+        self._resources: Set[Hashable] = set()
+        self._lock = threading.Lock()
+
+    def add(self, resource: Hashable) -> None:
+        with self._lock:
+            self._resources.add(resource)
+
+    def discard(self, resource: Hashable) -> None:
+        with self._lock:
+            self._resources.discard(resource)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._resources.clear()
+
+    def __contains__(self, resource: Hashable) -> bool:
+        with self._lock:
+            return resource in self._resources
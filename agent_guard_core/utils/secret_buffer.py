@@ -0,0 +1,120 @@
+import logging
+import os
+import sys
+from typing import Any, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+_libc: Optional[Any] = None
+
+
+def _get_libc() -> Optional[Any]:
+    """
+    Loads the C library for mlock()/munlock(), on first use so importing this module stays cheap.
+    """
+    global _libc
+    if _libc is None and sys.platform != "win32":
+        import ctypes
+        import ctypes.util
+        try:
+            _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        except OSError as e:
+            logger.warning("SecretBuffer: cannot load the C library to lock memory: %s", e)
+    return _libc
+
+
+class SecretBuffer:
+    """
+    Holds a secret in a mutable buffer that is overwritten with zeros when released.
+    Python str values are immutable and stay in memory until the allocator happens to reuse it,
+    whatever gc.collect() does; a SecretBuffer is wiped as soon as release() is called, or when it is garbage
+    collected. With lock=True, the buffer is also locked in RAM (mlock) so it is never written to swap.
+
+    Copies made from the buffer, i.e. by decode(), are ordinary strings and are not covered.
+
+    ```
+    with SecretBuffer(value) as secret:
+        client.authenticate(secret.view())
+    ```
+    """
+
+    def __init__(self, value: Union[str, bytes, bytearray, memoryview], lock: bool = False):
+        """
+        :param value: The secret to copy into the buffer. str values are encoded as UTF-8.
+        :param lock: Lock the buffer in RAM. Failures, i.e. when RLIMIT_MEMLOCK is exceeded, are logged
+         and leave the buffer unlocked.
+        """
+        self._buffer = bytearray(value.encode("utf-8") if isinstance(value, str) else value)
+        # A ctypes view of the buffer: it keeps the bytearray from being resized, and thus moved, while locked
+        self._locked_view: Optional[Any] = None
+        if lock and self._buffer:
+            self._lock()
+
+    def _lock(self) -> None:
+        libc = _get_libc()
+        if libc is None:
+            return
+        import ctypes
+        view = (ctypes.c_char * len(self._buffer)).from_buffer(self._buffer)
+        if libc.mlock(ctypes.addressof(view), ctypes.c_size_t(len(self._buffer))) != 0:
+            logger.warning("SecretBuffer: mlock failed: %s", os.strerror(ctypes.get_errno()))
+            return
+        self._locked_view = view
+
+    @property
+    def locked(self) -> bool:
+        return self._locked_view is not None
+
+    @property
+    def released(self) -> bool:
+        return self._buffer is None
+
+    def __len__(self) -> int:
+        return len(self._buffer) if self._buffer is not None else 0
+
+    def view(self) -> memoryview:
+        """
+        Returns a read-only view of the secret bytes, which does not copy them.
+
+        :raises ValueError: If the buffer was released.
+        """
+        if self._buffer is None:
+            raise ValueError("SecretBuffer was released")
+        return memoryview(self._buffer).toreadonly()
+
+    def decode(self, encoding: str = "utf-8") -> str:
+        """
+        Returns the secret as a str, for APIs that only accept strings. The str is an immutable copy,
+        which is not wiped on release.
+
+        :raises ValueError: If the buffer was released.
+        """
+        if self._buffer is None:
+            raise ValueError("SecretBuffer was released")
+        return self._buffer.decode(encoding)
+
+    def release(self) -> None:
+        """
+        Overwrites the secret with zeros and unlocks the buffer. Views returned by view() then read zeros.
+        """
+        # Also called by __del__ when __init__ failed
+        if getattr(self, "_buffer", None) is None:
+            return
+        self._buffer[:] = bytes(len(self._buffer))
+        if self._locked_view is not None:
+            import ctypes
+            _get_libc().munlock(ctypes.addressof(self._locked_view), ctypes.c_size_t(len(self._buffer)))
+            self._locked_view = None
+        self._buffer = None
+
+    def __enter__(self) -> "SecretBuffer":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
+
+    def __del__(self) -> None:
+        self.release()
+
+    def __repr__(self) -> str:
+        return "SecretBuffer(released)" if self._buffer is None else "SecretBuffer(***)"
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+KeyT = TypeVar("KeyT", bound=Hashable)
+ValT = TypeVar("ValT")
+
+
+class _Call(Generic[ValT]):
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.leader = threading.get_ident()
+        self.result: Optional[ValT] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight(Generic[KeyT, ValT]):
+    """
+    Collapses concurrent calls with the same key into one: the first caller runs the function,
+    callers arriving while it runs wait for it and share its result or exception.
+
+    Threads use do(), asyncio tasks use ado(). Results are not kept once the call completes;
+    combine with a cache for that. Counters of calls and collapsed calls are kept for monitoring.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[KeyT, _Call[ValT]] = {}
+        # Futures belong to an event loop, so asyncio calls are also keyed by loop
+        self._tasks: Dict[Tuple[int, KeyT], "asyncio.Task[ValT]"] = {}
+        self.calls = 0
+        self.collapsed = 0
+
+    def do(self, key: KeyT, fn: Callable[[], ValT]) -> ValT:
+        """
+        Runs fn(), unless a call with the same key is in flight, in which case its result is returned.
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            # A leader calling back into the same key would wait for itself
+            if call is not None and call.leader != threading.get_ident():
+                self.collapsed += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+    async def ado(self, key: KeyT, fn: Callable[[], Awaitable[ValT]]) -> ValT:
+        """
+        Awaits fn(), unless a call with the same key is in flight on this event loop, in which case
+        its result is returned. The call runs in its own task, so cancelling one caller does not cancel it.
+        """
+        task_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            self.calls += 1
+            task = self._tasks.get(task_key)
+            if task is not None:
+                self.collapsed += 1
+            else:
+                task = asyncio.ensure_future(fn())
+                self._tasks[task_key] = task
+                task.add_done_callback(lambda done: self._discard_task(task_key, done))
+        return await asyncio.shield(task)
+
+    def _discard_task(self, task_key: Tuple[int, KeyT], task: "asyncio.Task[ValT]") -> None:
+        with self._lock:
+            if self._tasks.get(task_key) is task:
+                del self._tasks[task_key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller was cancelled
+            task.exception()
+
+    def forget(self, key: KeyT) -> None:
+        """
+        Makes callers arriving after this point start a new call instead of joining the one in flight,
+        i.e. after a write made the in-flight result stale.
+        """
+        with self._lock:
+            self._calls.pop(key, None)
+            for task_key in [task_key for task_key in self._tasks if task_key[1] == key]:
+                del self._tasks[task_key]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the number of calls, how many of them were collapsed into another call, and the calls in flight.
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "collapsed": self.collapsed,
+                "in_flight": len(self._calls) + len(self._tasks),
+            }
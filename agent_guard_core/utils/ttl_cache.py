@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+KeyT = TypeVar("KeyT", bound=Hashable)
+ValT = TypeVar("ValT")
+
+DEFAULT_TTL_SECONDS = 60.0
+DEFAULT_MAX_ENTRIES = 128
+
+
+class TTLCache(Generic[KeyT, ValT]):
+    """
+    A thread-safe in-memory cache with a per-entry time-to-live and a least-recently-used bound.
+
+    Entries expire ``ttl`` seconds after they were stored. When more than ``max_entries`` entries
+    are held, the least recently used one is evicted. Hit and miss counters are kept for monitoring.
+
+    An entry can also be kept ``stale_ttl`` seconds past its expiry. lookup() still returns it during
+    that window, flagged as stale, so callers can serve it while they refresh it.
+    """
+
+    def __init__(self,
+                 ttl: float = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 clock: Callable[[], float] = time.monotonic,
+                 stale_ttl: float = 0.0):
+        """
+        :param ttl: Number of seconds an entry stays valid. Defaults to 60.
+        :param max_entries: Maximum number of entries to hold before evicting. Defaults to 128.
+        :param clock: Monotonic time source, mainly useful for tests.
+        :param stale_ttl: Number of seconds an expired entry is still returned by lookup(). Defaults to 0.
+        """
+        if ttl < 0 or stale_ttl < 0:
+            raise ValueError("ttl and stale_ttl must not be negative")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        self._max_entries = max_entries
+        self._clock = clock
+        # key -> (expires_at, stale_until, value)
+        self._entries: "OrderedDict[KeyT, Tuple[float, float, ValT]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def get(self, key: KeyT) -> Optional[ValT]:
+        """
+        Returns the cached value of the key, or None if it is missing or expired.
+        """
+        entry = self._lookup(key, allow_stale=False)
+        return entry[0] if entry is not None else None
+
+    def lookup(self, key: KeyT) -> Optional[Tuple[ValT, bool]]:
+        """
+        Returns the cached value of the key and whether it is stale, or None if it is missing
+        or past its stale window.
+        """
+        return self._lookup(key, allow_stale=True)
+
+    def _lookup(self, key: KeyT, allow_stale: bool) -> Optional[Tuple[ValT, bool]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, stale_until, value = entry
+            now = self._clock()
+            if now >= stale_until:
+                del self._entries[key]
+            if now >= expires_at and not (allow_stale and now < stale_until):
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            stale = now >= expires_at
+            if stale:
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+            return value, stale
+
+    def set(self, key: KeyT, value: ValT, ttl: Optional[float] = None, stale_ttl: Optional[float] = None) -> None:
+        """
+        Stores a value under the key, evicting the least recently used entry if the cache is full.
+
+        :param ttl: Number of seconds this entry stays valid, instead of the cache's ttl.
+        :param stale_ttl: Number of seconds this entry is kept past its expiry, instead of the cache's stale_ttl.
+        """
+        expires_at = self._clock() + (self._ttl if ttl is None else ttl)
+        stale_until = expires_at + (self._stale_ttl if stale_ttl is None else stale_ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, stale_until, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: KeyT) -> None:
+        """
+        Removes the key from the cache, if present.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Removes all entries from the cache. Counters are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the hit/miss counters and the current size of the cache.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
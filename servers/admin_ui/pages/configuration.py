@@ -11,14 +11,16 @@ from servers.common import (CONJUR_APPLIANCE_URL_KEY, CONJUR_AUTHN_API_KEY_KEY,
 
 def save_configuration(provider: FileSecretsProvider, config: ServerConfig):
 
-    provider.store(SECRET_PROVIDER_KEY, config.SECRET_PROVIDER)
-    provider.store(SECRET_NAMESPACE_KEY, config.SECRET_NAMESPACE)
-
-    # Save Conjur-specific configuration if applicable
-    if 'CONJUR_SECRET_PROVIDER' == config.SECRET_PROVIDER:
-        provider.store(CONJUR_AUTHN_LOGIN_KEY, config.CONJUR_AUTHN_LOGIN)
-        provider.store(CONJUR_AUTHN_API_KEY_KEY, config.CONJUR_AUTHN_API_KEY)
-        provider.store(CONJUR_APPLIANCE_URL_KEY, config.CONJUR_APPLIANCE_URL)
+    # Write all the settings to the file at once
+    with provider.batch() as batch:
+        batch.store(SECRET_PROVIDER_KEY, config.SECRET_PROVIDER)
+        batch.store(SECRET_NAMESPACE_KEY, config.SECRET_NAMESPACE)
+
+        # Save Conjur-specific configuration if applicable
+        if 'CONJUR_SECRET_PROVIDER' == config.SECRET_PROVIDER:
+            batch.store(CONJUR_AUTHN_LOGIN_KEY, config.CONJUR_AUTHN_LOGIN)
+            batch.store(CONJUR_AUTHN_API_KEY_KEY, config.CONJUR_AUTHN_API_KEY)
+            batch.store(CONJUR_APPLIANCE_URL_KEY, config.CONJUR_APPLIANCE_URL)
 
 
 ## Configuration form beginning
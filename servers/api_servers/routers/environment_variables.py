@@ -5,9 +5,12 @@ Endpoints:
     - GET /environment_variables/ : Retrieve all environment variables as a list of key-value pairs.
     - GET /environment_variables/{env_key}/ : Retrieve a specific environment variable by its key.
     - POST /environment_variables/{env_key}/ : Create or update an environment variable with a given key and value.
+    - POST /environment_variables/ : Create or update several environment variables with a single write.
 """
 
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
 from agent_guard_core.credentials.environment_manager import EnvironmentVariablesManager
@@ -41,17 +44,27 @@ class EnvironmentVariableInput(BaseModel):
 @environment_variables_router.get("/environment_variables/",
                                   tags=["environment_variables"],
                                   response_model=list[EnvironmentVariable])
-async def read_environment_variables():
+async def read_environment_variables(keys: Optional[list[str]] = Query(default=None)):
     """
     Retrieve all environment variables as a list of key-value pairs.
 
+    Args:
+        keys (list[str], optional): Restrict the result to these keys, fetched with a single call.
+
     Returns:
         list[EnvironmentVariable]: A list of environment variables, where each contains a key and its associated value.
     """
     secret_provider = get_secret_provider()
     env_manager = EnvironmentVariablesManager(secret_provider)
 
-    env_vars_dict = env_manager.list_env_vars()
+    if keys:
+        env_vars_dict = {
+            key: value
+            for key, value in env_manager.get_env_vars(keys).items()
+            if value is not None
+        }
+    else:
+        env_vars_dict = await env_manager.alist_env_vars()
     if env_vars_dict is None:
         raise HTTPException(status_code=404,
                             detail="No environment variables found")
@@ -113,3 +126,30 @@ async def create_environment_variable(env_key: str,
         return EnvironmentVariable(key=env_key, value=env_var.value)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@environment_variables_router.post("/environment_variables/",
+                                   tags=["environment_variables"],
+                                   response_model=list[EnvironmentVariable])
+async def create_environment_variables(env_vars: list[EnvironmentVariable]):
+    """
+    Create or update several environment variables with a single write to the secret provider.
+
+    Args:
+        env_vars (list[EnvironmentVariable]): The environment variables to create or update.
+
+    Returns:
+        list[EnvironmentVariable]: The created or updated environment variables.
+
+    Raises:
+        HTTPException: If an error occurs while setting the environment variables.
+    """
+    try:
+        secret_provider = get_secret_provider()
+        env_manager = EnvironmentVariablesManager(secret_provider)
+
+        env_manager.add_env_vars({env_var.key: env_var.value for env_var in env_vars})
+
+        return env_vars
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,70 @@
+"""
+Benchmarks the import time of agc commands, as reported by python -X importtime.
+
+Run with: python -m tests.benchmarks.cli_import_benchmark [--repeat N] [--top N] [--budget-ms MS]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+DEFAULT_REPEAT = 5
+DEFAULT_TOP = 10
+
+# The command is run as 'python -m agent_guard_core.cli <args>'. The proxied MCP server exits right away,
+# so 'mcp-proxy start' stops after loading everything it needs to start.
+COMMANDS: Dict[str, List[str]] = {
+    "agc --help": ["--help"],
+    "agc mcp-proxy start": ["mcp-proxy", "start", "--", sys.executable, "-c", "pass"],
+}
+
+
+def _run_importtime(args: List[str], home: str) -> List[Tuple[str, int]]:
+    """
+    Runs the command and returns the cumulative import time, in microseconds, of each top-level import.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-m", "agent_guard_core.cli", *args],
+                            stdin=subprocess.DEVNULL,
+                            stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE,
+                            env={**os.environ, "HOME": home},
+                            text=True,
+                            timeout=120)
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented, and already counted in their parent's cumulative time
+        if not name[1:].startswith(" "):
+            imports.append((name.strip(), int(cumulative)))
+    return imports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Number of slowest imports to list")
+    parser.add_argument("--budget-ms", type=float, help="Exit with an error if a command imports for longer")
+    args = parser.parse_args()
+
+    over_budget = []
+    with tempfile.TemporaryDirectory() as home:
+        for name, command in COMMANDS.items():
+            runs = [_run_importtime(command, home) for _ in range(args.repeat)]
+            best = min(runs, key=lambda imports: sum(cumulative for _, cumulative in imports))
+            total_ms = sum(cumulative for _, cumulative in best) / 1000
+            print(f"{name:<40} {total_ms:10.2f} ms (best of {args.repeat})")
+            for module, cumulative in sorted(best, key=lambda item: item[1], reverse=True)[:args.top]:
+                print(f"    {module:<36} {cumulative / 1000:10.2f} ms")
+            if args.budget_ms is not None and total_ms > args.budget_ms:
+                over_budget.append(name)
+
+    if over_budget:
+        sys.exit(f"Over the {args.budget_ms} ms import budget: {', '.join(over_budget)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmarks FileSecretsProvider reads and writes on a large dotenv file.
+
+Run with: python -m tests.benchmarks.file_secrets_provider_benchmark [--lines N] [--repeat N]
+"""
+import argparse
+import os
+import tempfile
+import time
+import timeit
+
+from dotenv import dotenv_values
+
+from agent_guard_core.credentials.file_secrets_provider import FileSecretsProvider, parse_dotenv_text
+
+DEFAULT_LINES = 50_000
+DEFAULT_REPEAT = 5
+
+
+def _report(name: str, seconds: float, repeat: int) -> None:
+    print(f"{name:<40} {seconds / repeat * 1000:10.2f} ms/call")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=DEFAULT_LINES)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "benchmark.env")
+        provider = FileSecretsProvider(namespace=path)
+        provider.store_secret_dictionary({f"KEY_{i}": f"value-{i}-{'x' * 32}" for i in range(args.lines)})
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+
+        print(f"{args.lines} lines, {len(text)} bytes")
+        # dotenv_values() is quadratic in the file size, so it is timed once
+        start = time.perf_counter()
+        expected = dotenv_values(path)
+        _report("dotenv_values", time.perf_counter() - start, 1)
+        assert parse_dotenv_text(text) == expected
+
+        _report("parse_dotenv_text", timeit.timeit(lambda: parse_dotenv_text(text), number=args.repeat),
+                args.repeat)
+        provider.get_secret_dictionary()
+        _report("get_secret_dictionary (unchanged file)",
+                timeit.timeit(provider.get_secret_dictionary, number=args.repeat), args.repeat)
+
+        _report("store (rewrite)", timeit.timeit(lambda: provider.store("KEY_0", "changed"), number=args.repeat),
+                args.repeat)
+        journal_provider = FileSecretsProvider(namespace=path, journal=True)
+        journal_provider.get_secret_dictionary()
+        _report("store (journal)",
+                timeit.timeit(lambda: journal_provider.store("KEY_0", "journaled"), number=args.repeat), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,17 +10,17 @@ from agent_guard_core.credentials.gcp_secrets_manager_provider import GCPSecrets
 
 
 @pytest.fixture(params=[
-    AWSSecretsProvider(region_name="us-east-1", namespace=""),
-    AWSSecretsProvider(region_name="us-east-1", namespace="test_asm_1"),
-    GCPSecretsProvider(project_id="test-project-1"),
-    FileSecretsProvider(namespace="ns_test1"),
-])
-def env_manager(request):
+    lambda tmp_path: AWSSecretsProvider(region_name="us-east-1", namespace=""),
+    lambda tmp_path: AWSSecretsProvider(region_name="us-east-1", namespace="test_asm_1"),
+    lambda tmp_path: GCPSecretsProvider(project_id="test-project-1"),
+    lambda tmp_path: FileSecretsProvider(namespace=str(tmp_path / "ns_test1")),
+], ids=["aws", "aws-namespace", "gcp", "file"])
+def env_manager(request, tmp_path):
     """
     Fixture to create an instance of EnvironmentVariablesManager with AWSParameterStoreProvider or AWSSecretsProvider.
-    This fixture is used to provide a clean instance for each test case.
+    This fixture is used to provide a clean instance for each test case; file secrets are kept under tmp_path.
     """
-    secret_provider = request.param
+    secret_provider = request.param(tmp_path)
     return EnvironmentVariablesManager(secret_provider=secret_provider)
 
 
@@ -85,7 +85,9 @@ def test_list_env_vars_with_spaces(env_manager):
     assert fetched_value == value
 
 
-def test_add_value_with_space_inside():
+def test_add_value_with_space_inside(tmp_path, monkeypatch):
+    # FileSecretsProvider() reads .env from the working directory
+    monkeypatch.chdir(tmp_path)
 
     file_content = """
     a1 = bbb
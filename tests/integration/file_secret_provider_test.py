@@ -115,3 +115,13 @@ def test_namespace_with_multiple_directories(
     secret_provider_with_multiple_directories.delete(secret_key)
     fetched_secret = secret_provider_with_multiple_directories.get(secret_key)
     assert fetched_secret is None
+
+
+def test_store_get_delete_many(secret_provider):
+    secrets = {'many_key1': 'value1', 'many_key2': 'value2'}
+    secret_provider.store_many(secrets)
+    fetched = secret_provider.get_many(['many_key1', 'many_key2', 'missing'])
+    assert fetched == {'many_key1': 'value1', 'many_key2': 'value2', 'missing': None}
+
+    secret_provider.delete_many(secrets.keys())
+    assert secret_provider.get_many(secrets.keys()) == {'many_key1': None, 'many_key2': None}
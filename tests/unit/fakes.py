@@ -0,0 +1,66 @@
+from typing import Dict, Optional
+
+from agent_guard_core.credentials.secrets_provider import BaseSecretsProvider, SecretProviderException
+
+
+class CountingSecretsProvider(BaseSecretsProvider):
+    """
+    Keeps the secret dictionary in memory and counts the reads and writes reaching it.
+    Set fail to make reads raise, as an unreachable provider would.
+    """
+
+    def __init__(self, namespace: str = "default"):
+        super().__init__()
+        self._namespace = namespace
+        self._dict: Dict[str, str] = {}
+        self.reads = 0
+        self.writes = 0
+        self.fail = False
+
+    def get_cache_key(self) -> str:
+        return f"counting:{self._namespace}"
+
+    def connect(self) -> bool:
+        return True
+
+    def get_secret_dictionary(self) -> Dict[str, str]:
+        self.reads += 1
+        if self.fail:
+            raise SecretProviderException("unreachable")
+        return dict(self._dict)
+
+    def store_secret_dictionary(self, secret_dictionary: Dict):
+        self.writes += 1
+        self._dict = dict(secret_dictionary)
+
+    def store(self, key: str, secret: str) -> None:
+        dictionary = self.get_secret_dictionary()
+        dictionary[key] = secret
+        self.store_secret_dictionary(dictionary)
+
+    def get(self, key: str) -> Optional[str]:
+        return self.get_secret_dictionary().get(key)
+
+    def delete(self, key: str) -> None:
+        dictionary = self.get_secret_dictionary()
+        dictionary.pop(key, None)
+        self.store_secret_dictionary(dictionary)
+
+
+class VersionedSecretsProvider(CountingSecretsProvider):
+    """
+    Reports a version that changes with every write, and counts the version checks.
+    """
+
+    def __init__(self, namespace: str = "default"):
+        super().__init__(namespace)
+        self.version = 0
+        self.version_checks = 0
+
+    def get_version_info(self) -> Optional[str]:
+        self.version_checks += 1
+        return str(self.version)
+
+    def store_secret_dictionary(self, secret_dictionary: Dict):
+        super().store_secret_dictionary(secret_dictionary)
+        self.version += 1
@@ -0,0 +1,77 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+
+from agent_guard_core.credentials.async_secrets_provider import AsyncSecretsProviderAdapter, async_secrets_provider_fm
+from agent_guard_core.credentials.enum import CredentialsProvider
+from agent_guard_core.credentials.environment_manager import EnvironmentVariablesManager
+from agent_guard_core.credentials.file_secrets_provider import AsyncFileSecretsProvider, FileSecretsProvider
+
+
+@pytest.fixture
+def file_provider(tmp_path):
+    return FileSecretsProvider(namespace=str(tmp_path / "secrets.env"))
+
+
+def test_all_flavors_have_async_implementations():
+    for flavor in CredentialsProvider:
+        assert async_secrets_provider_fm.get(flavor) is not None
+
+
+@pytest.mark.asyncio
+async def test_adapter_offloads_to_blocking_provider(file_provider):
+    provider = AsyncSecretsProviderAdapter(file_provider)
+    assert await provider.connect()
+
+    await provider.store("key", "value")
+    assert await provider.get("key") == "value"
+    assert file_provider.get("key") == "value"
+
+    await provider.delete("key")
+    assert await provider.get_secret_dictionary() == {}
+
+
+@pytest.mark.asyncio
+async def test_async_file_provider(tmp_path):
+    async with AsyncFileSecretsProvider(namespace=str(tmp_path / "async.env")) as provider:
+        await provider.store_secret_dictionary({"a": "1"})
+        assert await provider.get("a") == "1"
+
+
+@pytest.mark.asyncio
+async def test_environment_manager_async_context(file_provider):
+    key = f"key_{uuid.uuid4().hex}"
+    file_provider.store(key, "value")
+
+    async with EnvironmentVariablesManager(AsyncSecretsProviderAdapter(file_provider)):
+        assert os.environ.get(key) == "value"
+    assert key not in os.environ
+
+
+@pytest.mark.asyncio
+async def test_set_env_vars_decorator(file_provider):
+    key = f"key_{uuid.uuid4().hex}"
+    file_provider.store(key, "value")
+
+    @EnvironmentVariablesManager.set_env_vars(file_provider)
+    async def read_env():
+        return os.environ.get(key)
+
+    assert await read_env() == "value"
+    assert key not in os.environ
+
+
+@pytest.mark.asyncio
+async def test_adapter_collapses_concurrent_dictionary_fetches(file_provider):
+    file_provider.store_secret_dictionary({"a": "1"})
+    provider = AsyncSecretsProviderAdapter(file_provider)
+
+    dictionaries = await asyncio.gather(*(provider.get_secret_dictionary() for _ in range(5)))
+    assert dictionaries == [{"a": "1"}] * 5
+    # Each caller gets its own copy
+    dictionaries[0]["a"] = "changed"
+    assert dictionaries[1]["a"] == "1"
+    assert provider.fetch_stats()["calls"] == 5
+    assert provider.fetch_stats()["collapsed"] == 4
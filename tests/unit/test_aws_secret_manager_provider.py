@@ -1,7 +1,10 @@
 from unittest.mock import MagicMock
 
+import boto3
 import pytest
+from botocore.stub import Stubber
 
+from agent_guard_core.credentials import aws_secrets_manager_provider
 from agent_guard_core.credentials.aws_secrets_manager_provider import AWSSecretsProvider
 
 
@@ -78,3 +81,72 @@ def test_delete_failure(provider):
         provider.delete("key")
     assert str(excinfo.value) == "Delete failed"
     provider.delete.assert_called_once_with("key")
+
+
+def test_store_skips_create_for_known_secret(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    aws_secrets_manager_provider._existing_secrets.clear()
+    aws = AWSSecretsProvider(namespace="unit")
+    aws._client = boto3.client("secretsmanager", region_name="us-east-1")
+    secret_id = "unit/agentic_env_vars"
+
+    with Stubber(aws._client) as stubber:
+        stubber.add_client_error("create_secret", service_error_code="ResourceExistsException")
+        stubber.add_response("put_secret_value", {}, {"SecretId": secret_id, "SecretString": '{"KEY": "1"}'})
+        stubber.add_response("put_secret_value", {}, {"SecretId": secret_id, "SecretString": '{"KEY": "2"}'})
+        aws.store_secret_dictionary({"KEY": "1"})
+        aws.store_secret_dictionary({"KEY": "2"})
+        stubber.assert_no_pending_responses()
+
+
+def test_get_version_info_reads_current_version(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    aws = AWSSecretsProvider(namespace="unit")
+    aws._client = boto3.client("secretsmanager", region_name="us-east-1")
+    secret_id = "unit/agentic_env_vars"
+
+    with Stubber(aws._client) as stubber:
+        stubber.add_response("describe_secret", {
+            "VersionIdsToStages": {
+                "v1-previous-version-0000000000000": ["AWSPREVIOUS"],
+                "v2-current-version-00000000000000": ["AWSCURRENT"],
+            }
+        }, {"SecretId": secret_id})
+        stubber.add_client_error("describe_secret", service_error_code="ResourceNotFoundException")
+        assert aws.get_version_info() == "v2-current-version-00000000000000"
+        assert aws.get_version_info() == ""
+        stubber.assert_no_pending_responses()
+
+    assert AWSSecretsProvider(namespace="unit", layout="per-key").get_version_info() is None
+
+
+def _secret_value(secret_text: str) -> dict:
+    return {"SecretString": secret_text, "ResponseMetadata": {"HTTPStatusCode": 200}}
+
+
+def test_batch_methods_read_and_write_once(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    aws_secrets_manager_provider._existing_secrets.clear()
+    aws = AWSSecretsProvider(namespace="unit")
+    aws._client = boto3.client("secretsmanager", region_name="us-east-1")
+    secret_id = "unit/agentic_env_vars"
+
+    with Stubber(aws._client) as stubber:
+        stubber.add_response("get_secret_value", _secret_value('{"A": "1"}'), {"SecretId": secret_id})
+        assert aws.get_many(["A", "B"]) == {"A": "1", "B": None}
+
+        stubber.add_response("get_secret_value", _secret_value('{"A": "1"}'), {"SecretId": secret_id})
+        stubber.add_response("put_secret_value", {}, {
+            "SecretId": secret_id,
+            "SecretString": '{"A": "1", "B": "2", "C": "3"}'
+        })
+        aws.store_many({"B": "2", "C": "3"})
+
+        stubber.add_response("get_secret_value", _secret_value('{"A": "1", "B": "2", "C": "3"}'),
+                             {"SecretId": secret_id})
+        stubber.add_response("put_secret_value", {}, {"SecretId": secret_id, "SecretString": '{"B": "2"}'})
+        aws.delete_many(["A", "C", "MISSING"])
+        stubber.assert_no_pending_responses()
@@ -0,0 +1,289 @@
+import os
+import stat
+import threading
+import time
+
+import pytest
+
+from agent_guard_core.credentials.caching_secrets_provider import CachingSecretsProvider
+from agent_guard_core.credentials.persistent_cache import (KEY_FILE_BYTES, PersistentSecretsCache,
+                                                           _read_or_create_key_file)
+from agent_guard_core.credentials.secrets_provider import SecretProviderException
+from agent_guard_core.utils.ttl_cache import TTLCache
+from tests.unit.fakes import CountingSecretsProvider, VersionedSecretsProvider
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def inner():
+    provider = CountingSecretsProvider()
+    provider.store_secret_dictionary({"a": "1", "b": "2"})
+    return provider
+
+
+@pytest.fixture
+def provider(inner, clock):
+    return CachingSecretsProvider(inner, cache=TTLCache(ttl=10, clock=clock))
+
+
+def test_repeated_reads_are_served_from_memory(provider, inner):
+    assert provider.get_secret_dictionary() == {"a": "1", "b": "2"}
+    assert provider.get("a") == "1"
+    assert provider.get("b") == "2"
+    assert inner.reads == 1
+    assert provider.stats()["hits"] == 2
+    assert provider.stats()["misses"] == 1
+
+
+def test_returned_dictionary_is_a_copy(provider):
+    provider.get_secret_dictionary()["a"] = "changed"
+    assert provider.get("a") == "1"
+
+
+def test_entry_expires_after_ttl(provider, inner, clock):
+    provider.get_secret_dictionary()
+    clock.now = 11
+    provider.get_secret_dictionary()
+    assert inner.reads == 2
+
+
+def test_writes_invalidate_cache(provider, inner):
+    provider.get_secret_dictionary()
+    provider.store("c", "3")
+    assert provider.get("c") == "3"
+    provider.delete("a")
+    assert provider.get("a") is None
+    provider.store_secret_dictionary({"x": "y"})
+    assert provider.get_secret_dictionary() == {"x": "y"}
+
+
+def test_shared_cache_is_lru_bounded(clock):
+    cache = TTLCache(ttl=10, max_entries=2, clock=clock)
+    providers = [CachingSecretsProvider(CountingSecretsProvider(str(i)), cache=cache) for i in range(3)]
+    for p in providers:
+        p.get_secret_dictionary()
+    assert len(cache) == 2
+    providers[0].get_secret_dictionary()
+    assert providers[0].provider.reads == 2
+
+
+@pytest.fixture
+def persistent_cache(tmp_path):
+    cache = PersistentSecretsCache(path=tmp_path / "cache.db", key_path=tmp_path / "cache.key")
+    yield cache
+    cache.close()
+
+
+def test_persistent_cache_encrypts_entries(tmp_path, persistent_cache):
+    persistent_cache.set("conjur:https://conjur.example.com", {"KEY": "top-secret"})
+    dictionary, stored_at = persistent_cache.get("conjur:https://conjur.example.com")
+    assert dictionary == {"KEY": "top-secret"}
+    assert stored_at <= time.time()
+
+    database = (tmp_path / "cache.db").read_bytes() + (tmp_path / "cache.db-wal").read_bytes()
+    assert b"top-secret" not in database
+    assert b"conjur.example.com" not in database
+    assert stat.S_IMODE(os.stat(tmp_path / "cache.key").st_mode) == 0o600
+
+    # Another key cannot read the entry
+    other = PersistentSecretsCache(path=tmp_path / "cache.db", local_secret="another secret")
+    assert other.get("conjur:https://conjur.example.com") is None
+    other.close()
+
+
+def test_processes_racing_to_create_the_key_file_read_the_same_key(tmp_path):
+    key_path = tmp_path / "cache.key"
+    barrier = threading.Barrier(8)
+    keys = []
+
+    def create():
+        barrier.wait()
+        keys.append(_read_or_create_key_file(key_path))
+
+    threads = [threading.Thread(target=create) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(keys)) == 1
+    assert len(keys[0]) == KEY_FILE_BYTES
+    assert os.listdir(tmp_path) == ["cache.key"]
+
+
+def test_cold_start_is_served_from_disk_and_refreshed(persistent_cache):
+    backend = CountingSecretsProvider()
+    backend._dict = {"KEY": "fresh"}
+    persistent_cache.set(backend.get_cache_key(), {"KEY": "persisted"})
+
+    provider = CachingSecretsProvider(backend, persistent_cache=persistent_cache)
+    assert provider.get("KEY") == "persisted"
+
+    deadline = time.monotonic() + 5
+    while provider.get("KEY") != "fresh" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert provider.get("KEY") == "fresh"
+    assert persistent_cache.get(backend.get_cache_key())[0] == {"KEY": "fresh"}
+
+
+def test_stale_copy_is_served_when_provider_fails(persistent_cache):
+    backend = CountingSecretsProvider()
+    backend._dict = {"KEY": "fresh"}
+    persistent_cache.set(backend.get_cache_key(), {"KEY": "persisted"})
+    backend.fail = True
+
+    provider = CachingSecretsProvider(backend, persistent_cache=persistent_cache, max_staleness=0)
+    assert provider.get("KEY") == "persisted"
+
+    strict = CachingSecretsProvider(backend, persistent_cache=persistent_cache, max_staleness=0, offline_fallback=False)
+    with pytest.raises(SecretProviderException):
+        strict.get("KEY")
+
+
+def test_failed_write_keeps_the_disk_copy(persistent_cache):
+    backend = CountingSecretsProvider()
+    backend._dict = {"KEY": "fresh"}
+    provider = CachingSecretsProvider(backend, persistent_cache=persistent_cache)
+    assert provider.get("KEY") == "fresh"
+
+    backend.fail = True
+    with pytest.raises(SecretProviderException):
+        provider.store("KEY", "new")
+    assert persistent_cache.get(backend.get_cache_key())[0] == {"KEY": "fresh"}
+
+    backend.fail = False
+    provider.store("KEY", "new")
+    assert persistent_cache.get(backend.get_cache_key()) is None
+    assert provider.get("KEY") == "new"
+
+
+def test_concurrent_misses_share_one_fetch():
+    release = threading.Event()
+
+    class SlowSecretsProvider(CountingSecretsProvider):
+
+        def get_secret_dictionary(self):
+            release.wait(timeout=5)
+            return super().get_secret_dictionary()
+
+    inner = SlowSecretsProvider()
+    inner.store_secret_dictionary({"k": "v"})
+    provider = CachingSecretsProvider(inner)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(provider.get("k"))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    while provider.stats()["collapsed"] < len(threads) - 1:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["v"] * len(threads)
+    assert inner.reads == 1
+
+
+def test_read_started_before_a_write_is_not_cached(persistent_cache):
+    read_started = threading.Event()
+    release = threading.Event()
+
+    class SlowSecretsProvider(CountingSecretsProvider):
+
+        def get_secret_dictionary(self):
+            secret_dictionary = super().get_secret_dictionary()
+            if self.reads == 1:
+                read_started.set()
+                release.wait(timeout=5)
+            return secret_dictionary
+
+    inner = SlowSecretsProvider()
+    inner.store_secret_dictionary({"k": "old"})
+    provider = CachingSecretsProvider(inner, persistent_cache=persistent_cache)
+    reader = threading.Thread(target=provider.get_secret_dictionary)
+    reader.start()
+    read_started.wait(timeout=5)
+    provider.store_secret_dictionary({"k": "new"})
+    release.set()
+    reader.join()
+
+    assert provider.get("k") == "new"
+    assert persistent_cache.get(inner.get_cache_key())[0] == {"k": "new"}
+
+
+def test_not_found_is_cached_for_negative_ttl(clock):
+    inner = CountingSecretsProvider()
+    provider = CachingSecretsProvider(inner, cache=TTLCache(ttl=60, clock=clock), negative_ttl=5)
+
+    assert provider.get_secret_dictionary() == {}
+    clock.now = 4
+    assert provider.get("a") is None
+    assert inner.reads == 1
+
+    inner.store_secret_dictionary({"a": "1"})
+    clock.now = 6
+    assert provider.get("a") == "1"
+    assert inner.reads == 2
+
+
+def test_stale_entry_is_served_while_refreshed(inner, clock):
+    provider = CachingSecretsProvider(inner, cache=TTLCache(ttl=10, clock=clock), stale_ttl=20)
+    provider.get_secret_dictionary()
+    inner.store_secret_dictionary({"a": "rotated"})
+
+    # Soft expiry: the cached value is returned right away, and refreshed in the background
+    clock.now = 11
+    assert provider.get("a") == "1"
+    deadline = time.monotonic() + 5
+    while provider.get("a") != "rotated" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert provider.get("a") == "rotated"
+    assert inner.reads == 2
+    assert provider.stats()["stale_hits"] >= 1
+
+    # Hard expiry: readers wait for the wrapped provider
+    clock.now = 42
+    inner.fail = True
+    with pytest.raises(SecretProviderException):
+        provider.get("a")
+
+
+def test_expired_entry_is_revalidated_by_version(clock):
+    inner = VersionedSecretsProvider()
+    inner.store_secret_dictionary({"a": "1"})
+    provider = CachingSecretsProvider(inner, cache=TTLCache(ttl=10, clock=clock))
+
+    assert provider.get("a") == "1"
+    clock.now = 11
+    assert provider.get("a") == "1"
+    assert inner.reads == 1
+    assert inner.version_checks == 2
+    assert provider.stats()["revalidated"] == 1
+
+    # Changed behind the cache's back: the new version is fetched on the next expiry
+    inner.store_secret_dictionary({"a": "rotated"})
+    clock.now = 22
+    assert provider.get("a") == "rotated"
+    assert inner.reads == 2
+
+    # Writes through the cache drop the validated copy
+    provider.store("a", "written")
+    assert provider.get("a") == "written"
+    assert inner.reads == 4
+
+    assert inner.version_checks == 4
+    unversioned = CachingSecretsProvider(inner, cache=TTLCache(ttl=10, clock=clock), revalidate=False)
+    unversioned.get("a")
+    assert inner.version_checks == 4
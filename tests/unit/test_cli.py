@@ -0,0 +1,71 @@
+import os
+
+from click.testing import CliRunner
+
+from agent_guard_core import cli as cli_module
+from agent_guard_core.cli import cli
+from agent_guard_core.credentials.file_secrets_provider import FileSecretsProvider
+from agent_guard_core.credentials.gcp_secrets_manager_provider import GCPSecretsProvider
+
+
+def test_mcp_proxy_start_passes_secrets_to_the_server_only(tmp_path, monkeypatch):
+    path = tmp_path / "secrets.env"
+    FileSecretsProvider(namespace=str(path)).store("MCP_SERVER_API_KEY", "secret")
+    started = {}
+
+    async def fake_proxy(**kwargs):
+        started.update(kwargs)
+
+    monkeypatch.setattr(cli_module, "_stdio_mcp_proxy_async", fake_proxy)
+    result = CliRunner().invoke(cli, ["mcp-proxy", "start", "--env-from", f"file-dotenv/{path}", "--", "server"])
+
+    assert result.exit_code == 0, result.output
+    assert started["env"] == {"MCP_SERVER_API_KEY": "secret"}
+    assert started["argv"] == ("server",)
+    assert "MCP_SERVER_API_KEY" not in os.environ
+
+
+def test_mcp_proxy_start_rejects_unknown_env_provider():
+    result = CliRunner().invoke(cli, ["mcp-proxy", "start", "--env-from", "vault/ns", "--", "server"])
+    assert result.exit_code == 2
+    assert "unknown provider 'vault'" in result.output
+
+
+def test_mcp_proxy_start_passes_the_namespace_as_gcp_secret_id(monkeypatch):
+    started = {}
+
+    async def fake_proxy(**kwargs):
+        started.update(kwargs)
+
+    monkeypatch.setattr(cli_module, "_stdio_mcp_proxy_async", fake_proxy)
+    monkeypatch.setattr(GCPSecretsProvider, "get_secret_dictionary", lambda self: {"SECRET_ID": self._secret_id})
+    result = CliRunner().invoke(cli,
+                                ["mcp-proxy", "start", "--env-from", "gcp-secretsmanager/my-agent", "--", "server"])
+
+    assert result.exit_code == 0, result.output
+    assert started["env"] == {"SECRET_ID": "my-agent"}
+
+
+def test_secrets_set_and_get_several_keys(tmp_path, monkeypatch):
+    path = str(tmp_path / "secrets.env")
+    writes = []
+    write_secret_dictionary = FileSecretsProvider._write_secret_dictionary
+
+    def counting_write(self, secret_dictionary):
+        writes.append(1)
+        write_secret_dictionary(self, secret_dictionary)
+
+    monkeypatch.setattr(FileSecretsProvider, "_write_secret_dictionary", counting_write)
+
+    result = CliRunner().invoke(cli, ["secrets", "set", "-p", "file-dotenv", "-n", path,
+                                      "-k", "A", "-v", "1", "-k", "B", "-v", "2"])
+    assert result.exit_code == 0, result.output
+    assert writes == [1]
+
+    result = CliRunner().invoke(cli, ["secrets", "get", "-p", "file-dotenv", "-n", path, "-k", "A", "-k", "B"])
+    assert result.exit_code == 0, result.output
+    assert result.output == "A=1\nB=2\n"
+
+    result = CliRunner().invoke(cli, ["secrets", "set", "-p", "file-dotenv", "-n", path,
+                                      "-k", "A", "-k", "B", "-v", "1"])
+    assert result.exit_code == 2
@@ -0,0 +1,12 @@
+import os
+import subprocess
+import sys
+
+
+def test_cli_import_loads_no_sdks_and_touches_no_files(tmp_path):
+    code = ("import sys\n"
+            "import agent_guard_core.cli\n"
+            "loaded = {'mcp', 'boto3', 'google.cloud.secretmanager', 'httpx'} & set(sys.modules)\n"
+            "assert not loaded, loaded\n")
+    subprocess.run([sys.executable, "-c", code], check=True, env={**os.environ, "HOME": str(tmp_path)})
+    assert os.listdir(tmp_path) == []
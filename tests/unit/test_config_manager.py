@@ -50,3 +50,12 @@ def test_enum_keys():
     keys = ConfigurationOptions.__members__.keys()
     assert "SECRET_PROVIDER" in keys
     assert "CONJUR_AUTHN_LOGIN" in keys
+
+
+def test_set_config_values_writes_once(temp_config, monkeypatch):
+    manager = ConfigManager()
+    writes = []
+    monkeypatch.setattr(manager._config_provider, "store_secret_dictionary", writes.append)
+    manager.set_config_values({"A": "1", "B": "2"})
+    manager.set_config_values({})
+    assert writes == [{"A": "1", "B": "2"}]
@@ -1,8 +1,15 @@
+import base64
+import json
+import time
+from datetime import datetime, timedelta
 from unittest.mock import MagicMock
 
+import httpx
 import pytest
 
-from agent_guard_core.credentials.conjur_secrets_provider import ConjurSecretsProvider
+from agent_guard_core.credentials import conjur_secrets_provider
+from agent_guard_core.credentials.conjur_secrets_provider import AsyncConjurSecretsProvider, ConjurSecretsProvider
+from agent_guard_core.credentials.environment_manager import EnvironmentVariablesManager
 
 
 @pytest.fixture(params=[ConjurSecretsProvider])
@@ -78,3 +85,265 @@ def test_delete_failure(provider):
         provider.delete("key")
     assert str(excinfo.value) == "Delete failed"
     provider.delete.assert_called_once_with("key")
+
+
+@pytest.fixture
+def conjur_env(monkeypatch):
+    monkeypatch.setenv("CONJUR_APPLIANCE_URL", "https://conjur.example.com")
+    monkeypatch.setenv("CONJUR_AUTHENTICATOR_ID", "authn-jwt/agents")
+    monkeypatch.setenv("CONJUR_AUTHN_LOGIN", "host/data/agent")
+
+
+def test_client_is_reused_and_closed(conjur_env):
+    with ConjurSecretsProvider() as conjur:
+        client = conjur._get_client()
+        assert conjur._get_client() is client
+        assert isinstance(client, httpx.Client)
+    assert client.is_closed
+    assert conjur._client is None
+
+
+def test_requests_share_one_client(conjur_env):
+    seen_urls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_urls.append(str(request.url))
+        return httpx.Response(200, text='{"KEY": "value"}')
+
+    conjur = ConjurSecretsProvider()
+    conjur._client = httpx.Client(transport=httpx.MockTransport(handler))
+    conjur._access_token = "token"
+    conjur._access_token_expiration = datetime.now() + timedelta(minutes=5)
+
+    assert conjur.get("KEY") == "value"
+    assert conjur.get("KEY") == "value"
+    assert len(seen_urls) == 2
+    conjur.close()
+
+
+def _make_token(expires_in: timedelta) -> str:
+    payload = json.dumps({"exp": (datetime.now() + expires_in).timestamp()}).encode()
+    return json.dumps({"payload": base64.b64encode(payload).decode("ascii")})
+
+
+def _mock_conjur(conjur: ConjurSecretsProvider, token: str, authn_calls: list) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/authenticate"):
+            authn_calls.append(request.url.path)
+            return httpx.Response(200, text=token)
+        return httpx.Response(200, text='{"KEY": "value"}')
+
+    conjur._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+
+def test_token_is_reused_until_expiration(conjur_env, monkeypatch):
+    monkeypatch.setenv("CONJUR_AUTHN_JWT", "jwt")
+    authn_calls = []
+    conjur = ConjurSecretsProvider()
+    _mock_conjur(conjur, _make_token(timedelta(minutes=8)), authn_calls)
+
+    assert conjur.connect() is True
+    assert conjur.get("KEY") == "value"
+    assert conjur.get("KEY") == "value"
+    assert len(authn_calls) == 1
+    assert conjur._access_token_expiration > datetime.now() + timedelta(minutes=4)
+    conjur.close()
+
+
+def test_background_token_refresh(conjur_env, monkeypatch):
+    monkeypatch.setenv("CONJUR_AUTHN_JWT", "jwt")
+    monkeypatch.setattr(conjur_secrets_provider, "MIN_TOKEN_REFRESH_DELAY_SECS", 0.01)
+    authn_calls = []
+    # Due for renewal right away, so the refresher keeps renewing it
+    token = _make_token(timedelta(minutes=conjur_secrets_provider.API_TOKEN_SAFETY_BUFFER))
+    conjur = ConjurSecretsProvider(token_refresh=True)
+    _mock_conjur(conjur, token, authn_calls)
+
+    assert conjur.connect() is True
+    deadline = time.monotonic() + 5
+    while len(authn_calls) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    conjur.close()
+
+    assert len(authn_calls) >= 3
+    assert conjur._refresh_thread is None
+
+
+def test_get_secrets_in_concurrent_batches(conjur_env, monkeypatch):
+    monkeypatch.setattr(conjur_secrets_provider, "MAX_BATCH_URL_LENGTH", 200)
+    variable_ids = [f"data/agents/secret-{i}" for i in range(20)]
+    batch_sizes = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert len(str(request.url)) <= 200
+        resource_ids = request.url.params["variable_ids"].split(",")
+        batch_sizes.append(len(resource_ids))
+        return httpx.Response(200, json={resource_id: resource_id[-2:] for resource_id in resource_ids})
+
+    conjur = ConjurSecretsProvider()
+    conjur._client = httpx.Client(transport=httpx.MockTransport(handler))
+    conjur._access_token = "token"
+    conjur._access_token_expiration = datetime.now() + timedelta(minutes=5)
+
+    secrets = conjur.get_secrets(variable_ids)
+    assert len(batch_sizes) > 1
+    assert sum(batch_sizes) == len(variable_ids)
+    assert secrets == {variable_id: variable_id[-2:] for variable_id in variable_ids}
+    conjur.close()
+
+
+def test_get_secrets_missing_variable_falls_back(conjur_env):
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/secrets"):
+            return httpx.Response(404, text="not found")
+        if request.url.path.endswith("missing"):
+            return httpx.Response(404, text="not found")
+        return httpx.Response(200, text="value")
+
+    conjur = ConjurSecretsProvider()
+    conjur._client = httpx.Client(transport=httpx.MockTransport(handler))
+    conjur._access_token = "token"
+    conjur._access_token_expiration = datetime.now() + timedelta(minutes=5)
+
+    assert conjur.get_secrets(["data/present", "data/missing"]) == {"data/present": "value", "data/missing": None}
+
+    env_manager = EnvironmentVariablesManager(conjur, secret_ids=["data/present", "data/missing"])
+    assert env_manager.list_env_vars() == {"present": "value"}
+    env_manager = EnvironmentVariablesManager(conjur, secret_ids={"MY_KEY": "data/present"})
+    assert env_manager.list_env_vars() == {"MY_KEY": "value"}
+    conjur.close()
+
+
+def test_store_declares_variable_only_once(conjur_env):
+    conjur_secrets_provider._existing_variables.clear()
+    requests = []
+    variable_exists = False
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal variable_exists
+        requests.append(request.url.path)
+        if "/policies/" in request.url.path:
+            variable_exists = True
+            return httpx.Response(201, text="{}")
+        return httpx.Response(201 if variable_exists else 404, text="")
+
+    conjur = ConjurSecretsProvider()
+    conjur._client = httpx.Client(transport=httpx.MockTransport(handler))
+    conjur._access_token = "token"
+    conjur._access_token_expiration = datetime.now() + timedelta(minutes=5)
+
+    conjur.store_secret_dictionary({"KEY": "1"})
+    conjur.store_secret_dictionary({"KEY": "2"})
+    assert [path.split("/")[1] for path in requests] == ["policies", "secrets", "secrets"]
+
+    # The variable was removed by someone else: it is declared again
+    variable_exists = False
+    requests.clear()
+    conjur.store_secret_dictionary({"KEY": "3"})
+    assert [path.split("/")[1] for path in requests] == ["secrets", "policies", "secrets"]
+    conjur.close()
+
+
+def test_batch_methods_read_and_write_once(conjur_env):
+    requests = []
+    stored = {"text": '{"A": "1"}'}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.method)
+        if request.method == "POST":
+            stored["text"] = request.content.decode()
+            return httpx.Response(201, text="")
+        return httpx.Response(200, text=stored["text"])
+
+    conjur = ConjurSecretsProvider()
+    conjur._client = httpx.Client(transport=httpx.MockTransport(handler))
+    conjur._access_token = "token"
+    conjur._access_token_expiration = datetime.now() + timedelta(minutes=5)
+
+    assert conjur.get_many(["A", "B"]) == {"A": "1", "B": None}
+    assert requests == ["GET"]
+
+    requests.clear()
+    conjur.store_many({"B": "2", "C": "3"})
+    assert requests == ["GET", "POST"]
+    assert json.loads(stored["text"]) == {"A": "1", "B": "2", "C": "3"}
+
+    requests.clear()
+    conjur.delete_many(["A", "C", "MISSING"])
+    assert requests == ["GET", "POST"]
+    assert json.loads(stored["text"]) == {"B": "2"}
+    conjur.close()
+
+
+def _mock_async_conjur(conjur: AsyncConjurSecretsProvider, stored: dict, requests: list) -> None:
+    """
+    Serves the blob variable from stored["text"], or 404 while it is None, and records the requests.
+    """
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        kind = request.url.path.split("/")[1]
+        requests.append((request.method, kind))
+        if kind == "policies":
+            stored["declared"] = True
+            return httpx.Response(201, text="{}")
+        if request.method == "POST":
+            if stored["text"] is None and not stored.get("declared"):
+                return httpx.Response(404, text="")
+            stored["text"] = request.content.decode()
+            return httpx.Response(201, text="")
+        if stored["text"] is None:
+            return httpx.Response(404, text="")
+        return httpx.Response(200, text=stored["text"])
+
+    conjur._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    conjur._access_token = "token"
+    conjur._access_token_expiration = datetime.now() + timedelta(minutes=5)
+
+
+@pytest.mark.asyncio
+async def test_async_get_and_store(conjur_env):
+    conjur_secrets_provider._existing_variables.clear()
+    stored = {"text": '{"KEY": "value"}'}
+    requests = []
+    conjur = AsyncConjurSecretsProvider()
+    _mock_async_conjur(conjur, stored, requests)
+
+    assert await conjur.get("KEY") == "value"
+    assert await conjur.get("MISSING") is None
+
+    requests.clear()
+    await conjur.store("NEW", "2")
+    assert requests == [("GET", "secrets"), ("POST", "secrets")]
+    assert json.loads(stored["text"]) == {"KEY": "value", "NEW": "2"}
+    await conjur.aclose()
+
+
+@pytest.mark.asyncio
+async def test_async_variable_not_found(conjur_env):
+    conjur_secrets_provider._existing_variables.clear()
+    stored = {"text": None}
+    requests = []
+    conjur = AsyncConjurSecretsProvider()
+    _mock_async_conjur(conjur, stored, requests)
+
+    assert await conjur.get_secret_dictionary() == {}
+    assert await conjur.get_secret("data/default/missing") is None
+
+    requests.clear()
+    await conjur.store("KEY", "value")
+    assert requests == [("GET", "secrets"), ("POST", "policies"), ("POST", "secrets")]
+    assert json.loads(stored["text"]) == {"KEY": "value"}
+    await conjur.aclose()
+
+
+@pytest.mark.asyncio
+async def test_async_aclose_closes_the_client(conjur_env):
+    conjur = AsyncConjurSecretsProvider()
+    client = conjur._get_client()
+    assert conjur._get_client() is client
+
+    await conjur.aclose()
+    assert client.is_closed
+    assert conjur._client is None
+    await conjur.aclose()
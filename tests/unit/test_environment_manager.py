@@ -0,0 +1,341 @@
+import asyncio
+import os
+import threading
+import time
+import uuid
+
+import pytest
+
+from agent_guard_core.credentials.environment_manager import (EnvironmentVariablesManager, get_scoped_env_vars,
+                                                              getenv)
+from agent_guard_core.credentials.file_secrets_provider import FileSecretsProvider
+from agent_guard_core.credentials.secrets_provider import SecretProviderException
+
+
+@pytest.fixture
+def file_provider(tmp_path):
+    return FileSecretsProvider(namespace=str(tmp_path / "secrets.env"))
+
+
+@pytest.fixture
+def keys():
+    keys = [f"key_{uuid.uuid4().hex}" for _ in range(3)]
+    yield keys
+    for key in keys:
+        os.environ.pop(key, None)
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_check_for_changes_applies_only_changed_keys(file_provider, keys, monkeypatch):
+    first, second, third = keys
+    file_provider.store_secret_dictionary({first: "1", second: "2"})
+    manager = EnvironmentVariablesManager(file_provider)
+    notified = []
+    manager.add_change_listener(notified.append)
+
+    with manager:
+        file_provider.store_secret_dictionary({first: "rotated", third: "3"})
+        assert manager.check_for_changes() == {first, second, third}
+        assert os.environ[first] == "rotated"
+        assert second not in os.environ
+        assert os.environ[third] == "3"
+        assert notified == [{first, second, third}]
+
+        # Unchanged version: the secrets are not fetched again
+        fetches = []
+        monkeypatch.setattr(file_provider, "get_secret_dictionary", lambda: fetches.append(1) or {})
+        assert manager.check_for_changes() == set()
+        assert fetches == []
+        assert len(notified) == 1
+
+
+def test_watcher_updates_rotated_secrets_until_depopulated(file_provider, keys):
+    key = keys[0]
+    file_provider.store(key, "old")
+    manager = EnvironmentVariablesManager(file_provider, watch_interval=0.01)
+    notified = []
+    manager.add_change_listener(notified.append)
+
+    with manager:
+        assert os.environ[key] == "old"
+        file_provider.store(key, "new")
+        assert wait_for(lambda: os.environ.get(key) == "new")
+        assert notified == [{key}]
+
+    file_provider.store(key, "newer")
+    time.sleep(0.05)
+    assert key not in os.environ
+
+
+@pytest.mark.asyncio
+async def test_async_watcher_updates_rotated_secrets(file_provider, keys):
+    key = keys[0]
+    file_provider.store(key, "old")
+
+    async with EnvironmentVariablesManager(file_provider, watch_interval=0.01) as manager:
+        file_provider.store(key, "new")
+        for _ in range(500):
+            if os.environ.get(key) == "new":
+                break
+            await asyncio.sleep(0.01)
+        assert os.environ[key] == "new"
+        assert manager._watch_task is not None
+
+    assert key not in os.environ
+    assert manager._watch_task is None
+
+
+def test_get_env_var_buffer(file_provider, keys):
+    file_provider.store(keys[0], "secret")
+    manager = EnvironmentVariablesManager(file_provider)
+
+    with manager.get_env_var_buffer(keys[0]) as secret:
+        assert bytes(secret.view()) == b"secret"
+    assert secret.released
+    assert manager.get_env_var_buffer(keys[1]) is None
+
+
+def test_depopulate_restores_shadowed_values_without_provider_calls(file_provider, keys, monkeypatch):
+    shadowing, removed, added = keys
+    os.environ[shadowing] = "original"
+    file_provider.store_secret_dictionary({shadowing: "secret", removed: "secret"})
+    manager = EnvironmentVariablesManager(file_provider)
+
+    manager.populate_env_vars()
+    assert os.environ[shadowing] == "secret"
+    # Changed in the provider while populated: depopulating still removes what was populated
+    file_provider.store_secret_dictionary({added: "secret"})
+    monkeypatch.setattr(file_provider, "get_secret_dictionary", lambda: pytest.fail("provider called"))
+    manager.depopulate_env_vars()
+
+    assert os.environ[shadowing] == "original"
+    assert removed not in os.environ
+    assert added not in os.environ
+
+
+@pytest.mark.parametrize("scope", ["process", "context"])
+def test_failed_fetch_keeps_populated_env_vars(file_provider, keys, monkeypatch, scope):
+    key = keys[0]
+    file_provider.store(key, "secret")
+    manager = EnvironmentVariablesManager(file_provider, watch_interval=60, scope=scope)
+
+    with manager:
+        version = manager._version
+
+        def unreachable():
+            raise SecretProviderException("unreachable")
+
+        monkeypatch.setattr(file_provider, "get_secret_dictionary", unreachable)
+        with manager:
+            assert getenv(key) == "secret"
+            assert manager._version == version
+
+    assert getenv(key) is None
+
+
+@pytest.mark.asyncio
+async def test_async_failed_fetch_keeps_populated_env_vars(file_provider, keys, monkeypatch):
+    key = keys[0]
+    file_provider.store(key, "secret")
+    manager = EnvironmentVariablesManager(file_provider)
+
+    async with manager:
+        monkeypatch.setattr(file_provider, "get_secret_dictionary", lambda: 1 / 0)
+        # Nothing populated yet: the failed fetch populates nothing
+        async with EnvironmentVariablesManager(file_provider):
+            assert os.environ[key] == "secret"
+        async with manager:
+            assert os.environ[key] == "secret"
+
+
+@pytest.mark.asyncio
+async def test_set_env_vars_shares_population_between_concurrent_calls(file_provider, keys, monkeypatch):
+    key = keys[0]
+    file_provider.store(key, "value")
+    fetches = []
+    get_secret_dictionary = file_provider.get_secret_dictionary
+    monkeypatch.setattr(file_provider, "get_secret_dictionary", lambda: fetches.append(1) or get_secret_dictionary())
+    release = asyncio.Event()
+
+    @EnvironmentVariablesManager.set_env_vars(file_provider)
+    async def read_env():
+        await release.wait()
+        return os.environ.get(key)
+
+    tasks = [asyncio.create_task(read_env()) for _ in range(100)]
+    await asyncio.sleep(0.1)
+    release.set()
+
+    assert await asyncio.gather(*tasks) == ["value"] * 100
+    assert fetches == [1]
+    assert key not in os.environ
+
+
+def slow_fetches(provider, monkeypatch):
+    """
+    Makes the provider's fetches wait for the returned event, and records them.
+    """
+    fetches = []
+    release = threading.Event()
+    get_secret_dictionary = provider.get_secret_dictionary
+
+    def slow_get_secret_dictionary():
+        fetches.append(1)
+        release.wait(timeout=5)
+        return get_secret_dictionary()
+
+    monkeypatch.setattr(provider, "get_secret_dictionary", slow_get_secret_dictionary)
+    return fetches, release
+
+
+@pytest.mark.asyncio
+async def test_set_env_vars_tasks_wait_for_a_thread_populating(file_provider, keys, monkeypatch):
+    key = keys[0]
+    file_provider.store(key, "value")
+    fetches, release = slow_fetches(file_provider, monkeypatch)
+    with_secrets = EnvironmentVariablesManager.set_env_vars(file_provider)
+
+    @with_secrets
+    def read_env_sync():
+        return os.environ.get(key)
+
+    @with_secrets
+    async def read_env():
+        return os.environ.get(key)
+
+    thread_call = asyncio.create_task(asyncio.to_thread(read_env_sync))
+    while not fetches:
+        await asyncio.sleep(0.01)
+    task = asyncio.create_task(read_env())
+    # The event loop keeps running while the thread populates
+    await asyncio.sleep(0.05)
+    assert not task.done()
+    release.set()
+
+    assert await asyncio.gather(thread_call, task) == ["value", "value"]
+    assert fetches == [1]
+    assert key not in os.environ
+
+
+@pytest.mark.asyncio
+async def test_set_env_vars_recovers_when_the_populating_task_is_cancelled(file_provider, keys, monkeypatch):
+    key = keys[0]
+    file_provider.store(key, "value")
+    fetches, release = slow_fetches(file_provider, monkeypatch)
+
+    @EnvironmentVariablesManager.set_env_vars(file_provider)
+    async def read_env():
+        return os.environ.get(key)
+
+    first = asyncio.create_task(read_env())
+    while not fetches:
+        await asyncio.sleep(0.01)
+    second = asyncio.create_task(read_env())
+    await asyncio.sleep(0.01)
+    first.cancel()
+    release.set()
+
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert await second == "value"
+    assert fetches == [1, 1]
+    assert key not in os.environ
+
+
+def test_set_env_vars_decorates_sync_functions(file_provider, keys):
+    key = keys[0]
+    file_provider.store(key, "value")
+    with_secrets = EnvironmentVariablesManager.set_env_vars(file_provider)
+
+    @with_secrets
+    def inner():
+        return os.environ.get(key)
+
+    @with_secrets
+    def outer():
+        return inner(), os.environ.get(key)
+
+    assert outer() == ("value", "value")
+    assert outer.__name__ == "outer"
+    assert key not in os.environ
+
+
+@pytest.mark.asyncio
+async def test_context_scope_isolates_concurrent_tasks(tmp_path, keys):
+    key = keys[0]
+    providers = []
+    for tenant in ["a", "b"]:
+        provider = FileSecretsProvider(namespace=str(tmp_path / f"{tenant}.env"))
+        provider.store(key, tenant)
+        providers.append(provider)
+    entered = []
+    both_entered = asyncio.Event()
+
+    async def run_agent(provider):
+        async with EnvironmentVariablesManager(provider, scope="context"):
+            entered.append(provider)
+            if len(entered) == len(providers):
+                both_entered.set()
+            await both_entered.wait()
+            return getenv(key), os.environ.get(key)
+
+    assert await asyncio.gather(*(run_agent(provider) for provider in providers)) == [("a", None), ("b", None)]
+    assert getenv(key, "default") == "default"
+
+
+def test_context_scopes_nest(tmp_path, keys):
+    outer_key, inner_key, _ = keys
+    outer = FileSecretsProvider(namespace=str(tmp_path / "outer.env"))
+    outer.store_secret_dictionary({outer_key: "outer", inner_key: "outer"})
+    inner = FileSecretsProvider(namespace=str(tmp_path / "inner.env"))
+    inner.store_secret_dictionary({inner_key: "inner"})
+
+    with EnvironmentVariablesManager(outer, scope="context"):
+        with EnvironmentVariablesManager(inner, scope="context"):
+            assert get_scoped_env_vars() == {outer_key: "outer", inner_key: "inner"}
+            assert getenv(outer_key) == "outer"
+        assert getenv(inner_key) == "outer"
+    assert get_scoped_env_vars() == {}
+    assert inner_key not in os.environ
+
+
+@pytest.mark.asyncio
+async def test_context_scope_depopulated_from_another_task(file_provider, keys):
+    key = keys[0]
+    file_provider.store(key, "secret")
+    manager = EnvironmentVariablesManager(file_provider, watch_interval=60, scope="context")
+
+    async def populate():
+        await manager.apopulate_env_vars()
+        return getenv(key)
+
+    async def depopulate():
+        await manager.adepopulate_env_vars()
+        return getenv(key)
+
+    assert await asyncio.create_task(populate()) == "secret"
+    assert manager._watch_task is not None
+    assert await asyncio.create_task(depopulate()) is None
+
+    assert not manager._populated
+    assert manager._context_count == 0
+    assert manager._watch_task is None
+    assert get_scoped_env_vars() == {}
+
+
+def test_build_child_env_leaves_os_environ_untouched(file_provider, keys):
+    key = keys[0]
+    file_provider.store(key, "secret")
+    manager = EnvironmentVariablesManager(file_provider)
+
+    assert manager.build_child_env(base_env={"PATH": "/bin"}) == {"PATH": "/bin", key: "secret"}
+    child_env = manager.build_child_env()
+    assert child_env[key] == "secret"
+    assert child_env["PATH"] == os.environ["PATH"]
+    assert key not in os.environ
@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("streamlit")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from servers.api_servers.routers import environment_variables
+from tests.unit.fakes import CountingSecretsProvider
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    provider = CountingSecretsProvider()
+    provider.store_secret_dictionary({"A": "1"})
+    provider.reads = provider.writes = 0
+    monkeypatch.setattr(environment_variables, "get_secret_provider", lambda: provider)
+    return provider
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(environment_variables.environment_variables_router)
+    return TestClient(app)
+
+
+def test_bulk_post_writes_once(client, provider):
+    response = client.post("/environment_variables/", json=[{"key": "B", "value": "2"}, {"key": "C", "value": "3"}])
+
+    assert response.status_code == 200
+    assert response.json() == [{"key": "B", "value": "2"}, {"key": "C", "value": "3"}]
+    assert (provider.reads, provider.writes) == (1, 1)
+    assert provider.get_secret_dictionary() == {"A": "1", "B": "2", "C": "3"}
+
+
+def test_get_with_keys_reads_once(client, provider):
+    response = client.get("/environment_variables/", params={"keys": ["A", "MISSING"]})
+
+    assert response.status_code == 200
+    assert response.json() == [{"key": "A", "value": "1"}]
+    assert provider.reads == 1
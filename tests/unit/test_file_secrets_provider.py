@@ -0,0 +1,191 @@
+import io
+import os
+import stat
+import threading
+
+import pytest
+from dotenv import dotenv_values
+
+from agent_guard_core.credentials import file_secrets_provider
+from agent_guard_core.credentials.file_secrets_provider import FileSecretsProvider, parse_dotenv_text
+from agent_guard_core.credentials.secrets_provider import SecretProviderException
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "KEY=value\n",
+    "KEY=value\nOTHER=2\nKEY=override\n",
+    "EMPTY=\nURL=https://example.com/?a=b&c=d\n",
+    "PASSWORD=pa#ss\nTOKEN=#start\n",
+    "SPACED=hello world\n",
+    "NO_NEWLINE=last",
+    "\n\nKEY=value\n\n",
+    "COMMENTED=value # comment\n",
+    "TRAILING=value   \n",
+    "LEADING= value\n",
+    "QUOTED='single'\nDOUBLE=\"double\\nline\"\n",
+    "export EXPORTED=value\n",
+    "# comment line\nKEY=value\n",
+    "KEY_ONLY\n",
+    "WINDOWS=value\r\n",
+    "'QUOTED_KEY'=value\n",
+    "TABBED=a\tb\n",
+])
+def test_parse_dotenv_text_matches_dotenv(text):
+    assert parse_dotenv_text(text) == dotenv_values(stream=io.StringIO(text))
+
+
+def test_get_secret_dictionary_parses_only_changed_files(tmp_path, monkeypatch):
+    parsed_texts = []
+    parse = file_secrets_provider.parse_dotenv_text
+
+    def counting_parse(text):
+        parsed_texts.append(text)
+        return parse(text)
+
+    monkeypatch.setattr(file_secrets_provider, "parse_dotenv_text", counting_parse)
+
+    path = tmp_path / "secrets.env"
+    provider = FileSecretsProvider(namespace=str(path))
+    provider.store_secret_dictionary({"KEY": "1"})
+
+    assert provider.get_secret_dictionary() == {"KEY": "1"}
+    assert provider.get_secret_dictionary() == {"KEY": "1"}
+    assert len(parsed_texts) == 1
+
+    # Returned dictionaries are copies, not the cached one
+    provider.get_secret_dictionary()["KEY"] = "changed"
+    assert provider.get("KEY") == "1"
+
+    path.write_text("KEY=2\n")
+    os.utime(path, ns=(0, 0))
+    assert provider.get_secret_dictionary() == {"KEY": "2"}
+    assert len(parsed_texts) == 2
+
+
+def test_interpolated_files_are_not_cached(tmp_path, monkeypatch):
+    path = tmp_path / "secrets.env"
+    path.write_text("KEY=${AGENT_GUARD_TEST_VALUE}\n")
+    provider = FileSecretsProvider(namespace=str(path))
+
+    monkeypatch.setenv("AGENT_GUARD_TEST_VALUE", "first")
+    assert provider.get("KEY") == "first"
+    monkeypatch.setenv("AGENT_GUARD_TEST_VALUE", "second")
+    assert provider.get("KEY") == "second"
+
+
+def test_concurrent_writers_do_not_lose_updates(tmp_path):
+    path = tmp_path / "secrets.env"
+    writers = 8
+    keys_per_writer = 25
+
+    def write_keys(writer):
+        # Each writer uses its own provider, as separate processes would
+        provider = FileSecretsProvider(namespace=str(path))
+        for i in range(keys_per_writer):
+            provider.store(f"KEY_{writer}_{i}", str(i))
+
+    threads = [threading.Thread(target=write_keys, args=(writer, )) for writer in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(FileSecretsProvider(namespace=str(path)).get_secret_dictionary()) == writers * keys_per_writer
+    assert sorted(os.listdir(tmp_path)) == ["secrets.env", "secrets.env.lock"]
+
+
+def test_store_keeps_file_mode(tmp_path):
+    path = tmp_path / "secrets.env"
+    provider = FileSecretsProvider(namespace=str(path))
+    os.chmod(path, 0o600)
+    provider.store("KEY", "value")
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+def test_journal_mode_appends_changes(tmp_path):
+    path = tmp_path / "secrets.env"
+    path.write_text("BASE=1\n")
+    writer = FileSecretsProvider(namespace=str(path), journal=True)
+    reader = FileSecretsProvider(namespace=str(path), journal=True)
+
+    writer.store("KEY", "value\nwith newline")
+    writer.store_many({"A": "a", "B": "b"})
+    writer.delete("BASE")
+    writer.delete_many(["B"])
+
+    assert path.read_text() == "BASE=1\n"
+    assert reader.get_secret_dictionary() == {"KEY": "value\nwith newline", "A": "a"}
+    assert reader.get("A") == "a"
+    assert reader.get_many(["A", "BASE"]) == {"A": "a", "BASE": None}
+
+    # A record being written by another process is not applied until complete
+    with open(f"{path}.journal", "a") as f:
+        f.write('{"op": "set", "key": "PARTIAL"')
+    assert reader.get("PARTIAL") is None
+    with open(f"{path}.journal", "a") as f:
+        f.write(', "value": "done"}\n')
+    assert reader.get("PARTIAL") == "done"
+
+
+def test_journal_mode_compacts_at_threshold(tmp_path):
+    path = tmp_path / "secrets.env"
+    provider = FileSecretsProvider(namespace=str(path), journal=True, compaction_threshold=3)
+    other = FileSecretsProvider(namespace=str(path), journal=True)
+
+    provider.store("A", "1")
+    provider.store("B", "2")
+    assert other.get_secret_dictionary() == {"A": "1", "B": "2"}
+    provider.store("A", "3")
+
+    assert not os.path.exists(f"{path}.journal")
+    assert FileSecretsProvider(namespace=str(path)).get_secret_dictionary() == {"A": "3", "B": "2"}
+    assert other.get_secret_dictionary() == {"A": "3", "B": "2"}
+
+    provider.store("C", "4")
+    assert other.get_secret_dictionary() == {"A": "3", "B": "2", "C": "4"}
+
+
+def test_compaction_keeps_values_that_need_quoting(tmp_path):
+    path = tmp_path / "secrets.env"
+    secrets = {"MULTILINE": "line1\nline2", "COMMENT": "a #b", "QUOTES": "'single' \"double\"", "BACKSLASH": "c:\\n"}
+    provider = FileSecretsProvider(namespace=str(path), journal=True, compaction_threshold=2)
+
+    provider.store_many(secrets)
+    provider.compact()
+
+    assert not os.path.exists(f"{path}.journal")
+    assert FileSecretsProvider(namespace=str(path)).get_secret_dictionary() == secrets
+    assert FileSecretsProvider(namespace=str(path), journal=True).get_secret_dictionary() == secrets
+
+
+@pytest.mark.parametrize("secrets", [{"": "value"}, {"KEY": None}])
+def test_store_many_rejects_missing_keys_and_secrets(tmp_path, secrets):
+    for provider in [FileSecretsProvider(namespace=str(tmp_path / "snapshot.env")),
+                     FileSecretsProvider(namespace=str(tmp_path / "journal.env"), journal=True)]:
+        with pytest.raises(SecretProviderException):
+            provider.store_many(secrets)
+        assert provider.get_secret_dictionary() == {}
+
+
+def test_values_with_interpolation_are_rejected(tmp_path):
+    for provider in [FileSecretsProvider(namespace=str(tmp_path / "snapshot.env")),
+                     FileSecretsProvider(namespace=str(tmp_path / "journal.env"), journal=True)]:
+        with pytest.raises(SecretProviderException):
+            provider.store("KEY", "${HOME}")
+        assert provider.get("KEY") is None
+
+
+def test_get_version_info_changes_with_every_write(tmp_path):
+    for provider in [FileSecretsProvider(namespace=str(tmp_path / "snapshot.env")),
+                     FileSecretsProvider(namespace=str(tmp_path / "journal.env"), journal=True)]:
+        versions = {provider.get_version_info()}
+        for value in ["1", "2", "3"]:
+            provider.store("KEY", value)
+            versions.add(provider.get_version_info())
+        assert len(versions) == 4
+        assert provider.get_version_info() == provider.get_version_info()
+
+    missing = FileSecretsProvider(namespace=str(tmp_path / "missing.env"))
+    os.remove(tmp_path / "missing.env")
+    assert missing.get_version_info() == ""
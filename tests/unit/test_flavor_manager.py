@@ -0,0 +1,45 @@
+import subprocess
+import sys
+from importlib.metadata import EntryPoint
+
+from agent_guard_core.utils import flavor_manager
+from agent_guard_core.utils.flavor_manager import FlavorManager
+
+
+def test_lazy_flavor_is_imported_on_first_lookup():
+    manager: FlavorManager[str, type] = FlavorManager()
+    manager.lazy_flavor("ordered", "collections:OrderedDict")
+
+    from collections import OrderedDict
+    assert manager.get("ordered") is OrderedDict
+    assert manager["ordered"] is OrderedDict
+    assert manager.get("missing") is None
+
+
+def test_unknown_flavors_are_resolved_from_entry_points(monkeypatch):
+    searched = []
+
+    def fake_entry_points(group, name):
+        searched.append((group, name))
+        if name == "plugin":
+            return [EntryPoint(name="plugin", value="collections:Counter", group=group)]
+        return []
+
+    monkeypatch.setattr(flavor_manager, "entry_points", fake_entry_points)
+    manager: FlavorManager[str, type] = FlavorManager(entry_point_group="my_package.plugins")
+
+    from collections import Counter
+    assert manager.get("plugin") is Counter
+    assert manager.get("plugin") is Counter
+    assert manager.get("missing") is None
+    assert searched == [("my_package.plugins", "plugin"), ("my_package.plugins", "missing")]
+
+
+def test_importing_credentials_does_not_load_provider_sdks():
+    code = ("import sys\n"
+            "from agent_guard_core.credentials import FileSecretsProvider\n"
+            "from agent_guard_core.credentials.secrets_provider import secrets_provider_fm\n"
+            "assert secrets_provider_fm.get('file-dotenv') is FileSecretsProvider\n"
+            "loaded = {'boto3', 'google.cloud.secretmanager', 'httpx'} & set(sys.modules)\n"
+            "assert not loaded, loaded\n")
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,140 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from google.api_core.exceptions import AlreadyExists, NotFound
+
+from agent_guard_core.credentials import gcp_secrets_manager_provider
+from agent_guard_core.credentials.gcp_secrets_manager_provider import AsyncGCPSecretsProvider, GCPSecretsProvider
+
+SECRET_PATH = "projects/unit/secrets/agentic_env_vars"
+
+
+class FakeSecretManagerClient:
+    """
+    Holds the latest version of each secret, and records the calls made to it.
+    """
+
+    def __init__(self, secrets=None):
+        self.secrets = dict(secrets or {})
+        self.calls = []
+
+    def access_secret_version(self, request):
+        self.calls.append("access_secret_version")
+        name = request["name"].rsplit("/versions/", 1)[0]
+        return SimpleNamespace(payload=SimpleNamespace(data=self.secrets[name].encode("utf-8")))
+
+    def add_secret_version(self, request):
+        self.calls.append("add_secret_version")
+        self.secrets[request["parent"]] = request["payload"]["data"].decode("utf-8")
+
+
+def test_batch_methods_read_and_write_once():
+    gcp_secrets_manager_provider._existing_secrets.add(SECRET_PATH)
+    client = FakeSecretManagerClient({SECRET_PATH: '{"A": "1"}'})
+    gcp = GCPSecretsProvider(project_id="unit")
+    gcp._client = client
+
+    assert gcp.get_many(["A", "B"]) == {"A": "1", "B": None}
+    assert client.calls == ["access_secret_version"]
+
+    client.calls.clear()
+    gcp.store_many({"B": "2", "C": "3"})
+    assert client.calls == ["access_secret_version", "add_secret_version"]
+    assert json.loads(client.secrets[SECRET_PATH]) == {"A": "1", "B": "2", "C": "3"}
+
+    client.calls.clear()
+    gcp.delete_many(["A", "C", "MISSING"])
+    assert client.calls == ["access_secret_version", "add_secret_version"]
+    assert json.loads(client.secrets[SECRET_PATH]) == {"B": "2"}
+
+    client.calls.clear()
+    gcp.delete_many(["MISSING"])
+    assert client.calls == ["access_secret_version"]
+
+
+class FakeAsyncSecretManagerClient:
+    """
+    The asyncio counterpart of FakeSecretManagerClient, raising NotFound for secrets that do not exist.
+    """
+
+    def __init__(self, secrets=None):
+        self.secrets = dict(secrets or {})
+        self.calls = []
+        self.closed = False
+        self.transport = SimpleNamespace(close=self._close)
+
+    async def _close(self):
+        self.closed = True
+
+    async def access_secret_version(self, request):
+        self.calls.append("access_secret_version")
+        name = request["name"].rsplit("/versions/", 1)[0]
+        if self.secrets.get(name) is None:
+            raise NotFound(name)
+        return SimpleNamespace(payload=SimpleNamespace(data=self.secrets[name].encode("utf-8")))
+
+    async def get_secret_version(self, request):
+        self.calls.append("get_secret_version")
+        name = request["name"].rsplit("/versions/", 1)[0]
+        if self.secrets.get(name) is None:
+            raise NotFound(name)
+        return SimpleNamespace(name=f"{name}/versions/{len(self.calls)}")
+
+    async def create_secret(self, request):
+        self.calls.append("create_secret")
+        name = f"{request['parent']}/secrets/{request['secret_id']}"
+        if name in self.secrets:
+            raise AlreadyExists(name)
+        self.secrets[name] = None
+
+    async def add_secret_version(self, request):
+        self.calls.append("add_secret_version")
+        if request["parent"] not in self.secrets:
+            raise NotFound(request["parent"])
+        self.secrets[request["parent"]] = request["payload"]["data"].decode("utf-8")
+
+
+@pytest.mark.asyncio
+async def test_async_get_and_store():
+    gcp_secrets_manager_provider._existing_secrets.discard(SECRET_PATH)
+    client = FakeAsyncSecretManagerClient({SECRET_PATH: '{"KEY": "value"}'})
+    gcp = AsyncGCPSecretsProvider(project_id="unit")
+    gcp._client = client
+
+    assert await gcp.get("KEY") == "value"
+    assert await gcp.get_version_info() != ""
+
+    client.calls.clear()
+    await gcp.store("NEW", "2")
+    assert client.calls == ["access_secret_version", "add_secret_version"]
+    assert json.loads(client.secrets[SECRET_PATH]) == {"KEY": "value", "NEW": "2"}
+
+
+@pytest.mark.asyncio
+async def test_async_secret_not_found():
+    gcp_secrets_manager_provider._existing_secrets.discard(SECRET_PATH)
+    client = FakeAsyncSecretManagerClient()
+    gcp = AsyncGCPSecretsProvider(project_id="unit")
+    gcp._client = client
+
+    assert await gcp.get_secret_dictionary() == {}
+    assert await gcp.get("KEY") is None
+    assert await gcp.get_version_info() == ""
+
+    client.calls.clear()
+    await gcp.store("KEY", "value")
+    assert client.calls == ["access_secret_version", "create_secret", "add_secret_version"]
+    assert json.loads(client.secrets[SECRET_PATH]) == {"KEY": "value"}
+
+
+@pytest.mark.asyncio
+async def test_async_aclose_closes_the_client():
+    client = FakeAsyncSecretManagerClient()
+    gcp = AsyncGCPSecretsProvider(project_id="unit")
+    gcp._client = client
+
+    await gcp.aclose()
+    assert client.closed
+    assert gcp._client is None
+    await gcp.aclose()
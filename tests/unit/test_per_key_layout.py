@@ -0,0 +1,99 @@
+import pytest
+
+from agent_guard_core.credentials.per_key_layout import PerKeyLayout
+from agent_guard_core.credentials.secrets_provider import SecretProviderException
+
+
+class FakeRemote:
+
+    def __init__(self):
+        self.values = {}
+        self.reads = []
+        self.writes = []
+
+    def read(self, path):
+        self.reads.append(path)
+        return self.values.get(path)
+
+    def write(self, path, text):
+        self.writes.append(path)
+        self.values[path] = text
+
+    def remove(self, path):
+        self.values.pop(path, None)
+
+
+@pytest.fixture
+def remote():
+    return FakeRemote()
+
+
+@pytest.fixture
+def layout(remote):
+    return PerKeyLayout(key_path=lambda key: f"ns/{key}",
+                        manifest_path="ns.manifest",
+                        read=remote.read,
+                        write=remote.write,
+                        remove=remote.remove)
+
+
+def test_single_key_read_touches_only_that_key(layout, remote):
+    layout.store_secret_dictionary({"a": "1", "b": "2"})
+    remote.reads.clear()
+    assert layout.get("a") == "1"
+    assert remote.reads == ["ns/a"]
+
+
+def test_store_existing_key_does_not_rewrite_manifest(layout, remote):
+    layout.store("a", "1")
+    remote.writes.clear()
+    layout.store("a", "2")
+    assert remote.writes == ["ns/a"]
+    assert layout.get_secret_dictionary() == {"a": "2"}
+
+
+def test_delete_updates_manifest(layout, remote):
+    layout.store_many({"a": "1", "b": "2"})
+    layout.delete("a")
+    assert "ns/a" not in remote.values
+    assert layout.get_manifest() == ["b"]
+    assert layout.get_secret_dictionary() == {"b": "2"}
+
+
+def test_apply_changes_rewrites_manifest_once(layout, remote):
+    layout.store_many({"a": "1", "b": "2"})
+    remote.writes.clear()
+    layout.apply_changes({"a": None, "b": "3", "c": "4"})
+    assert remote.writes == ["ns/b", "ns/c", "ns.manifest"]
+    assert layout.get_secret_dictionary() == {"b": "3", "c": "4"}
+
+
+def test_store_secret_dictionary_removes_stale_keys(layout, remote):
+    layout.store_secret_dictionary({"a": "1", "b": "2"})
+    layout.store_secret_dictionary({"b": "3"})
+    assert "ns/a" not in remote.values
+    assert layout.get_secret_dictionary() == {"b": "3"}
+
+
+def test_read_many_is_used_when_available(remote):
+    batches = []
+
+    def read_many(paths):
+        batches.append(paths)
+        return {path: remote.values.get(path) for path in paths}
+
+    layout = PerKeyLayout(key_path=lambda key: f"ns/{key}",
+                          manifest_path="ns.manifest",
+                          read=remote.read,
+                          write=remote.write,
+                          remove=remote.remove,
+                          read_many=read_many)
+    layout.store_many({"a": "1", "b": "2"})
+    assert layout.get_many(["a", "b", "c"]) == {"a": "1", "b": "2", "c": None}
+    assert batches == [["ns/a", "ns/b", "ns/c"]]
+
+
+@pytest.mark.parametrize("key", ["", "a/b", "a b", "../x"])
+def test_invalid_keys_are_rejected(layout, key):
+    with pytest.raises(SecretProviderException):
+        layout.store(key, "value")
@@ -0,0 +1,34 @@
+import pytest
+
+from agent_guard_core.utils.secret_buffer import SecretBuffer
+
+
+def test_release_overwrites_the_secret():
+    secret = SecretBuffer("s3cr3t")
+    view = secret.view()
+    assert bytes(view) == b"s3cr3t"
+    assert secret.decode() == "s3cr3t"
+    assert repr(secret) == "SecretBuffer(***)"
+
+    secret.release()
+    assert bytes(view) == bytes(6)
+    assert secret.released
+    assert len(secret) == 0
+    with pytest.raises(ValueError):
+        secret.view()
+    secret.release()
+
+
+def test_views_are_read_only():
+    with SecretBuffer(b"value") as secret:
+        with pytest.raises(TypeError):
+            secret.view()[0] = 0
+    assert secret.released
+
+
+def test_locked_buffer_is_unlocked_on_release():
+    # mlock may be refused by RLIMIT_MEMLOCK, which leaves the buffer unlocked
+    secret = SecretBuffer(bytearray(b"value"), lock=True)
+    assert bytes(secret.view()) == b"value"
+    secret.release()
+    assert not secret.locked
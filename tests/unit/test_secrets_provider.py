@@ -82,3 +82,43 @@ def test_delete_secret_none_empty(provider, key):
         result = provider.delete(key)
         assert result is None
         provider.delete.assert_called_once_with(key)
+
+
+def test_batch_applies_writes_with_a_single_write(tmp_path, monkeypatch):
+    provider = FileSecretsProvider(namespace=str(tmp_path / "secrets.env"))
+    provider.store_secret_dictionary({"KEEP": "1", "DROP": "2"})
+    writes = []
+    write = provider._write_secret_dictionary
+    monkeypatch.setattr(provider, "_write_secret_dictionary", lambda d: (writes.append(d), write(d)))
+
+    with provider.batch() as batch:
+        batch.store("A", "first")
+        batch.store("A", "second")
+        batch.store_many({"B": "b"})
+        batch.delete("DROP")
+        assert batch.get("A") == "second"
+        assert batch.get("DROP") is None
+        assert batch.get("KEEP") == "1"
+        assert provider.get("A") is None
+
+    assert len(writes) == 1
+    assert provider.get_secret_dictionary() == {"KEEP": "1", "A": "second", "B": "b"}
+
+
+def test_batch_is_discarded_when_block_raises(tmp_path):
+    provider = FileSecretsProvider(namespace=str(tmp_path / "secrets.env"))
+    with pytest.raises(RuntimeError):
+        with provider.batch() as batch:
+            batch.store("A", "1")
+            raise RuntimeError("abort")
+    assert provider.get_secret_dictionary() == {}
+
+
+def test_batch_in_journal_mode(tmp_path):
+    path = tmp_path / "secrets.env"
+    provider = FileSecretsProvider(namespace=str(path), journal=True)
+    provider.store("DROP", "1")
+    with provider.batch() as batch:
+        batch.store("A", "1")
+        batch.delete("DROP")
+    assert FileSecretsProvider(namespace=str(path), journal=True).get_secret_dictionary() == {"A": "1"}
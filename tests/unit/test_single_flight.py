@@ -0,0 +1,92 @@
+import asyncio
+import threading
+
+import pytest
+
+from agent_guard_core.utils.single_flight import SingleFlight
+
+
+def test_concurrent_threads_share_one_call():
+    single_flight: SingleFlight[str, int] = SingleFlight()
+    release = threading.Event()
+    executions = []
+    results = []
+
+    def fetch():
+        executions.append(1)
+        release.wait(timeout=5)
+        return 42
+
+    threads = [threading.Thread(target=lambda: results.append(single_flight.do("key", fetch))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    while single_flight.stats()["calls"] < len(threads):
+        threading.Event().wait(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [42] * len(threads)
+    assert len(executions) == 1
+    assert single_flight.stats() == {"calls": 8, "collapsed": 7, "in_flight": 0}
+
+    # Completed calls are not cached
+    assert single_flight.do("key", lambda: 7) == 7
+
+
+def test_exceptions_are_shared_and_reentrant_calls_run():
+    single_flight: SingleFlight[str, int] = SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        single_flight.do("key", fail)
+    assert single_flight.do("key", lambda: single_flight.do("key", lambda: 1) + 1) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_tasks_share_one_call():
+    single_flight: SingleFlight[str, int] = SingleFlight()
+    executions = []
+
+    async def fetch():
+        executions.append(1)
+        await asyncio.sleep(0.01)
+        return 42
+
+    assert await asyncio.gather(*(single_flight.ado("key", fetch) for _ in range(5))) == [42] * 5
+    assert len(executions) == 1
+    assert single_flight.stats()["collapsed"] == 4
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_call():
+    single_flight: SingleFlight[str, int] = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return 42
+
+    first = asyncio.ensure_future(single_flight.ado("key", fetch))
+    second = asyncio.ensure_future(single_flight.ado("key", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == 42
+
+
+@pytest.mark.asyncio
+async def test_forget_starts_a_new_call():
+    single_flight: SingleFlight[str, int] = SingleFlight()
+    values = iter([1, 2])
+
+    async def fetch():
+        value = next(values)
+        await asyncio.sleep(0.01)
+        return value
+
+    stale = asyncio.ensure_future(single_flight.ado("key", fetch))
+    await asyncio.sleep(0)
+    single_flight.forget("key")
+    assert await single_flight.ado("key", fetch) == 2
+    assert await stale == 1
@@ -0,0 +1,166 @@
+import threading
+
+import pytest
+
+from agent_guard_core.credentials.enum import CredentialsProvider, TieredEnvVars
+from agent_guard_core.credentials.file_secrets_provider import FileSecretsProvider
+from agent_guard_core.credentials.memory_secrets_provider import InMemorySecretsProvider
+from agent_guard_core.credentials.secrets_provider import SecretProviderException, secrets_provider_fm
+from agent_guard_core.credentials.tiered_secrets_provider import TieredSecretsProvider
+from tests.unit.fakes import CountingSecretsProvider, VersionedSecretsProvider
+
+
+class BlockingSecretsProvider(CountingSecretsProvider):
+    """
+    Holds every write until released, to observe queued writes.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def store_secret_dictionary(self, secret_dictionary):
+        self.release.wait(timeout=5)
+        super().store_secret_dictionary(secret_dictionary)
+
+
+def test_reads_fill_faster_tiers():
+    memory = InMemorySecretsProvider()
+    backend = CountingSecretsProvider()
+    backend.store_secret_dictionary({"KEY": "value", "OTHER": "2"})
+    provider = TieredSecretsProvider([memory, backend])
+
+    assert provider.get("KEY") == "value"
+    assert provider.get_many(["OTHER", "MISSING"]) == {"OTHER": "2", "MISSING": None}
+    assert memory.get_secret_dictionary() == {"KEY": "value", "OTHER": "2"}
+    assert backend.reads == 1
+
+
+def test_faster_tiers_are_refilled_when_the_last_tier_changes(tmp_path):
+    memory = InMemorySecretsProvider()
+    file = FileSecretsProvider(namespace=str(tmp_path / "secrets.env"))
+    backend = VersionedSecretsProvider()
+    backend.store_secret_dictionary({"KEY": "value"})
+    provider = TieredSecretsProvider([memory, file, backend], refresh_interval=0)
+
+    assert provider.get("KEY") == "value"
+    assert provider.get("KEY") == "value"
+    assert backend.reads == 1
+    assert provider.get_version_info() == backend.get_version_info()
+
+    # Rotated directly in the source, behind the faster tiers' back
+    backend.store_secret_dictionary({"KEY": "rotated"})
+    assert provider.get("KEY") == "rotated"
+    assert backend.reads == 2
+    for tier in (memory, file):
+        assert tier.get_secret_dictionary() == {"KEY": "rotated"}
+
+    # The file tier survives restarts; a new provider checks the source on its first read
+    backend.store_secret_dictionary({"KEY": "restarted"})
+    restarted = TieredSecretsProvider([InMemorySecretsProvider(), file, backend])
+    assert restarted.get("KEY") == "restarted"
+    assert file.get_secret_dictionary() == {"KEY": "restarted"}
+
+
+def test_unreachable_last_tier_serves_the_faster_tiers():
+    memory = InMemorySecretsProvider()
+    backend = CountingSecretsProvider()
+    backend.store_secret_dictionary({"KEY": "value"})
+    provider = TieredSecretsProvider([memory, backend], refresh_interval=0)
+
+    assert provider.get("KEY") == "value"
+    backend.fail = True
+    assert provider.get("KEY") == "value"
+
+
+def test_failing_faster_tier_is_skipped():
+    broken = CountingSecretsProvider()
+    broken.fail = True
+    backend = CountingSecretsProvider()
+    backend.store_secret_dictionary({"KEY": "value"})
+
+    assert TieredSecretsProvider([broken, backend]).get("KEY") == "value"
+
+
+def test_write_through_updates_every_tier(tmp_path):
+    memory = InMemorySecretsProvider()
+    file = FileSecretsProvider(namespace=str(tmp_path / "secrets.env"))
+    backend = CountingSecretsProvider()
+    backend.store_secret_dictionary({"EXISTING": "1"})
+    provider = TieredSecretsProvider([memory, file, backend])
+
+    provider.store("KEY", "value")
+    provider.delete_many(["EXISTING"])
+
+    for tier in (memory, file, backend):
+        assert tier.get_secret_dictionary() == {"KEY": "value"}
+
+
+def test_write_behind_returns_before_slower_tiers_are_written():
+    memory = InMemorySecretsProvider()
+    backend = BlockingSecretsProvider()
+    provider = TieredSecretsProvider([memory, backend], write_policy="write-behind")
+
+    provider.store_secret_dictionary({"KEY": "value"})
+    provider.delete("KEY")
+    # The fastest tier is authoritative while writes are queued, even once empty
+    assert provider.get("KEY") is None
+    assert backend.get_secret_dictionary() == {}
+
+    backend.release.set()
+    provider.flush()
+    assert backend.writes == 2
+    assert backend.get_secret_dictionary() == {}
+
+    provider.store("KEY", "value")
+    provider.close()
+    assert backend.get_secret_dictionary() == {"KEY": "value"}
+    with pytest.raises(SecretProviderException):
+        provider.store("KEY", "other")
+
+
+def test_flush_reports_failed_queued_writes():
+    def unreachable(secret_dictionary):
+        raise SecretProviderException("unreachable")
+
+    backend = CountingSecretsProvider()
+    backend.store_secret_dictionary = unreachable
+    provider = TieredSecretsProvider([InMemorySecretsProvider(), backend], write_policy="write-behind")
+
+    provider.store_secret_dictionary({"KEY": "value"})
+    with pytest.raises(SecretProviderException, match="1 queued writes failed"):
+        provider.flush()
+    provider.flush()
+    provider.close()
+
+
+def test_tiers_from_flavors(tmp_path, monkeypatch):
+    monkeypatch.setenv(TieredEnvVars.AGENT_GUARD_TIERS.value, "memory, file-dotenv")
+    provider = secrets_provider_fm.get(CredentialsProvider.TIERED)(namespace=str(tmp_path / "secrets.env"))
+
+    memory, file = provider.tiers
+    assert isinstance(memory, InMemorySecretsProvider)
+    assert isinstance(file, FileSecretsProvider)
+
+    provider.store("KEY", "value")
+    assert FileSecretsProvider(namespace=str(tmp_path / "secrets.env")).get("KEY") == "value"
+
+
+def test_namespace_is_passed_as_gcp_secret_id():
+    provider = TieredSecretsProvider(["memory", "gcp-secretsmanager"], namespace="my-agent")
+
+    memory, gcp = provider.tiers
+    assert memory._namespace == "my-agent"
+    assert gcp._secret_id == "my-agent"
+
+
+def test_invalid_configuration(monkeypatch):
+    monkeypatch.delenv(TieredEnvVars.AGENT_GUARD_TIERS.value, raising=False)
+    with pytest.raises(SecretProviderException):
+        TieredSecretsProvider()
+    with pytest.raises(SecretProviderException):
+        TieredSecretsProvider(["no-such-provider"])
+    with pytest.raises(SecretProviderException):
+        TieredSecretsProvider(["memory"], write_policy="write-around")
+    with pytest.raises(SecretProviderException):
+        TieredSecretsProvider(["memory"], refresh_interval=-1)